@@ -0,0 +1,284 @@
+"""Kritik haber uyarıları: kullanıcı tıklamasını beklemeden yeni CRITICAL haberleri teslim eder.
+
+Akış (her turda):
+1. tarama: ülke listesi sırayla dolaşılır, bayat olanlar çekilir (refresh_country_news; risk sınıflandırması
+   çekim sırasında yapılıp depoya yazılır),
+2. yeni makaleler: depodan sadece imleçten (son işlenen makale id'si) sonrası okunur; iş yeni makale sayısıyla
+   orantılıdır, eski makaleler yeniden taranmaz,
+3. kritikler seçilir ve küme (story) bazında tekilleştirilir: aynı haberin başka sitedeki / ülkedeki kopyası
+   yeniden uyarılmaz. Uyarılar ve imleç aynı işlemde yazılır,
+4. teslim: dosya (JSON satırları) ve webhook; Dash arayüzü alerts tablosunu dcc.Interval ile okur. Her sink'in
+   kendi imleci (son teslim edilen uyarı id'si) vardır ve sadece başarılı gönderimde ilerler: webhook kapalıysa
+   ya da devresi açıksa uyarılar sonraki turlarda yeniden gönderilir (en az bir kez teslim).
+
+Çok worker'lı sunucuda turu sadece kirayı tutan süreç çalıştırır.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import urllib.request
+
+import news_backend
+from article_store import article_store
+from geo_data import get_geo_index
+from metrics import metrics
+from resilience import alert_webhook
+from shared_cache import LeaderLease
+
+ALERT_INTERVAL = 60  # Turlar arası bekleme (sn)
+ALERT_SWEEP_BATCH = 4  # Tur başına taranan ülke sayısı (bayat olanlar çekilir)
+ALERT_PAGE_SIZE = 500  # Depodan tek seferde okunan yeni makale
+ALERT_MAX_PAGES = 20  # Tur başına en fazla bu kadar sayfa; kalanı sonraki tura kalır
+ALERT_FEED_LIMIT = 5  # Arayüzde gösterilen son uyarı sayısı
+ALERT_CURSOR = 'alerts'
+ALERT_ENABLED = os.environ.get('NEXUS_ALERTS', '1') != '0'
+ALERT_FILE = os.environ.get('NEXUS_ALERT_FILE')
+ALERT_WEBHOOK = os.environ.get('NEXUS_ALERT_WEBHOOK')
+ALERT_WEBHOOK_TIMEOUT = 5  # sn
+ALERT_LEASE_TTL = ALERT_INTERVAL * 3  # Lider süreç ölürse bu süre sonunda başka worker devralır (sn)
+
+_PAYLOAD_FIELDS = ('alert_id', 'country', 'title', 'link', 'media', 'risk_score', 'risk_terms', 'alerted_at')
+
+
+def alert_payload(alert):
+    return {field: alert.get(field) for field in _PAYLOAD_FIELDS}
+
+
+def iter_new_articles(store, after_id, page_size=ALERT_PAGE_SIZE, max_pages=ALERT_MAX_PAGES):
+    """after_id'den sonraki makaleleri sayfa sayfa verir (id sırasıyla)."""
+    for _ in range(max_pages):
+        page = store.articles_after(after_id, page_size)
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        after_id = page[-1]['id']
+
+
+# --- TESLİM ---
+class FileSink:
+    """Uyarıları JSON satırları olarak bir dosyaya ekler (tail -f / log toplayıcı için)."""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, alerts):
+        lines = ''.join(json.dumps(alert_payload(alert), ensure_ascii=False) + '\n' for alert in alerts)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+
+class WebhookSink:
+    """Uyarıları tek bir JSON POST ile gönderir: {"alerts": [...]}. Yeniden deneme ve devre kesici alert_webhook."""
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=ALERT_WEBHOOK_TIMEOUT, upstream=None):
+        self.url = url
+        self.timeout = timeout
+        self.upstream = upstream or alert_webhook
+
+    def send(self, alerts):
+        body = json.dumps({'alerts': [alert_payload(alert) for alert in alerts]}).encode('utf-8')
+        self.upstream.call(lambda: self._post(body))
+
+    def _post(self, body):
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.status
+
+
+def default_sinks():
+    sinks = []
+    if ALERT_FILE:
+        sinks.append(FileSink(ALERT_FILE))
+    if ALERT_WEBHOOK:
+        sinks.append(WebhookSink(ALERT_WEBHOOK))
+    return sinks
+
+
+# --- AKIŞ ---
+class AlertPipeline:
+    """Tarama -> yeni makaleler -> kritik + tekilleştirme -> teslim. run_once() tek tur çalıştırır.
+
+    fetcher: country_name -> haber listesi (veya None); sinks: send(alerts) metodu olan nesneler.
+    """
+
+    def __init__(self, store=None, sinks=None, countries=None, fetcher=None, interval=ALERT_INTERVAL,
+                 sweep_batch=ALERT_SWEEP_BATCH, page_size=ALERT_PAGE_SIZE, max_pages=ALERT_MAX_PAGES, lease=None):
+        self.store = store or article_store
+        self.sinks = list(sinks if sinks is not None else default_sinks())
+        self._countries = list(countries) if countries is not None else None
+        self.fetcher = fetcher or news_backend.refresh_country_news
+        self.interval = interval
+        self.sweep_batch = sweep_batch
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.lease = lease
+        self.rounds = 0
+        self.scanned = 0
+        self.alerted = 0
+        self.started = False
+        self._sweep_position = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def countries(self):
+        if self._countries is None:
+            # Öncelikli ülkeler önce; gerisi harita sırasıyla
+            tier_1 = news_backend.TIER_1_COUNTRIES
+            self._countries = tier_1 + [name for name in get_geo_index().names if name not in tier_1]
+        return self._countries
+
+    def sweep(self):
+        """Sıradaki sweep_batch ülkeden bayat olanları çeker. Çekilen ülke sayısını döner."""
+        countries = self.countries
+        if not countries or not self.sweep_batch:
+            return 0
+        fetched = 0
+        stale_before = time.time() - news_backend.NEWS_CACHE_TTL
+        for _ in range(min(self.sweep_batch, len(countries))):
+            country = countries[self._sweep_position % len(countries)]
+            self._sweep_position += 1
+            if (self.store.last_fetched(country) or 0) >= stale_before:
+                continue
+            try:
+                self.fetcher(country)
+                fetched += 1
+            except Exception as e:
+                print(f"Uyarı taraması hatası ({country}): {e}")
+        return fetched
+
+    def process(self):
+        """İmleçten sonraki makaleleri işler; bekleyen uyarıları teslim eder ve yeni oluşanları döner."""
+        self._init_sink_cursors()
+        position = self.store.get_cursor(ALERT_CURSOR)
+        if position is None:
+            # İlk çalıştırma: geçmiş haberler için uyarı yağmuru olmasın, bugünden itibaren başla
+            self.store.set_cursor(ALERT_CURSOR, self.store.max_id())
+            return []
+        created = []
+        with metrics.span('alert_process'):
+            for page in iter_new_articles(self.store, position, self.page_size, self.max_pages):
+                self.scanned += len(page)
+                critical = [article for article in page if article['risk']]
+                created += self.store.record_alerts(critical, ALERT_CURSOR, page[-1]['id'])
+        if created:
+            self.alerted += len(created)
+            metrics.inc('nexus_alerts_total', value=len(created))
+        self.deliver_pending()
+        return created
+
+    def deliver_pending(self):
+        """Her sink'e imlecinden sonraki uyarıları gönderir. Teslim edilen uyarı sayısını döner.
+
+        İmleç sadece send() başarılı olursa ilerler; hata veren sink'in uyarıları sonraki turda yeniden denenir.
+        """
+        delivered = 0
+        for sink in self.sinks:
+            name = self._sink_cursor(sink)
+            position = self.store.get_cursor(name) or 0
+            for _ in range(self.max_pages):
+                pending = self.store.alerts_after(position, self.page_size)
+                if not pending:
+                    break
+                try:
+                    sink.send(pending)
+                except Exception as e:
+                    metrics.inc('nexus_alert_deliveries_total', sink=sink.name, result='error')
+                    print(f"Uyarı teslim hatası ({sink.name}): {e}")
+                    break
+                metrics.inc('nexus_alert_deliveries_total', sink=sink.name, result='ok')
+                position = pending[-1]['alert_id']
+                self.store.set_cursor(name, position)
+                delivered += len(pending)
+                if len(pending) < self.page_size:
+                    break
+        return delivered
+
+    @staticmethod
+    def _sink_cursor(sink):
+        return f"{ALERT_CURSOR}:{sink.name}"
+
+    def _init_sink_cursors(self):
+        # Yeni eklenen sink geçmiş uyarıları almaz; bundan sonra oluşanlardan başlar
+        for sink in self.sinks:
+            name = self._sink_cursor(sink)
+            if self.store.get_cursor(name) is None:
+                self.store.set_cursor(name, self.store.max_alert_id())
+
+    def run_once(self):
+        self.sweep()
+        created = self.process()
+        self.rounds += 1
+        return created
+
+    # --- ARKA PLAN ---
+    def start(self):
+        with self._lock:
+            if self.is_running():
+                return
+            self.started = True
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='nexus-alerts', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self.lease is not None:
+            self.lease.release()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self):
+        return {'rounds': self.rounds, 'scanned': self.scanned, 'alerted': self.alerted,
+                'cursor': self.store.get_cursor(ALERT_CURSOR),
+                'sinks': {sink.name: self.store.get_cursor(self._sink_cursor(sink)) for sink in self.sinks}}
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self.lease is None or self.lease.acquire():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Uyarı akışı hatası: {e}")
+            if self._stop_event.wait(self.interval):
+                break
+
+
+def recent_alerts(limit=ALERT_FEED_LIMIT, store=None):
+    """Arayüz için en yeni uyarılar (yeniden eskiye); her worker ortak depodan okur."""
+    return (store or article_store).recent_alerts(limit)
+
+
+def init_alerts(server, pipeline=None, autostart=True):
+    """Uyarı akışını Flask `server`ına bağlar; ilk istekte başlar (NEXUS_ALERTS=0 ile kapatılabilir).
+
+    Akışa `server.extensions['nexus_alerts']` üzerinden erişilebilir.
+    """
+    pipeline = pipeline or AlertPipeline(lease=LeaderLease('alerts', ALERT_LEASE_TTL))
+    server.extensions['nexus_alerts'] = pipeline
+
+    if autostart and ALERT_ENABLED:
+        @server.before_request
+        def _start_alerts():
+            if not pipeline.started:
+                pipeline.start()
+
+    atexit.register(pipeline.stop)
+    return pipeline
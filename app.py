@@ -1,110 +1,174 @@
-import dash
-from dash import dcc, html, Input, Output, State, ctx
-import plotly.graph_objects as go
-from deep_translator import GoogleTranslator
-from news_backend import get_country_news, get_geo_data
-
-# Verileri Yükle
-df_geo = get_geo_data()
+import os
 
-app = dash.Dash(__name__)
+import dash
+import diskcache
+from dash import dcc, html, Input, Output, State, ALL, ctx, Patch, ClientsideFunction, DiskcacheManager
+from alerts import ALERT_FEED_LIMIT, init_alerts, recent_alerts
+from geo_data import get_geo_index
+from layout_cache import init_layout_cache
+from metrics import init_metrics, metrics
+from news_backend import get_country_coordinates, iter_country_news, iter_many_country_news, news_cache
+from panel_cache import news_snapshot_version, panel_memo
+from prefetch import init_prefetch
+from search import SEARCH_PERIODS, search_service
+from shared_cache import CACHE_DIR
+from text_utils import normalize_text
+from topics import ACTIVE_TOPICS, topic_label
+from translation import translation_service
+
+# Verileri Yükle (pandas'a gerek yok: figür düz listelerden kurulur)
+geo_index = get_geo_index()  # Ülke adı -> satır (O(1))
+
+# Varsayılan: Mat Turkuaz (0.3), Seçilen: Neon Cyan (1.0)
+Z_DEFAULT = 0.3
+Z_SELECTED = 1.0
+Z_BASE = [Z_DEFAULT] * len(geo_index)
+
+BASE_COLORSCALE = [[0, '#004466'], [0.5, '#004466'], [0.6, '#00ffff'], [1, '#00ffff']]
+BASE_HOVER = '<b>%{text}</b><extra></extra>'
+
+# TEHDİT HARİTASI: z = ülkenin kritik haber oranı (0-1)
+THREAT_COLORSCALE = [[0, '#002a3a'], [0.15, '#005566'], [0.35, '#aa8800'], [0.6, '#ff4400'], [1, '#ff0000']]
+THREAT_HOVER = '<b>%{text}</b><br>THREAT %{z:.0%}<br>%{customdata[1]} CRITICAL / %{customdata[0]} INTEL<extra></extra>'
+THREAT_REFRESH_MS = 5000
+ALERT_POLL_MS = 15000  # Arayüzün yeni uyarıları kontrol etme aralığı
+
+# Arka plan callback'leri için yerel iş yöneticisi (harici broker yok)
+background_cache = diskcache.Cache(os.path.join(CACHE_DIR, 'jobs'))
+background_manager = DiskcacheManager(background_cache)
+
+app = dash.Dash(__name__, background_callback_manager=background_manager)
 server = app.server
 
+# TIER_1 ülkeleri ilk istekle birlikte arka planda sıcak tutulur
+prefetcher = init_prefetch(server)
+# Yeni kritik haberler kullanıcı tıklamadan toplanır, dosya/webhook'a ve arayüze iletilir
+alert_pipeline = init_alerts(server)
+# /metrics (Prometheus) + isteğe bağlı istek başına cProfile (NEXUS_PROFILE)
+init_metrics(server)
+# Statik layout (küre figürü dahil) bir kez serileştirilir, gzip + ETag ile sunulur
+init_layout_cache(app)
+
 
 # --- YARDIMCI FONKSİYONLAR ---
 def clean_text_for_bond(text):
-    if not text: return ""
-    replacements = {
-        'ğ': 'g', 'Ğ': 'G', 'ş': 's', 'Ş': 'S', 'ı': 'i', 'İ': 'I',
-        'ç': 'c', 'Ç': 'C', 'ü': 'u', 'Ü': 'U', 'ö': 'o', 'Ö': 'O'
-    }
-    for tr, en in replacements.items():
-        text = text.replace(tr, en)
-    return text
-
+    # Bond fontunda olmayan harfler (Türkçe, Almanca, Fransızca, İspanyolca, Kiril) tek geçişte çevrilir
+    return normalize_text(text)
 
-def translate_content(text, target_lang):
-    if target_lang == 'en': return text
-    try:
-        safe_text = text[:499] if len(text) > 500 else text
-        return GoogleTranslator(source='auto', target=target_lang).translate(safe_text)
-    except:
-        return text
-
-
-# --- MANUEL KOORDİNATLAR ---
-MANUAL_COORDS = {
-    'United States': (37.0902, -95.7129), 'China': (35.8617, 104.1954), 'Russia': (61.5240, 105.3188),
-    'Turkey': (38.9637, 35.2433), 'Mexico': (23.6345, -102.5528), 'Canada': (56.1304, -106.3468),
-    'Brazil': (-14.2350, -51.9253), 'Australia': (-25.2744, 133.7751), 'India': (20.5937, 78.9629),
-    'United Kingdom': (55.3781, -3.4360), 'France': (46.2276, 2.2137), 'Germany': (51.1657, 10.4515),
-    'Japan': (36.2048, 138.2529),
-
-    # YENİ EKLENENLER
-    'French Guiana': (3.9339, -53.1258),  # Güney Amerika'da
-    'Palestine': (31.9522, 35.2332),  # Orta Doğu'da
-    'Western Sahara': (24.2155, -12.8858)  # Afrika'da
-}
 
 def get_safe_coordinates(country_name):
-    if country_name in MANUAL_COORDS: return MANUAL_COORDS[country_name]
-    return (None, None)
+    return get_country_coordinates(country_name)
 
 
 # --- HARİTA OLUŞTURMA ---
+FONT_FAMILY = "'GoldenEye', 'Share Tech Mono', monospace"
+
+
 def create_globe(selected_country=None, uirevision='constant', zoom_level=1.0):
-    # Varsayılan: Mat Turkuaz (#004466)
-    z_values = [0.3] * len(df_geo)
-
-    if selected_country:
-        match = df_geo.index[df_geo['COUNTRY'] == selected_country].tolist()
-        if match:
-            # Seçilen: Neon Cyan (1.0), Diğerleri: Mat Turkuaz (0.3)
-            z_values = [0.3 if i != match[0] else 1.0 for i in range(len(df_geo))]
-
-    fig = go.Figure(data=go.Choropleth(
-        locations=df_geo['CODE'],
-        z=z_values,
-        text=df_geo['COUNTRY'],
-        colorscale=[
-            [0, '#004466'],
-            [0.5, '#004466'],
-            [0.6, '#00ffff'],
-            [1, '#00ffff']
-        ],
-        autocolorscale=False, showscale=False,
-        marker_line_color='#00cccc',
-        marker_line_width=0.5,
-        hovertemplate='<b>%{text}</b><extra></extra>'
-    ))
-
-    font_ailesi = "'GoldenEye', 'Share Tech Mono', monospace"
-
-    fig.update_layout(
-        title={
-            'text': "NEXUS: GLOBAL AI SENTINEL",
-            'y': 0.95, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top',
-            'font': {'size': 32, 'color': '#00ffff', 'family': font_ailesi, 'shadow': '0px 0px 10px #00ffff'}
-        },
-        paper_bgcolor='black',
-        clickmode='event+select',
-        uirevision=uirevision,
-
-        geo=dict(
-            showframe=False, showcoastlines=False,
-            projection_type='orthographic',
-            projection_scale=zoom_level,
-
-            showland=True, landcolor="#002233",  # Verisiz yerler
-            showocean=True, oceancolor="black",  # SİYAH OKYANUS (ONAYLANDI)
-
-            bgcolor='black'
-        ),
-        margin=dict(r=0, l=0, b=0, t=80),
-        autosize=True,
-        hoverlabel=dict(bgcolor="black", font_size=18, font_family=font_ailesi, font_color="#00ffff")
-    )
-    return fig
+    """Küre figürünü düz sözlük olarak kurar.
+
+    plotly.graph_objects doğrulaması (ve importu) atlanır; dcc.Graph sözlüğü olduğu gibi kabul eder.
+    """
+    z_values = list(Z_BASE)  # Patch ile tek eleman güncelleyebilmek için düz liste
+    row = geo_index.row(selected_country) if selected_country else None
+    if row is not None:
+        z_values[row] = Z_SELECTED
+
+    return {
+        'data': [{
+            'type': 'choropleth',
+            'locations': list(geo_index.codes),
+            'z': z_values,
+            'text': list(geo_index.names),
+            'colorscale': BASE_COLORSCALE,
+            'zmin': 0, 'zmax': 1,
+            'autocolorscale': False, 'showscale': False,
+            'marker': {'line': {'color': '#00cccc', 'width': 0.5}},
+            'hovertemplate': BASE_HOVER,
+        }],
+        'layout': {
+            'title': {
+                'text': "NEXUS: GLOBAL AI SENTINEL",
+                'y': 0.95, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top',
+                'font': {'size': 32, 'color': '#00ffff', 'family': FONT_FAMILY, 'shadow': '0px 0px 10px #00ffff'}
+            },
+            'paper_bgcolor': 'black',
+            'clickmode': 'event+select',
+            'uirevision': uirevision,
+            'geo': {
+                'showframe': False, 'showcoastlines': False,
+                'projection': {'type': 'orthographic', 'scale': zoom_level},
+                'showland': True, 'landcolor': "#002233",  # Verisiz yerler
+                'showocean': True, 'oceancolor': "black",  # SİYAH OKYANUS (ONAYLANDI)
+                'bgcolor': 'black'
+            },
+            'margin': {'r': 0, 'l': 0, 'b': 0, 't': 80},
+            'autosize': True,
+            'hoverlabel': {'bgcolor': "black", 'font': {'size': 18, 'family': FONT_FAMILY, 'color': "#00ffff"}}
+        }
+    }
+
+
+# Başlangıç figürü bir kez kurulur; layout ile birlikte önbelleğe alınmış sıkıştırılmış JSON olarak sunulur
+BASE_FIGURE = create_globe()
+
+
+def get_threat_map():
+    # numpy ve skor vektörleri sadece tehdit haritası ilk açıldığında yüklenir
+    from threat_map import threat_map
+    return threat_map
+
+
+def selection_rows(selection):
+    """Seçim tek ülke (str) ya da karşılaştırma listesi olabilir; geçerli satırları küme olarak döner."""
+    if not selection:
+        return set()
+    countries = [selection] if isinstance(selection, str) else selection
+    return {row for row in map(geo_index.row, countries) if row is not None}
+
+
+def highlight_patch(selected, previous=None):
+    """Sadece değişen z elemanlarını güncelleyen Patch; figürün tamamı gidip gelmez."""
+    patched = Patch()
+    rows = selection_rows(selected)
+    for row in selection_rows(previous) - rows:
+        patched['data'][0]['z'][row] = Z_DEFAULT
+    for row in rows:
+        patched['data'][0]['z'][row] = Z_SELECTED
+    return patched
+
+
+def selection_mode_patch(selected):
+    """Tehdit haritasından normal görünüme dönüş: z vektörü + renk skalası."""
+    z_values = list(Z_BASE)
+    for row in selection_rows(selected):
+        z_values[row] = Z_SELECTED
+    patched = Patch()
+    patched['data'][0]['z'] = z_values
+    patched['data'][0]['colorscale'] = BASE_COLORSCALE
+    patched['data'][0]['hovertemplate'] = BASE_HOVER
+    return patched
+
+
+def threat_patch(full=True):
+    """Ön-hesaplanmış skor vektörünü figüre basar. full=False ise sadece veriler güncellenir."""
+    import numpy as np
+
+    threat_map = get_threat_map()
+    patched = Patch()
+    patched['data'][0]['z'] = np.round(threat_map.scores, 3).tolist()
+    patched['data'][0]['customdata'] = np.column_stack([threat_map.counts, threat_map.critical]).tolist()
+    if full:
+        patched['data'][0]['colorscale'] = THREAT_COLORSCALE
+        patched['data'][0]['hovertemplate'] = THREAT_HOVER
+    return patched
+
+
+def threat_button_label():
+    done, total = get_threat_map().ingest_progress
+    if total and done < total:
+        return f"THREAT MAP {done}/{total}"
+    return "THREAT MAP"
 
 
 app.layout = html.Div(className='container', children=[
@@ -112,7 +176,7 @@ app.layout = html.Div(className='container', children=[
     html.Div(id='map-container', className='map-container', style={'width': '100%'}, children=[
         dcc.Graph(
             id='globe-graph',
-            figure=create_globe(),
+            figure=BASE_FIGURE,
             config={'displayModeBar': False, 'scrollZoom': True, 'responsive': True},
             style={'height': '100vh', 'width': '100%'}
         ),
@@ -120,6 +184,26 @@ app.layout = html.Div(className='container', children=[
         html.Div(className='zoom-controls', children=[
             html.Button('+', id='zoom-in', className='zoom-btn'),
             html.Button('-', id='zoom-out', className='zoom-btn'),
+        ]),
+        # HARİTA MODU
+        html.Div(className='mode-controls', children=[
+            html.Button("THREAT MAP", id='threat-toggle', className='mode-btn'),
+        ]),
+        # KRİTİK UYARILAR (arka plan akışından; alerts.py)
+        html.Div(id='alert-feed', className='alert-feed'),
+        # YEREL ARAMA (toplanan haberler; Google'a gitmez)
+        html.Div(className='search-box', children=[
+            dcc.Input(id='search-input', type='search', placeholder="SEARCH INTEL...", debounce=False,
+                      list='search-suggestions', autoComplete='off', className='search-input'),
+            html.Datalist(id='search-suggestions'),
+            html.Div(className='search-filters', children=[
+                dcc.RadioItems(id='search-period', options=[{'label': name.upper(), 'value': name}
+                                                            for name in SEARCH_PERIODS],
+                               value='7d', inline=True, className='search-radio'),
+                dcc.Checklist(id='search-critical', options=[{'label': 'CRITICAL', 'value': 'critical'}],
+                              value=[], inline=True, className='search-radio'),
+            ]),
+            html.Div(id='search-results', className='search-results'),
         ])
     ]),
 
@@ -140,90 +224,99 @@ app.layout = html.Div(className='container', children=[
                         id='close-btn', className='close-btn'),
         ]),
 
-        # SCROLL İÇİN ÖNEMLİ: Panel içeriği burada
-        dcc.Loading(
-            id="loading-news", type="cube", color="#00ffff",
-            parent_style={'flex': '1', 'position': 'relative', 'display': 'flex', 'flexDirection': 'column',
-                          'height': '100%'},
-            children=html.Div(id='news-content', className='panel-content-scroll')
-        )
+        html.Div(id='news-progress', className='news-progress'),
+
+        # SCROLL İÇİN ÖNEMLİ: Panel içeriği burada.
+        # news-stream yükleme sırasında kademeli dolar, iş bitince boşalır; news-content son hali tutar.
+        html.Div(className='panel-body', children=[
+            html.Div(id='news-stream', className='panel-content-scroll'),
+            html.Div(id='news-content', className='panel-content-scroll')
+        ])
     ]),
 
     dcc.Store(id='selected-country-store'),
-    dcc.Store(id='zoom-level-store', data=1.0)
+    dcc.Store(id='zoom-level-store', data=1.0),
+    dcc.Store(id='map-mode-store', data='select'),
+    dcc.Store(id='search-country-store'),
+    dcc.Store(id='threat-version-store'),
+    dcc.Interval(id='threat-interval', interval=THREAT_REFRESH_MS, disabled=True),
+    dcc.Store(id='alert-cursor-store'),
+    dcc.Interval(id='alert-interval', interval=ALERT_POLL_MS)
 ])
 
 
-@app.callback(
-    [Output('map-container', 'style'),
-     Output('news-panel', 'style'),
-     Output('news-content', 'children'),
-     Output('selected-country-store', 'data'),
-     Output('globe-graph', 'figure'),
-     Output('globe-graph', 'clickData'),
-     Output('zoom-level-store', 'data')],
-    [Input('globe-graph', 'clickData'),
-     Input('close-btn', 'n_clicks'),
-     Input('language-selector', 'value'),
-     Input('zoom-in', 'n_clicks'),
-     Input('zoom-out', 'n_clicks')],
-    [State('selected-country-store', 'data'),
-     State('globe-graph', 'figure'),
-     State('zoom-level-store', 'data')]
-)
-def update_situation_room(clickData, close_clicks, lang_code, zoom_in, zoom_out,
-                          current_country, current_fig, current_zoom):
-    triggered_id = ctx.triggered_id
+NO_DATA_TITLE = "NO DATA DETECTED"
+COMPARE_MAX_COUNTRIES = 6  # Karşılaştırma panelinde en fazla ülke (lasso/box seçimi)
+COMPARE_TOP_CRITICAL = 3  # Ülke başına gösterilen kritik başlık
+MAX_VISIBLE_NEWS = 12  # MAX 12 HABER KURALI
+STREAM_TRANSLATE_CHUNK = 6  # Akışta her adımda çevrilecek haber sayısı
 
-    # --- ZOOM MANTIĞI ---
-    if triggered_id == 'zoom-in':
-        new_zoom = min(current_zoom + 0.2, 3.0)
-        fig = go.Figure(current_fig)
-        fig.update_layout(geo=dict(projection_scale=new_zoom), uirevision='constant')
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, fig, dash.no_update, new_zoom
-
-    if triggered_id == 'zoom-out':
-        new_zoom = max(current_zoom - 0.2, 0.5)
-        fig = go.Figure(current_fig)
-        fig.update_layout(geo=dict(projection_scale=new_zoom), uirevision='constant')
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, fig, dash.no_update, new_zoom
-
-    # 1. KAPATMA
-    if triggered_id == 'close-btn' or (triggered_id is None and clickData is None):
-        if current_fig:
-            fig = go.Figure(current_fig)
-            fig.update_traces(z=[0.3] * len(df_geo))
-            return {'width': '100%'}, {'width': '0%', 'opacity': 0}, [], None, fig, None, current_zoom
-        else:
-            return {'width': '100%'}, {'width': '0%', 'opacity': 0}, [], None, create_globe(
-                zoom_level=current_zoom), None, current_zoom
-
-    # 2. AÇMA
-    country_name = None
-    if triggered_id == 'globe-graph' and clickData:
-        country_name = clickData['points'][0]['text']
-    elif triggered_id == 'language-selector' and current_country:
-        country_name = current_country
-
-    if country_name is None:
-        return {'width': '100%'}, {'width': '0%', 'opacity': 0}, [], None, dash.no_update, dash.no_update, current_zoom
-
-    # Haberleri Çek
-    news_data = get_country_news(country_name)
-    panel_content = []
 
+def no_data_desc_for(country_name):
+    return f"No recent AI intelligence found for {country_name}."
+
+
+def panel_text_chunks(country_name, news_data, chunk_size=MAX_VISIBLE_NEWS):
+    """Panelde çevrilecek metinleri, üstten alta doğru haber gruplarına bölerek döner."""
+    visible_news = news_data[:MAX_VISIBLE_NEWS] if news_data else []
+    if not visible_news:
+        return [[country_name, NO_DATA_TITLE, no_data_desc_for(country_name)]]
+
+    head = [country_name]
+    if any(news['risk'] for news in visible_news):
+        head.append("CRITICAL")
+    chunks = []
+    for start in range(0, len(visible_news), chunk_size):
+        texts = []
+        for news in visible_news[start:start + chunk_size]:
+            texts += [news['title'], news['desc']]
+        chunks.append(texts)
+    chunks[0] = head + chunks[0]
+    return chunks
+
+
+def source_meta(news):
+    # Yakın-kopyalar tek habere indirildi; kaç yayıncının aynı haberi verdiği gösterilir
+    sources = news.get('sources', 1)
+    meta = f"SOURCE: {news['media']} +{sources - 1}" if sources > 1 else f"SOURCE: {news['media']}"
+    # Birden fazla konu izleniyorsa haberin hangi konu(lar)dan geldiği başa yazılır
+    if len(ACTIVE_TOPICS) > 1 and news.get('topics'):
+        meta = f"{' · '.join(topic_label(name) for name in news['topics'])} | {meta}"
+    return f"{meta} | {news['date']}"
+
+
+def panel_header(country_name, lang_code, translations=None):
     display_country = country_name.upper()
     if lang_code != 'en':
-        translated_country = translate_content(country_name, lang_code).upper()
-        display_country = clean_text_for_bond(translated_country)
+        display_country = clean_text_for_bond((translations or {}).get(country_name, country_name).upper())
+    return html.Div(["INTEL", html.Span(":", className="punct"), f" {display_country}"], className='panel-header')
+
+
+def build_news_panel(country_name, lang_code, news_data, translations=None):
+    """Panel bileşen ağacını kurar.
 
-    panel_content.append(
-        html.Div(["INTEL", html.Span(":", className="punct"), f" {display_country}"], className='panel-header'))
+    translations verilmezse gereken tüm metinler tek seferde çevrilir; verilirse sadece o sözlük kullanılır
+    (eksik metinler orijinal haliyle gösterilir — akış sırasında kısmi çeviri için).
+    """
+    visible_news = news_data[:MAX_VISIBLE_NEWS] if news_data else []
+    panel_content = []
+
+    no_data_title = NO_DATA_TITLE
+    no_data_desc = no_data_desc_for(country_name)
+
+    # Render'daki tüm metinleri toplayıp tek seferde çeviriyoruz
+    if translations is None:
+        translations = {}
+        if lang_code != 'en':
+            texts = [text for chunk in panel_text_chunks(country_name, news_data) for text in chunk]
+            translations = translation_service.translate_many(texts, lang_code)
 
-    if news_data:
-        # MAX 12 HABER KURALI
-        visible_news = news_data[:12]
+    def tr(text):
+        return translations.get(text, text)
 
+    panel_content.append(panel_header(country_name, lang_code, translations))
+
+    if visible_news:
         for news in visible_news:
             risk_label = []
             item_class = 'news-item-safe'
@@ -234,44 +327,405 @@ def update_situation_room(clickData, close_clicks, lang_code, zoom_in, zoom_out,
                 title_class = 'news-title title-critical'
                 risk_text = "CRITICAL"
                 if lang_code != 'en':
-                    risk_text = clean_text_for_bond(translate_content("CRITICAL", lang_code).upper())
+                    risk_text = clean_text_for_bond(tr("CRITICAL").upper())
                 risk_label = [html.Span(" [", className="punct-red"), risk_text, html.Span("]", className="punct-red")]
 
-            raw_title = news['title'];
-            raw_desc = news['desc']
-            if lang_code != 'en':
-                raw_title = translate_content(news['title'], lang_code)
-                raw_desc = translate_content(news['desc'], lang_code)
+            raw_title = tr(news['title'])
+            raw_desc = tr(news['desc'])
 
             translate_link = f"https://translate.google.com/translate?sl=auto&tl={lang_code}&u={news['link']}"
             item_html = html.A(href=translate_link, target="_blank", style={'textDecoration': 'none'}, children=
             html.Div(className=item_class, children=[
                 html.Div([clean_text_for_bond(raw_title)] + risk_label, className=title_class),
                 html.Div(raw_desc, className='news-desc'),
-                html.Div(f"SOURCE: {news['media']} | {news['date']}", className='news-meta')
+                html.Div(source_meta(news), className='news-meta')
             ]))
             panel_content.append(item_html)
 
     else:
-        no_data_title = "NO DATA DETECTED"
-        no_data_desc = f"No recent AI intelligence found for {country_name}."
         if lang_code != 'en':
-            no_data_title = clean_text_for_bond(translate_content(no_data_title, lang_code))
-            no_data_desc = translate_content(no_data_desc, lang_code)
+            no_data_title = clean_text_for_bond(tr(no_data_title))
+            no_data_desc = tr(no_data_desc)
         panel_content.append(html.Div(className='news-item-safe', children=[
             html.Div(no_data_title, className='news-title', style={'color': 'gray'}),
             html.Div(no_data_desc, className='news-desc')
         ]))
 
-    new_fig = go.Figure(current_fig) if current_fig else create_globe(zoom_level=current_zoom)
-    z_values = [0.3] * len(df_geo)
-    match = df_geo.index[df_geo['COUNTRY'] == country_name].tolist()
-    if match: z_values = [0.3 if i != match[0] else 1.0 for i in range(len(df_geo))]
-    new_fig.update_traces(z=z_values)
-    new_fig.update_layout(uirevision='constant')
+    return panel_content
+
+
+# --- KARŞILAŞTIRMA PANELİ ---
+def compare_summary(news_data):
+    """(haber sayısı, kritik sayısı, en yüksek skorlu kritik haberler)"""
+    visible_news = news_data[:MAX_VISIBLE_NEWS] if news_data else []
+    critical = [news for news in visible_news if news['risk']]
+    top = sorted(critical, key=lambda news: news.get('risk_score', 0), reverse=True)[:COMPARE_TOP_CRITICAL]
+    return len(visible_news), len(critical), top
+
+
+def compare_texts(countries, news_by_country):
+    texts = ["COMPARE", "INTEL", "CRITICAL", NO_DATA_TITLE]
+    for country in countries:
+        texts.append(country)
+        texts += [news['title'] for news in compare_summary(news_by_country.get(country))[2]]
+    return list(dict.fromkeys(texts))
+
+
+def build_compare_panel(countries, lang_code, news_by_country, translations=None):
+    """Seçili ülkeleri yan yana özetler: haber/kritik sayıları, kritik oranı çubuğu, en riskli başlıklar.
+
+    Henüz gelmemiş ülkeler (news_by_country'de yok) 'ACQUIRING' olarak gösterilir.
+    """
+    if translations is None:
+        translations = {}
+        if lang_code != 'en':
+            translations = translation_service.translate_many(compare_texts(countries, news_by_country), lang_code)
+
+    def label(text):
+        if lang_code == 'en':
+            return text
+        return clean_text_for_bond(translations.get(text, text).upper())
+
+    panel_content = [html.Div([label("COMPARE"), html.Span(":", className="punct"), f" {len(countries)}"],
+                              className='panel-header')]
+    for country in countries:
+        header = html.Div(label(country) if lang_code != 'en' else country.upper(), className='news-title title-safe')
+        if country not in news_by_country:
+            panel_content.append(html.Div(className='compare-block', children=[
+                header, html.Div("ACQUIRING INTEL...", className='news-meta')]))
+            continue
+
+        total, critical, top = compare_summary(news_by_country[country])
+        if not total:
+            panel_content.append(html.Div(className='compare-block', children=[
+                header, html.Div(label(NO_DATA_TITLE), className='news-title', style={'color': 'gray'})]))
+            continue
+
+        ratio = critical / total
+        children = [
+            header,
+            html.Div(className='compare-stats', children=[
+                f"{label('INTEL')} {total}", html.Span(" | ", className="punct"),
+                html.Span(f"{label('CRITICAL')} {critical}", className='title-critical' if critical else None),
+            ]),
+            html.Div(className='compare-bar', children=[
+                html.Div(className='compare-bar-fill', style={'width': f"{ratio:.0%}"})]),
+        ]
+        for news in top:
+            translate_link = f"https://translate.google.com/translate?sl=auto&tl={lang_code}&u={news['link']}"
+            children.append(html.A(href=translate_link, target="_blank", style={'textDecoration': 'none'}, children=
+            html.Div(className='news-item-critical', children=[
+                html.Div(clean_text_for_bond(translations.get(news['title'], news['title'])),
+                         className='news-title title-critical'),
+                html.Div(source_meta(news), className='news-meta')
+            ])))
+        panel_content.append(html.Div(className='compare-block', children=children))
+    return panel_content
+
+
+def selected_countries(selectedData):
+    """Lasso/box seçiminden benzersiz ülke adları (tıklama sırası korunur, üst sınırlı)."""
+    points = (selectedData or {}).get('points') or []
+    countries = list(dict.fromkeys(point['text'] for point in points if point.get('text')))
+    return countries[:COMPARE_MAX_COUNTRIES]
+
+
+# --- ARAMA ---
+def build_search_results(result, country_filter):
+    facets = result['facets']
+    chips = []
+    for country, stories, critical in facets['countries'][:12]:
+        active = country == country_filter
+        label = [f"{country.upper()} {stories}"]
+        if critical:
+            label += [html.Span(f" [{critical}]", className='punct-red')]
+        chips.append(html.Button(label, id={'type': 'search-facet', 'index': country},
+                                 className='facet-chip facet-chip-active' if active else 'facet-chip'))
+    total = f"{facets['total']}+" if facets['truncated'] else str(facets['total'])
+    summary = (f"{total} STORIES | 24H {facets['periods']['24h']} | 7D {facets['periods']['7d']} | "
+               f"CRITICAL {facets['critical']}")
+
+    items = []
+    for news in result['results']:
+        title_class = 'news-title title-critical' if news['risk'] else 'news-title title-safe'
+        items.append(html.A(href=news['link'], target="_blank", style={'textDecoration': 'none'}, children=
+        html.Div(className='search-result', children=[
+            html.Div(news['title'], className=title_class),
+            html.Div(f"{', '.join(news['countries']).upper()} | {source_meta(news)}", className='news-meta')
+        ])))
+    if not items:
+        items = [html.Div(NO_DATA_TITLE, className='news-meta')]
+    return [html.Div(summary, className='search-summary'), html.Div(chips, className='facet-chips')] + items
+
+
+@app.callback(
+    [Output('search-results', 'children'),
+     Output('search-suggestions', 'children')],
+    [Input('search-input', 'value'),
+     Input('search-period', 'value'),
+     Input('search-critical', 'value'),
+     Input('search-country-store', 'data')]
+)
+def run_search(query, period, critical, country_filter):
+    # Her tuşta çalışır: yerel indeks + LRU, ağa çıkmaz
+    result = search_service.search(query, country=country_filter, period=period, critical=bool(critical))
+    if result is None:
+        return [], []
+    suggestions = [html.Option(value=title) for title in
+                   dict.fromkeys(news['title'] for news in result['results'][:8])]
+    return build_search_results(result, country_filter), suggestions
+
+
+@app.callback(
+    Output('search-country-store', 'data'),
+    [Input({'type': 'search-facet', 'index': ALL}, 'n_clicks'),
+     Input('search-input', 'value')],
+    State('search-country-store', 'data'),
+    prevent_initial_call=True
+)
+def toggle_search_country(facet_clicks, query, current):
+    # Yeni sorguda ülke filtresi sıfırlanır; aynı çipe tekrar tıklamak filtreyi kaldırır
+    if ctx.triggered_id == 'search-input':
+        return None if current else dash.no_update
+    if not ctx.triggered or not ctx.triggered[0]['value']:
+        # Sonuçlar yeniden çizilince yeni çipler eklenir; tıklanmadıkça filtre değişmez
+        return dash.no_update
+    country = ctx.triggered_id['index']
+    return None if country == current else country
+
+
+# --- 1. HIZLI AŞAMA: Panel aç/kapa + vurgulama (ağa çıkmaz, anında döner) ---
+@app.callback(
+    [Output('map-container', 'style'),
+     Output('news-panel', 'style'),
+     Output('selected-country-store', 'data'),
+     Output('globe-graph', 'figure'),
+     Output('globe-graph', 'clickData')],
+    [Input('globe-graph', 'clickData'),
+     Input('globe-graph', 'selectedData'),
+     Input('close-btn', 'n_clicks')],
+    [State('selected-country-store', 'data'),
+     State('map-mode-store', 'data')]
+)
+@metrics.timed('situation_room')
+def update_situation_room(clickData, selectedData, close_clicks, current_country, map_mode):
+    triggered_id = ctx.triggered_id
+    # Tehdit haritasında z skorları gösterir; seçim vurgusu yapılmaz
+    highlight = map_mode != 'threat'
+
+    # ÇOKLU SEÇİM (lasso/box ya da Shift+tık): 2+ ülke karşılaştırma paneli açar
+    countries = selected_countries(selectedData) if 'globe-graph.selectedData' in ctx.triggered_prop_ids else []
+    if len(countries) < 2 and triggered_id == 'globe-graph' and 'globe-graph.clickData' not in ctx.triggered_prop_ids:
+        # Tek ülkelik seçim clickData ile zaten işleniyor
+        return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
+    if len(countries) >= 2:
+        new_fig = dash.no_update
+        if highlight and countries != current_country:
+            with metrics.span('highlight_patch'):
+                new_fig = highlight_patch(countries, current_country)
+        return {'width': '60%'}, {'width': '40%', 'opacity': 1}, countries, new_fig, dash.no_update
+
+    # KAPATMA
+    if triggered_id == 'close-btn' or clickData is None:
+        fig = highlight_patch(None, current_country) if current_country and highlight else Patch()
+        # Plotly'nin kendi seçim soluklaştırması da temizlensin
+        fig['data'][0]['selectedpoints'] = None
+        return {'width': '100%'}, {'width': '0%', 'opacity': 0}, None, fig, None
+
+    # AÇMA
+    country_name = clickData['points'][0]['text']
+    new_fig = dash.no_update
+    if highlight and country_name != current_country:
+        with metrics.span('highlight_patch'):
+            new_fig = highlight_patch(country_name, current_country)
+    return {'width': '60%'}, {'width': '40%', 'opacity': 1}, country_name, new_fig, dash.no_update
+
+
+# --- 2. YAVAŞ AŞAMA: Haber çekme + çeviri (arka plan işi, Flask thread'ini tutmaz) ---
+# Başka bir ülkeye tıklanınca store değişir, Dash çalışan eski işi otomatik iptal eder.
+# Akış: önce elde olan haberler (İngilizce), sonra taze veri, sonra çeviriler parça parça yerine oturur.
+@app.callback(
+    Output('news-content', 'children'),
+    [Input('selected-country-store', 'data'),
+     Input('language-selector', 'value')],
+    background=True,
+    progress=[Output('news-progress', 'children'),
+              Output('news-stream', 'children')],
+    progress_default=["", []],
+    running=[(Output('news-content', 'style'), {'display': 'none'}, {'display': 'block'})],
+    interval=300,
+    cancel=[Input('close-btn', 'n_clicks')],
+    prevent_initial_call=True
+)
+def load_news_panel(set_progress, country_name, lang_code):
+    if not country_name:
+        return []
+    # İş süreci dönüşte os._exit ile kapanır; bayat kayıt için açılan thread yenilemeyi bitiremez.
+    # Yenileme iş içinde, bayat haberler gösterildikten sonra yapılır (iter_country_news).
+    news_cache.background_refresh = False
+    try:
+        with metrics.span('news_panel'):
+            if isinstance(country_name, list):
+                return _load_compare_panel(set_progress, country_name, lang_code)
+            return _load_news_panel(set_progress, country_name, lang_code)
+    finally:
+        # İş ayrı süreçte çalışıyor ve süreç atexit çalıştırmadan kapanıyor: ölçümler şimdi yazılmalı
+        metrics.flush()
+
+
+def _load_news_panel(set_progress, country_name, lang_code):
+    set_progress(("ACQUIRING INTEL...", [panel_header(country_name, 'en')]))
+    news_data = None
+    with metrics.span('news_load'):
+        for news_data in iter_country_news(country_name):
+            if news_data:
+                set_progress(("ACQUIRING INTEL...",
+                              build_news_panel(country_name, lang_code, news_data, translations={})))
+
+    # Aynı haber anlık görüntüsü bu dilde daha önce render edildiyse ağaç yeniden kurulmaz
+    version = news_snapshot_version(news_data)
+    cached_panel = panel_memo.get(country_name, lang_code, version)
+    if cached_panel is not None:
+        return cached_panel
+
+    if lang_code == 'en':
+        with metrics.span('panel_build'):
+            panel = build_news_panel(country_name, lang_code, news_data, translations={})
+            return panel_memo.put(country_name, lang_code, version, panel)
+
+    failures_before = translation_service.stats()['failures']
+    translations = {}
+    chunks = panel_text_chunks(country_name, news_data, STREAM_TRANSLATE_CHUNK)
+    for i, texts in enumerate(chunks, start=1):
+        set_progress((f"TRANSLATING {i}/{len(chunks)}...",
+                      build_news_panel(country_name, lang_code, news_data, translations=translations)))
+        with metrics.span('translate'):
+            translations.update(translation_service.translate_many(texts, lang_code))
+    with metrics.span('panel_build'):
+        panel = build_news_panel(country_name, lang_code, news_data, translations=translations)
+        # Çevirisi yarım kalan panel saklanmaz; bir sonraki açılışta tekrar denensin
+        if translation_service.stats()['failures'] > failures_before:
+            return panel
+        return panel_memo.put(country_name, lang_code, version, panel)
+
+
+def _load_compare_panel(set_progress, countries, lang_code):
+    # Ülkeler sınırlı bir havuzda paralel çekilir; her biri geldikçe panelde yerini alır
+    news_by_country = {}
+    set_progress((f"ACQUIRING INTEL 0/{len(countries)}...", build_compare_panel(countries, 'en', {}, {})))
+    with metrics.span('compare_fetch'):
+        for country, news_data in iter_many_country_news(countries):
+            news_by_country[country] = news_data or []
+            set_progress((f"ACQUIRING INTEL {len(news_by_country)}/{len(countries)}...",
+                          build_compare_panel(countries, lang_code, news_by_country, translations={})))
+
+    memo_key = '|'.join(countries)
+    version = news_snapshot_version([news for country in countries for news in news_by_country[country]])
+    cached_panel = panel_memo.get(memo_key, lang_code, version)
+    if cached_panel is not None:
+        return cached_panel
+
+    failures_before = translation_service.stats()['failures']
+    translations = {}
+    if lang_code != 'en':
+        set_progress(("TRANSLATING...", build_compare_panel(countries, lang_code, news_by_country, translations={})))
+        with metrics.span('translate'):
+            translations = translation_service.translate_many(compare_texts(countries, news_by_country), lang_code)
+    with metrics.span('panel_build'):
+        panel = build_compare_panel(countries, lang_code, news_by_country, translations=translations)
+        if translation_service.stats()['failures'] > failures_before:
+            return panel
+        return panel_memo.put(memo_key, lang_code, version, panel)
+
+
+# --- TEHDİT HARİTASI ---
+@app.callback(
+    [Output('globe-graph', 'figure', allow_duplicate=True),
+     Output('map-mode-store', 'data'),
+     Output('threat-interval', 'disabled'),
+     Output('threat-version-store', 'data'),
+     Output('threat-toggle', 'className')],
+    Input('threat-toggle', 'n_clicks'),
+    [State('map-mode-store', 'data'),
+     State('selected-country-store', 'data')],
+    prevent_initial_call=True
+)
+def toggle_threat_map(n_clicks, map_mode, current_country):
+    if map_mode == 'threat':
+        return selection_mode_patch(current_country), 'select', True, None, 'mode-btn'
+
+    # Eksik/bayat ülkeleri arka planda toplu çek; elde olanla hemen boya
+    threat_map = get_threat_map()
+    threat_map.start_ingest()
+    threat_map.refresh()
+    return threat_patch(), 'threat', False, threat_map.version, 'mode-btn mode-btn-active'
+
+
+@app.callback(
+    [Output('globe-graph', 'figure', allow_duplicate=True),
+     Output('threat-version-store', 'data', allow_duplicate=True),
+     Output('threat-toggle', 'children')],
+    Input('threat-interval', 'n_intervals'),
+    [State('threat-version-store', 'data'),
+     State('map-mode-store', 'data')],
+    prevent_initial_call=True
+)
+def refresh_threat_map(n_intervals, version, map_mode):
+    if map_mode != 'threat':
+        return dash.no_update, dash.no_update, threat_button_label()
+    # Sadece yeni makalesi gelen ülkeler yeniden hesaplanır
+    threat_map = get_threat_map()
+    with metrics.span('threat_refresh'):
+        threat_map.refresh()
+    if threat_map.version == version:
+        return dash.no_update, dash.no_update, threat_button_label()
+    return threat_patch(full=False), threat_map.version, threat_button_label()
+
+
+# --- KRİTİK UYARILAR ---
+def build_alert_feed(alerts, seen_id):
+    items = []
+    for alert in alerts:
+        class_name = 'alert-item alert-item-new' if alert['alert_id'] > seen_id else 'alert-item'
+        items.append(html.A(className=class_name, href=alert['link'], target='_blank', children=[
+            html.Div([html.Span("[", className="punct-red"), "CRITICAL", html.Span("]", className="punct-red"),
+                      f" {alert['country'].upper()}"], className='alert-country'),
+            html.Div(clean_text_for_bond(alert['title']), className='alert-title'),
+            html.Div(f"SOURCE: {alert['media']}", className='alert-meta'),
+        ]))
+    return items
+
 
-    return {'width': '60%'}, {'width': '40%',
-                              'opacity': 1}, panel_content, country_name, new_fig, dash.no_update, current_zoom
+@app.callback(
+    [Output('alert-feed', 'children'),
+     Output('alert-cursor-store', 'data')],
+    Input('alert-interval', 'n_intervals'),
+    State('alert-cursor-store', 'data')
+)
+def poll_alerts(n_intervals, seen_id):
+    # Sadece alerts tablosundan son birkaç satır okunur; yeni uyarı yoksa arayüz güncellenmez
+    alerts = recent_alerts(ALERT_FEED_LIMIT)
+    latest_id = alerts[0]['alert_id'] if alerts else 0
+    if seen_id is None:
+        # Sayfa ilk açıldığında eski uyarılar "yeni" diye parlamasın
+        return build_alert_feed(alerts, latest_id), latest_id
+    if latest_id <= seen_id:
+        return dash.no_update, dash.no_update
+    return build_alert_feed(alerts, seen_id), latest_id
+
+
+# --- ZOOM (TARAYICI TARAFI) ---
+# Sunucuya hiç gitmez; haber yüklenirken de anında çalışır. JS: assets/clientside.js
+app.clientside_callback(
+    ClientsideFunction(namespace='nexus', function_name='zoom'),
+    [Output('globe-graph', 'figure', allow_duplicate=True),
+     Output('zoom-level-store', 'data')],
+    [Input('zoom-in', 'n_clicks'),
+     Input('zoom-out', 'n_clicks')],
+    [State('zoom-level-store', 'data'),
+     State('globe-graph', 'figure')],
+    prevent_initial_call=True
+)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,314 @@
+"""Bellekte tutulan haber akışı için sütunlu (columnar) makale kümesi.
+
+Makale başına bir dict yerine her alan tek bir numpy dizisinde tutulur:
+- metinler (başlık, açıklama, link, tarih metni, risk kelimeleri) tek bir UTF-8 bayt bloğunda, başlangıç/bitiş
+  ofsetleriyle; erişimde çözülür,
+- yayıncı ve ülke adları internlenir (ad tablosu + int32 kod),
+- Google'ın serbest tarih metni bir kez unix zamanına çevrilir (published_at),
+- risk ve konu etiketleri bit maskesidir; eşleşen risk kelimeleri de RISK_KEYWORDS sırasıyla kelime başına bir
+  bitlik uint64 maskede tutulur (belirli bir kelimeye göre filtre de dizi işlemidir).
+
+Filtre / sıralama (yenilik, risk, risk kelimesi, ülke, konu) dizi işlemleriyle yapılır; panel ve diğer tüketiciler
+to_articles() ile bugünkü dict biçimini alır. numpy sadece bu modül import edilince yüklenir.
+"""
+import json
+
+import numpy as np
+
+from article_store import parse_news_date
+from risk_engine import RISK_KEYWORDS
+from topics import TOPIC_PROFILES
+
+FLAG_RISK = 1
+MAX_TOPICS = 32  # Konu maskesi uint32
+TERM_BITS = {keyword: 1 << i for i, keyword in enumerate(RISK_KEYWORDS)}  # Risk kelimesi maskesi uint64
+assert len(TERM_BITS) <= 64, "Risk kelimesi maskesi 64 kelimeyi aşamaz"
+
+_TEXT_FIELDS = ('title', 'desc', 'link', 'date', 'risk_terms')
+_NO_CLUSTER = -1
+
+
+def term_mask(keywords):
+    """Risk kelimesi (ya da kelime listesi) için uint64 maske; bilinmeyen kelime 0 bit verir."""
+    if isinstance(keywords, str):
+        keywords = (keywords,)
+    mask = 0
+    for keyword in keywords:
+        mask |= TERM_BITS.get(keyword, 0)
+    return np.uint64(mask)
+
+
+class _Builder:
+    """Makaleleri satır satır alıp sütunlara çevirir; ad tabloları burada internlenir."""
+
+    def __init__(self, topic_names):
+        self.topic_bits = {name: 1 << i for i, name in enumerate(topic_names)}
+        self.topic_names = tuple(topic_names)
+        self.media_codes, self.country_codes = {}, {}
+        self.columns = {name: [] for name in ('id', 'published_at', 'risk_score', 'flags', 'terms', 'topics',
+                                              'media', 'country', 'cluster_id', 'sources')}
+        self.texts = []  # makale başına _TEXT_FIELDS sırasıyla kodlanmış metinler
+
+    def add(self, article_id, title, desc, link, date_text, risk_terms, media, country, published_at, risk,
+            risk_score, cluster_id=None, sources=1, topics=()):
+        columns = self.columns
+        columns['id'].append(article_id)
+        columns['published_at'].append(published_at)
+        columns['risk_score'].append(risk_score)
+        columns['flags'].append(FLAG_RISK if risk else 0)
+        terms = 0
+        for keyword in risk_terms:
+            terms |= TERM_BITS.get(keyword, 0)
+        columns['terms'].append(terms)
+        mask = 0
+        for name in topics:
+            bit = self.topic_bits.get(name)
+            if bit is None:
+                if len(self.topic_names) >= MAX_TOPICS:
+                    raise ValueError(f"En fazla {MAX_TOPICS} konu etiketi desteklenir")
+                bit = self.topic_bits[name] = 1 << len(self.topic_names)
+                self.topic_names += (name,)
+            mask |= bit
+        columns['topics'].append(mask)
+        columns['media'].append(self.media_codes.setdefault(media, len(self.media_codes)))
+        columns['country'].append(self.country_codes.setdefault(country, len(self.country_codes)))
+        columns['cluster_id'].append(_NO_CLUSTER if cluster_id is None else cluster_id)
+        columns['sources'].append(sources)
+        self.texts.extend(text.encode('utf-8') for text in (title, desc, link, date_text, ', '.join(risk_terms)))
+
+    def build(self):
+        columns = self.columns
+        lengths = np.fromiter((len(text) for text in self.texts), dtype=np.int64, count=len(self.texts))
+        ends = np.cumsum(lengths)
+        offsets = np.stack([ends - lengths, ends], axis=1).reshape(-1, len(_TEXT_FIELDS), 2)
+        return ArticleBatch(
+            ids=np.array(columns['id'], dtype=np.int64),
+            published_at=np.array(columns['published_at'], dtype=np.float64),
+            risk_score=np.array(columns['risk_score'], dtype=np.float64),
+            flags=np.array(columns['flags'], dtype=np.uint8),
+            terms=np.array(columns['terms'], dtype=np.uint64),
+            topics=np.array(columns['topics'], dtype=np.uint32),
+            media=np.array(columns['media'], dtype=np.int32),
+            country=np.array(columns['country'], dtype=np.int32),
+            cluster_id=np.array(columns['cluster_id'], dtype=np.int64),
+            sources=np.array(columns['sources'], dtype=np.int32),
+            offsets=offsets.astype(np.uint32 if ends.size == 0 or ends[-1] < 2 ** 32 else np.int64),
+            text=b''.join(self.texts),
+            media_names=tuple(self.media_codes),
+            country_names=tuple(self.country_codes),
+            topic_names=self.topic_names,
+        )
+
+
+class ArticleBatch:
+    """Sütunlu makale kümesi. Seçim işlemleri (filter/take/top) yeni bir ArticleBatch döner; metin bloğu ve ad
+    tabloları kopyalanmadan paylaşılır."""
+
+    __slots__ = ('ids', 'published_at', 'risk_score', 'flags', 'terms', 'topics', 'media', 'country', 'cluster_id',
+                 'sources', 'offsets', 'text', 'media_names', 'country_names', 'topic_names')
+
+    def __init__(self, ids, published_at, risk_score, flags, terms, topics, media, country, cluster_id, sources,
+                 offsets, text, media_names, country_names, topic_names):
+        self.ids = ids
+        self.published_at = published_at
+        self.risk_score = risk_score
+        self.flags = flags
+        self.terms = terms  # TERM_BITS maskesi
+        self.topics = topics
+        self.media = media
+        self.country = country
+        self.cluster_id = cluster_id
+        self.sources = sources
+        self.offsets = offsets  # (n, len(_TEXT_FIELDS), 2): text içindeki [başlangıç, bitiş)
+        self.text = text
+        self.media_names = media_names
+        self.country_names = country_names
+        self.topic_names = topic_names
+
+    # --- OLUŞTURMA ---
+    @classmethod
+    def from_articles(cls, articles, country=None, now=None):
+        """news_backend / article_store makale dict'lerinden. Tarih metni published_at yoksa burada çözülür."""
+        builder = _Builder(tuple(TOPIC_PROFILES))
+        for i, item in enumerate(articles):
+            date_text = item.get('date') or ''
+            published_at = item.get('published_at')
+            builder.add(item.get('id', i), item.get('title') or '', item.get('desc') or '',
+                        item.get('link') or '#', date_text, item.get('risk_terms') or (),
+                        item.get('media') or 'Unknown Source', item.get('country') or country or '',
+                        parse_news_date(date_text, now) if published_at is None else published_at,
+                        item.get('risk'), float(item.get('risk_score') or 0), item.get('cluster_id'),
+                        item.get('sources', 1), item.get('topics') or ())
+        return builder.build()
+
+    @classmethod
+    def from_rows(cls, rows, topics=None):
+        """article_store satırlarından (dict'e çevirmeden). topics: {makale id: [konu]}"""
+        builder = _Builder(tuple(TOPIC_PROFILES))
+        topics = topics or {}
+        for row in rows:
+            builder.add(row['id'], row['title'], row['desc'], row['link'], row['date_text'] or 'Recent',
+                        json.loads(row['risk_terms']), row['media'] or 'Unknown Source', row['country'],
+                        row['published_at'], row['risk'], row['risk_score'], row['cluster_id'], 1,
+                        topics.get(row['id'], ()))
+        return builder.build()
+
+    @classmethod
+    def concat(cls, batches):
+        """Birden fazla kümeyi (ör. ülke başına) tek kümede birleştirir; ad tabloları yeniden eşlenir."""
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.from_articles([])
+        media_names, country_names, topic_names = {}, {}, {}
+        media, country, topics, offsets = [], [], [], []
+        base = 0
+        for batch in batches:
+            media_map = np.array([media_names.setdefault(name, len(media_names)) for name in batch.media_names],
+                                 dtype=np.int32)
+            country_map = np.array([country_names.setdefault(name, len(country_names))
+                                    for name in batch.country_names], dtype=np.int32)
+            media.append(media_map[batch.media])
+            country.append(country_map[batch.country])
+            remapped = np.zeros(len(batch), dtype=np.uint32)
+            for i, name in enumerate(batch.topic_names):
+                bit = 1 << topic_names.setdefault(name, len(topic_names))
+                remapped[(batch.topics >> np.uint32(i)) & np.uint32(1) == 1] |= np.uint32(bit)
+            topics.append(remapped)
+            offsets.append(batch.offsets.astype(np.int64) + base)
+            base += len(batch.text)
+        offsets = np.concatenate(offsets)
+        return cls(
+            ids=np.concatenate([batch.ids for batch in batches]),
+            published_at=np.concatenate([batch.published_at for batch in batches]),
+            risk_score=np.concatenate([batch.risk_score for batch in batches]),
+            flags=np.concatenate([batch.flags for batch in batches]),
+            terms=np.concatenate([batch.terms for batch in batches]),
+            topics=np.concatenate(topics),
+            media=np.concatenate(media),
+            country=np.concatenate(country),
+            cluster_id=np.concatenate([batch.cluster_id for batch in batches]),
+            sources=np.concatenate([batch.sources for batch in batches]),
+            offsets=offsets.astype(np.uint32) if base < 2 ** 32 else offsets,
+            text=b''.join(batch.text for batch in batches),
+            media_names=tuple(media_names),
+            country_names=tuple(country_names),
+            topic_names=tuple(topic_names),
+        )
+
+    # --- SEÇİM ---
+    def __len__(self):
+        return len(self.ids)
+
+    def take(self, indices):
+        """Verilen satırlar (sıralı indeks dizisi ya da bool maske) ile yeni küme."""
+        return ArticleBatch(self.ids[indices], self.published_at[indices], self.risk_score[indices],
+                            self.flags[indices], self.terms[indices], self.topics[indices], self.media[indices],
+                            self.country[indices], self.cluster_id[indices], self.sources[indices],
+                            self.offsets[indices], self.text, self.media_names, self.country_names, self.topic_names)
+
+    def mask(self, country=None, since=None, risk=None, topic=None, media=None, min_score=None, terms=None,
+             all_terms=False):
+        """Kriterlere uyan satırların bool maskesi (verilmeyen kriter uygulanmaz).
+
+        terms: risk kelimesi, kelime listesi ya da term_mask() maskesi; varsayılan olarak herhangi biri eşleşen,
+        all_terms=True ile hepsi eşleşen makaleler.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if country is not None:
+            mask &= self.country == self._code(self.country_names, country)
+        if media is not None:
+            mask &= self.media == self._code(self.media_names, media)
+        if since is not None:
+            mask &= self.published_at >= since
+        if risk is not None:
+            mask &= ((self.flags & FLAG_RISK) != 0) == bool(risk)
+        if topic is not None:
+            bit = 1 << self.topic_names.index(topic) if topic in self.topic_names else 0
+            mask &= (self.topics & np.uint32(bit)) != 0
+        if min_score is not None:
+            mask &= self.risk_score >= min_score
+        if terms is not None:
+            bits = terms if isinstance(terms, (int, np.integer)) else term_mask(terms)
+            bits = np.uint64(bits)
+            mask &= (self.terms & bits) == bits if all_terms else (self.terms & bits) != 0
+        return mask
+
+    def filter(self, **criteria):
+        return self.take(np.flatnonzero(self.mask(**criteria)))
+
+    def order(self, by='recency'):
+        """Sıralama indeksleri. recency: en yeni önce; risk: kritikler önce, sonra skor, sonra yenilik."""
+        if by == 'recency':
+            return np.lexsort((-self.ids, -self.published_at))
+        if by == 'risk':
+            return np.lexsort((-self.published_at, -self.risk_score, -(self.flags & FLAG_RISK).astype(np.int8)))
+        raise ValueError(f"Bilinmeyen sıralama: {by}")
+
+    def _primary_key(self, by):
+        """order() ile aynı yönde tek sayısal anahtar (ilk sıralama kolonları birleşik)."""
+        if by == 'risk':
+            scores = self.risk_score - self.risk_score.min()
+            return (self.flags & FLAG_RISK) * (scores.max() + 1) + scores
+        return self.published_at
+
+    def top(self, limit, by='recency', **criteria):
+        """Kriterlere uyan ilk limit makale, verilen sırada."""
+        selected = self.filter(**criteria) if criteria else self
+        count = len(selected)
+        if not 0 < limit < count:
+            return selected.take(selected.order(by)[:max(limit, 0)])
+        # Tüm kümeyi sıralamak yerine birleşik anahtarda ilk limit'e giren adaylar (eşitler dahil) seçilir
+        key = selected._primary_key(by)
+        candidates = selected.take(np.flatnonzero(key >= np.partition(key, count - limit)[count - limit]))
+        return candidates.take(candidates.order(by)[:limit])
+
+    @staticmethod
+    def _code(names, name):
+        try:
+            return names.index(name)
+        except ValueError:
+            return -1
+
+    # --- DICT'E DÖNÜŞ ---
+    def _text(self, row, field):
+        start, end = self.offsets[row, field]
+        return self.text[start:end].decode('utf-8')
+
+    def article(self, row):
+        """Tek satırı article_store.row_to_article ile aynı biçimde dict olarak döner."""
+        title, desc, link, date_text, terms = (self._text(row, field) for field in range(len(_TEXT_FIELDS)))
+        mask = int(self.topics[row])
+        cluster_id = int(self.cluster_id[row])
+        return {
+            'id': int(self.ids[row]),
+            'title': title,
+            'desc': desc,
+            'date': date_text or 'Recent',
+            'link': link,
+            'media': self.media_names[self.media[row]],
+            'risk': bool(self.flags[row] & FLAG_RISK),
+            'risk_score': float(self.risk_score[row]),
+            'risk_terms': terms.split(', ') if terms else [],
+            'published_at': float(self.published_at[row]),
+            'country': self.country_names[self.country[row]],
+            'cluster_id': None if cluster_id == _NO_CLUSTER else cluster_id,
+            'sources': int(self.sources[row]),
+            'topics': [name for i, name in enumerate(self.topic_names) if mask >> i & 1],
+        }
+
+    def to_articles(self):
+        return [self.article(row) for row in range(len(self))]
+
+    # --- ÖZET ---
+    def counts_by_country(self):
+        """{ülke: (makale, kritik)}"""
+        totals = np.bincount(self.country, minlength=len(self.country_names))
+        critical = np.bincount(self.country, weights=self.flags & FLAG_RISK, minlength=len(self.country_names))
+        return {name: (int(totals[i]), int(critical[i])) for i, name in enumerate(self.country_names) if totals[i]}
+
+    @property
+    def nbytes(self):
+        """Dizilerin ve metin bloğunun bayt cinsinden boyutu (ad tabloları hariç)."""
+        arrays = (self.ids, self.published_at, self.risk_score, self.flags, self.terms, self.topics, self.media,
+                  self.country, self.cluster_id, self.sources, self.offsets)
+        return sum(array.nbytes for array in arrays) + len(self.text)
@@ -0,0 +1,581 @@
+"""Kalıcı yerel haber deposu (SQLite).
+
+Her makale normalize edilmiş link (yoksa başlık) hash'i ile tutulur; yenilemeler sadece yeni makaleleri ekler.
+Panel, ülke + yenilik indeksinden okur. Süreçler (gunicorn worker'ları, arka plan işleri) aynı dosyayı paylaşır.
+
+Yeni makaleler eklenirken yakın-kopya kümelerine atanır (story_clusters: MinHash + LSH bantları, bu dosyadaki
+story_bands tablosu). Aynı haberin farklı sitelerdeki ve ülkelerdeki kopyaları aynı cluster_id'yi alır;
+recent_stories() küme başına tek temsilci ve kaynak sayısı döner.
+
+Makalenin hangi konu profillerinin (topics.py) sorgularından geldiği article_topics tablosunda tutulur; aynı
+makale sonradan başka bir konuda da bulunursa etiketi eklenir.
+
+Başlık ve açıklamalar FTS5 indeksinde (articles_fts) tetikleyicilerle artımlı tutulur; FTS5 derlenmemiş
+SQLite'ta arama LIKE taramasına düşer (search.py).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from story_clusters import (STORY_SIMILARITY, band_keys, minhash_signature, pack_signature, signature_similarity,
+                            story_text, unpack_signature)
+from topics import DEFAULT_TOPIC
+
+DB_PATH = os.environ.get('NEXUS_DB_PATH',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'nexus.db'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    article_key TEXT NOT NULL,
+    country TEXT NOT NULL,
+    title TEXT NOT NULL,
+    desc TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '#',
+    media TEXT NOT NULL DEFAULT '',
+    date_text TEXT NOT NULL DEFAULT '',
+    published_at REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    risk INTEGER NOT NULL DEFAULT 0,
+    risk_score REAL NOT NULL DEFAULT 0,
+    risk_terms TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (country, article_key)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_country_recent ON articles (country, published_at DESC);
+CREATE TABLE IF NOT EXISTS fetch_log (
+    country TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    new_articles INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS story_clusters (
+    id INTEGER PRIMARY KEY,  -- temsilci (ilk) makalenin id'si
+    signature BLOB NOT NULL,
+    last_seen REAL NOT NULL,
+    size INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS story_bands (
+    band_key INTEGER NOT NULL,
+    cluster_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_story_bands_key ON story_bands (band_key);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    story_id INTEGER NOT NULL UNIQUE,  -- küme id'si: aynı haber bir kez uyarılır
+    title_key TEXT NOT NULL UNIQUE,  -- küme penceresi dışında yeniden çıkan aynı başlık da uyarılmaz
+    article_id INTEGER NOT NULL,
+    country TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL DEFAULT '#',
+    media TEXT NOT NULL DEFAULT '',
+    risk_score REAL NOT NULL DEFAULT 0,
+    risk_terms TEXT NOT NULL DEFAULT '[]',
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pipeline_cursors (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+"""
+
+# Eski veritabanlarına sonradan eklenen kolonlar: (kolon, tanım)
+_MIGRATIONS = (
+    ('cluster_id', 'INTEGER'),
+)
+_POST_MIGRATION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_articles_cluster ON articles (cluster_id);
+CREATE INDEX IF NOT EXISTS idx_articles_unclustered ON articles (id) WHERE cluster_id IS NULL;
+"""
+
+# Konu etiketleri. Tablo yeni oluşturulduysa mevcut makaleler varsayılan konuya (tek konulu dönem) atanır.
+_TOPIC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_topics (
+    article_id INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (article_id, topic)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_topics_topic ON article_topics (topic, article_id);
+"""
+
+# Harici içerikli FTS5 indeksi: metin articles'ta kalır, indeks tetikleyicilerle eşzamanlı güncellenir.
+# prefix: 2 ve 3 harflik önekler ayrıca indekslenir; typeahead'de "ch"* gibi kısa önekler tüm terimleri taramaz.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, "desc", content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, "desc") VALUES (new.id, new.title, new.desc);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, "desc") VALUES ('delete', old.id, old.title, old.desc);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, desc ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, "desc") VALUES ('delete', old.id, old.title, old.desc);
+    INSERT INTO articles_fts (rowid, title, "desc") VALUES (new.id, new.title, new.desc);
+END;
+"""
+
+STORY_CLUSTER_WINDOW = 3 * 86400  # Bu süreden eski kümelere yeni makale katılmaz (sn)
+STORY_BACKFILL_BATCH = 200  # Her eklemede kümelenmemiş eski makalelerden bu kadarı da işlenir
+STORY_OVERFETCH = 4  # recent_stories: küme başına tek temsilci kalacağı için bu kat fazla satır okunur
+SEARCH_FACET_SCAN_LIMIT = 1000  # Facet sayımları en yeni bu kadar eşleşme üzerinden yapılır ("1000+")
+
+_ARTICLE_COLUMNS = ('id', 'title', 'desc', 'date_text', 'link', 'media', 'risk', 'risk_score', 'risk_terms',
+                    'published_at', 'country', 'cluster_id')
+
+# Google linklerine eklenen izleme parametreleri
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|ved|usg|sa|ei|fbclid|gclid|ocid|cmpid|ref|src)$', re.IGNORECASE)
+_WS = re.compile(r'\s+')
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def normalize_link(link):
+    if not link or link == '#':
+        return None
+    # GoogleNews bazen linkin sonuna "&ved=...&usg=..." ekliyor
+    link = link.split('&ved=')[0]
+    parts = urlsplit(link.strip())
+    if not parts.netloc:
+        return None
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)])
+    return urlunsplit(('https', host, parts.path.rstrip('/'), query, ''))
+
+
+def normalize_title(title):
+    return _WS.sub(' ', _NON_WORD.sub(' ', (title or '').casefold())).strip()
+
+
+def article_key(link, title):
+    """Aynı haberin farklı çekimlerde aynı anahtarı alması için normalize edilmiş link/başlık hash'i."""
+    basis = normalize_link(link) or 'title:' + normalize_title(title)
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:20]
+
+
+_RELATIVE_DATE = re.compile(r'(\d+)\s*(sec|second|min|minute|hour|hr|day|week|month|year)s?\s+ago', re.IGNORECASE)
+_UNIT_SECONDS = {'sec': 1, 'second': 1, 'min': 60, 'minute': 60, 'hour': 3600, 'hr': 3600, 'day': 86400,
+                 'week': 7 * 86400, 'month': 30 * 86400, 'year': 365 * 86400}
+_ABSOLUTE_FORMATS = ('%b %d, %Y', '%d %b %Y', '%B %d, %Y', '%d %B %Y', '%Y-%m-%d', '%m/%d/%Y')
+
+
+def parse_news_date(text, now=None):
+    """Google'ın serbest tarih metnini ("2 hours ago", "Jan 5, 2024") unix zamanına çevirir. Çözülemezse now."""
+    now = time.time() if now is None else now
+    if not text:
+        return now
+    m = _RELATIVE_DATE.search(text)
+    if m:
+        return now - int(m.group(1)) * _UNIT_SECONDS[m.group(2).lower()]
+    if 'yesterday' in text.lower():
+        return now - 86400
+    cleaned = text.strip().rstrip('.')
+    for fmt in _ABSOLUTE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).timestamp()
+        except ValueError:
+            continue
+    return now
+
+
+class ArticleStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.fts_enabled = False
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            # Okuma ağırlıklı (panel, arama): sayfalar mmap ile okunur, her sorguda read() kopyası yapılmaz
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            with self._init_lock:
+                if not self._initialized or self.path == ':memory:':
+                    conn.executescript(_SCHEMA)
+                    self._migrate(conn)
+                    self._init_topics(conn)
+                    self.fts_enabled = self._init_fts(conn)
+                    self._initialized = True
+        return conn
+
+    @staticmethod
+    def _migrate(conn):
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(articles)')}
+        with conn:
+            for name, definition in _MIGRATIONS:
+                if name not in columns:
+                    conn.execute(f'ALTER TABLE articles ADD COLUMN {name} {definition}')
+        conn.executescript(_POST_MIGRATION_SCHEMA)
+
+    @staticmethod
+    def _init_topics(conn):
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_topics'").fetchone()
+        conn.executescript(_TOPIC_SCHEMA)
+        if not exists:
+            with conn:
+                conn.execute('INSERT OR IGNORE INTO article_topics (article_id, topic) SELECT id, ? FROM articles',
+                             (DEFAULT_TOPIC,))
+
+    @staticmethod
+    def _init_fts(conn):
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone()
+        try:
+            conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 kullanılamıyor, arama LIKE ile yapılacak: {e}")
+            return False
+        if not exists:
+            # İndeks mevcut bir veritabanına sonradan eklendi: eski makaleler bir kez indekslenir
+            with conn:
+                conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        return True
+
+    def add_articles(self, country, articles, fetched_at=None):
+        """Sadece yeni makaleleri ekler; eklenen makale sayısını döner."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = []
+        for item in articles:
+            title = item.get('title')
+            if not title:
+                continue
+            date_text = item.get('date') or ''
+            rows.append(((article_key(item.get('link'), title), country, title, item.get('desc') or '',
+                          item.get('link') or '#', item.get('media') or '', date_text,
+                          parse_news_date(date_text, fetched_at), fetched_at, int(bool(item.get('risk'))),
+                          float(item.get('risk_score') or 0), json.dumps(item.get('risk_terms') or [])),
+                         item.get('topics') or ()))
+        conn = self._conn()
+        with conn:
+            # İlk yazım yazma kilidini alır; kümeleme aynı işlemde yapıldığı için süreçler aynı haberi
+            # aynı anda iki ayrı kümeye koyamaz
+            new_rows = []
+            topic_rows = []
+            for row, topics in rows:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO articles (article_key, country, title, desc, link, media, date_text, '
+                    'published_at, fetched_at, risk, risk_score, risk_terms) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', row)
+                if cursor.rowcount:
+                    article_id = cursor.lastrowid
+                    new_rows.append((article_id, row[2], row[3], row[7]))
+                elif topics:
+                    # Bilinen makale başka bir konunun sorgusunda da çıktı: sadece etiketi eklenir
+                    article_id = conn.execute('SELECT id FROM articles WHERE country = ? AND article_key = ?',
+                                              (country, row[0])).fetchone()[0]
+                topic_rows.extend((article_id, topic) for topic in topics)
+            conn.executemany('INSERT OR IGNORE INTO article_topics (article_id, topic) VALUES (?,?)', topic_rows)
+            conn.execute('INSERT OR REPLACE INTO fetch_log (country, fetched_at, new_articles) VALUES (?,?,?)',
+                         (country, fetched_at, len(new_rows)))
+            self._assign_clusters(conn, new_rows)
+            # Kümeleme öncesinden kalan makaleler parça parça işlenir (tek seferlik uzun göç yok)
+            backlog = conn.execute('SELECT id, title, desc, published_at FROM articles WHERE cluster_id IS NULL '
+                                   'ORDER BY id LIMIT ?', (STORY_BACKFILL_BATCH,)).fetchall()
+            self._assign_clusters(conn, [tuple(row) for row in backlog])
+        return len(new_rows)
+
+    def _assign_clusters(self, conn, rows):
+        """(id, title, desc, published_at) satırlarını LSH ile bulunan kümeye ya da yeni bir kümeye atar."""
+        for article_id, title, desc, published_at in rows:
+            signature = minhash_signature(story_text(title, desc))
+            if signature is None:
+                conn.execute('UPDATE articles SET cluster_id = id WHERE id = ?', (article_id,))
+                continue
+            keys = band_keys(signature)
+            candidates = conn.execute(
+                f"SELECT DISTINCT c.id, c.signature FROM story_bands b JOIN story_clusters c ON c.id = b.cluster_id "
+                f"WHERE b.band_key IN ({', '.join('?' * len(keys))}) AND c.last_seen >= ?",
+                (*keys, published_at - STORY_CLUSTER_WINDOW)).fetchall()
+            best_id, best_similarity = None, STORY_SIMILARITY
+            for cluster_id, blob in candidates:
+                similarity = signature_similarity(signature, unpack_signature(blob))
+                if similarity >= best_similarity:
+                    best_id, best_similarity = cluster_id, similarity
+
+            if best_id is None:
+                conn.execute('INSERT OR REPLACE INTO story_clusters (id, signature, last_seen, size) VALUES (?,?,?,1)',
+                             (article_id, pack_signature(signature), published_at))
+                conn.executemany('INSERT INTO story_bands (band_key, cluster_id) VALUES (?,?)',
+                                 [(key, article_id) for key in keys])
+                best_id = article_id
+            else:
+                conn.execute('UPDATE story_clusters SET size = size + 1, last_seen = MAX(last_seen, ?) WHERE id = ?',
+                             (published_at, best_id))
+            conn.execute('UPDATE articles SET cluster_id = ? WHERE id = ?', (best_id, article_id))
+
+    def recent(self, country, limit=15, since=None, topic=None):
+        """Ülkenin en yeni makaleleri (country, published_at) indeksiyle; topic verilirse o konununkiler."""
+        sql = f"SELECT {', '.join(_ARTICLE_COLUMNS)} FROM articles WHERE country = ?"
+        params = [country]
+        if since is not None:
+            sql += ' AND published_at >= ?'
+            params.append(since)
+        if topic is not None:
+            sql += ' AND id IN (SELECT article_id FROM article_topics WHERE topic = ?)'
+            params.append(topic)
+        sql += ' ORDER BY published_at DESC, id DESC LIMIT ?'
+        params.append(limit)
+        return [row_to_article(row) for row in self._conn().execute(sql, params)]
+
+    def recent_stories(self, country, limit=15, topic=None):
+        """Ülkenin en yeni haberleri, yakın-kopyalar birleştirilmiş halde.
+
+        Küme başına en yüksek risk skorlu makale temsilci olur (eşitlikte en yenisi); 'sources' kümedeki farklı
+        yayıncı sayısı, 'countries' kümenin göründüğü ülke sayısıdır (tüm ülkeler genelinde). 'topics' kümedeki
+        makalelerin konu etiketleridir.
+        """
+        stories = {}
+        for article in self.recent(country, limit * STORY_OVERFETCH, topic=topic):
+            key = article['cluster_id'] or article['id']
+            members = stories.get(key)
+            if members is None:
+                if len(stories) >= limit:
+                    continue
+                stories[key] = members = []
+            members.append(article)
+
+        counts = {}
+        cluster_ids = list(stories)
+        if cluster_ids:
+            rows = self._conn().execute(
+                f"SELECT cluster_id, COUNT(DISTINCT media), COUNT(DISTINCT country) FROM articles "
+                f"WHERE cluster_id IN ({', '.join('?' * len(cluster_ids))}) GROUP BY cluster_id", cluster_ids)
+            counts = {row[0]: (row[1], row[2]) for row in rows}
+
+        topics = self.topics_for([article['id'] for members in stories.values() for article in members])
+
+        result = []
+        for key, members in stories.items():
+            representative = dict(max(members, key=lambda article: article['risk_score']))
+            representative['risk'] = any(article['risk'] for article in members)
+            representative['topics'] = sorted({name for article in members for name in topics.get(article['id'], ())})
+            sources, countries = counts.get(key, (len({article['media'] for article in members}), 1))
+            representative['sources'] = max(sources, 1)
+            representative['countries'] = countries
+            result.append(representative)
+        return result
+
+    def batch(self, country=None, since=None, limit=None):
+        """Makaleleri (en yeni önce) dict'e çevirmeden sütunlu ArticleBatch olarak yükler; numpy gerektirir."""
+        from article_batch import ArticleBatch
+        sql = f"SELECT {', '.join(_ARTICLE_COLUMNS)} FROM articles WHERE 1"
+        params = []
+        if country is not None:
+            sql += ' AND country = ?'
+            params.append(country)
+        if since is not None:
+            sql += ' AND published_at >= ?'
+            params.append(since)
+        sql += ' ORDER BY published_at DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        rows = self._conn().execute(sql, params).fetchall()
+        return ArticleBatch.from_rows(rows, self.topics_for([row['id'] for row in rows]))
+
+    def topics_for(self, article_ids):
+        """{makale id: [konu]}"""
+        topics = {}
+        conn = self._conn()
+        for start in range(0, len(article_ids), 500):
+            part = article_ids[start:start + 500]
+            rows = conn.execute(f"SELECT article_id, topic FROM article_topics "
+                                f"WHERE article_id IN ({', '.join('?' * len(part))})", part)
+            for article_id, topic in rows:
+                topics.setdefault(article_id, []).append(topic)
+        return topics
+
+    # --- ARAMA ---
+    def _search_clause(self, terms, country=None, since=None, critical=False):
+        """(FROM/WHERE parçası, parametreler, sıralama kolonu). terms: [(kelime, önek_mi)]"""
+        params = []
+        if self.fts_enabled:
+            sql = 'FROM articles_fts f JOIN articles a ON a.id = f.rowid WHERE articles_fts MATCH ?'
+            params.append(' '.join(f'"{word}"*' if prefix else f'"{word}"' for word, prefix in terms))
+            order = 'f.rowid'
+        else:
+            sql = 'FROM articles a WHERE 1'
+            for word, prefix in terms:
+                escaped = word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                sql += " AND (a.title LIKE ? ESCAPE '\\' OR a.desc LIKE ? ESCAPE '\\')"
+                params += [f'%{escaped}%'] * 2
+            order = 'a.id'
+        if country is not None:
+            sql += ' AND a.country = ?'
+            params.append(country)
+        if since is not None:
+            sql += ' AND a.published_at >= ?'
+            params.append(since)
+        if critical:
+            sql += ' AND a.risk = 1'
+        return sql, params, order
+
+    def search(self, terms, country=None, since=None, critical=False, limit=20):
+        """Eşleşen makaleler, en yeni eklenen önce (FTS5 rowid sırasını indeksten okur; skor hesaplanmaz)."""
+        clause, params, order = self._search_clause(terms, country, since, critical)
+        sql = f"SELECT {', '.join('a.' + c for c in _ARTICLE_COLUMNS)} {clause} ORDER BY {order} DESC LIMIT ?"
+        return [row_to_article(row) for row in self._conn().execute(sql, [*params, limit])]
+
+    def search_facets(self, terms, since=None, critical=False, now=None, scan_limit=SEARCH_FACET_SCAN_LIMIT):
+        """Eşleşmelerin ülke / dönem / risk dağılımı (haber = küme sayısı). Ülke filtresi uygulanmaz ki
+        kullanıcı diğer ülkeleri de görebilsin. En yeni scan_limit eşleşmeye bakılır."""
+        now = time.time() if now is None else now
+        clause, params, order = self._search_clause(terms, None, since, critical)
+        sql = (f"SELECT a.country, COALESCE(a.cluster_id, a.id), a.risk, a.published_at {clause} "
+               f"ORDER BY {order} DESC LIMIT ?")
+        rows = self._conn().execute(sql, [*params, scan_limit + 1]).fetchall()
+        truncated = len(rows) > scan_limit
+        countries, stories, critical_stories = {}, set(), set()
+        periods = {'24h': set(), '7d': set()}
+        for country, story, risk, published_at in rows[:scan_limit]:
+            entry = countries.setdefault(country, [set(), set()])
+            entry[0].add(story)
+            stories.add(story)
+            if risk:
+                entry[1].add(story)
+                critical_stories.add(story)
+            age = now - published_at
+            if age < 86400:
+                periods['24h'].add(story)
+            if age < 7 * 86400:
+                periods['7d'].add(story)
+        by_country = sorted(((c, len(s), len(r)) for c, (s, r) in countries.items()), key=lambda x: (-x[1], x[0]))
+        return {'total': len(stories), 'critical': len(critical_stories), 'truncated': truncated,
+                'countries': by_country, 'periods': {name: len(ids) for name, ids in periods.items()}}
+
+    def max_id(self):
+        """En son eklenen makalenin id'si; arama önbelleği sürümü olarak kullanılır."""
+        return self._conn().execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+
+    def articles_after(self, after_id, limit=500):
+        """id'si after_id'den büyük makaleler, eklenme sırasıyla (birincil anahtar üzerinden; tarama yok)."""
+        rows = self._conn().execute(f"SELECT {', '.join(_ARTICLE_COLUMNS)} FROM articles WHERE id > ? "
+                                    f"ORDER BY id LIMIT ?", (after_id, limit))
+        return [row_to_article(row) for row in rows]
+
+    # --- UYARILAR ---
+    def get_cursor(self, name):
+        row = self._conn().execute('SELECT position FROM pipeline_cursors WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, name, position):
+        conn = self._conn()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO pipeline_cursors (name, position) VALUES (?,?)', (name, position))
+
+    def record_alerts(self, articles, cursor_name, position, created_at=None):
+        """Daha önce uyarılmamış haberleri (küme bazında) kaydeder ve imleci aynı işlemde ilerletir.
+
+        Yeni oluşan uyarıları döner; süreç çökse bile aynı haber iki kez kaydedilmez, imleç geri gitmez.
+        """
+        created_at = time.time() if created_at is None else created_at
+        created = []
+        conn = self._conn()
+        with conn:
+            for article in articles:
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO alerts (story_id, title_key, article_id, country, title, link, media, '
+                    'risk_score, risk_terms, created_at) VALUES (?,?,?,?,?,?,?,?,?,?)',
+                    (article.get('cluster_id') or article['id'], article_key(None, article['title']), article['id'],
+                     article['country'], article['title'], article['link'], article['media'], article['risk_score'],
+                     json.dumps(article['risk_terms']), created_at))
+                if cursor.rowcount:
+                    created.append(dict(article, alert_id=cursor.lastrowid, alerted_at=created_at))
+            conn.execute('INSERT OR REPLACE INTO pipeline_cursors (name, position) VALUES (?,?)',
+                         (cursor_name, position))
+        return created
+
+    def recent_alerts(self, limit=5, after_id=0):
+        """En yeni uyarılar (yeniden eskiye)."""
+        rows = self._conn().execute('SELECT * FROM alerts WHERE id > ? ORDER BY id DESC LIMIT ?', (after_id, limit))
+        return [row_to_alert(row) for row in rows]
+
+    def alerts_after(self, after_id, limit=500):
+        """id'si after_id'den büyük uyarılar, oluşma sırasıyla (teslim imleci için)."""
+        rows = self._conn().execute('SELECT * FROM alerts WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+        return [row_to_alert(row) for row in rows]
+
+    def max_alert_id(self):
+        return self._conn().execute('SELECT COALESCE(MAX(id), 0) FROM alerts').fetchone()[0]
+
+    def last_fetched(self, country):
+        row = self._conn().execute('SELECT fetched_at FROM fetch_log WHERE country = ?', (country,)).fetchone()
+        return row[0] if row else None
+
+    def changed_countries(self, after_id=0):
+        """after_id'den sonra eklenen makalelerin ülkeleri ve en büyük id (artımlı güncelleme için)."""
+        conn = self._conn()
+        max_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+        if max_id <= after_id:
+            return set(), after_id
+        rows = conn.execute('SELECT DISTINCT country FROM articles WHERE id > ? AND id <= ?', (after_id, max_id))
+        return {row[0] for row in rows}, max_id
+
+    def risk_summary(self, countries, since=None):
+        """{country: (haber sayısı, kritik sayısı)} — sadece istenen ülkeler için.
+
+        Yakın-kopyalar tek haber sayılır; aynı ajans haberinin on kopyası skoru on kat şişirmesin.
+        """
+        countries = list(countries)
+        summary = {}
+        conn = self._conn()
+        # SQLite parametre sınırına takılmamak için parça parça
+        for start in range(0, len(countries), 500):
+            part = countries[start:start + 500]
+            sql = (f"SELECT country, COUNT(DISTINCT COALESCE(cluster_id, id)), "
+                   f"COUNT(DISTINCT CASE WHEN risk THEN COALESCE(cluster_id, id) END) FROM articles "
+                   f"WHERE country IN ({', '.join('?' * len(part))})")
+            params = list(part)
+            if since is not None:
+                sql += ' AND published_at >= ?'
+                params.append(since)
+            for country, total, critical in conn.execute(sql + ' GROUP BY country', params):
+                summary[country] = (total, critical or 0)
+        return summary
+
+    def count(self, country=None):
+        if country is None:
+            return self._conn().execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        return self._conn().execute('SELECT COUNT(*) FROM articles WHERE country = ?', (country,)).fetchone()[0]
+
+
+def row_to_article(row):
+    """DB satırını uygulamanın kullandığı makale sözlüğüne çevirir."""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'desc': row['desc'],
+        'date': row['date_text'] or 'Recent',
+        'link': row['link'],
+        'media': row['media'] or 'Unknown Source',
+        'risk': bool(row['risk']),
+        'risk_score': row['risk_score'],
+        'risk_terms': json.loads(row['risk_terms']),
+        'published_at': row['published_at'],
+        'country': row['country'],
+        'cluster_id': row['cluster_id'],
+    }
+
+
+def row_to_alert(row):
+    return {'alert_id': row['id'], 'article_id': row['article_id'], 'country': row['country'], 'title': row['title'],
+            'link': row['link'], 'media': row['media'], 'risk_score': row['risk_score'],
+            'risk_terms': json.loads(row['risk_terms']), 'alerted_at': row['created_at']}
+
+
+article_store = ArticleStore()
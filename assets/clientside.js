@@ -0,0 +1,32 @@
+// Sunucuya gitmeden çalışan tarayıcı tarafı callback'ler
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    nexus: {
+        // ZOOM: Figür tarayıcıda kalır, sadece projection.scale değişir
+        zoom: function (zoomIn, zoomOut, currentZoom, figure) {
+            const ctx = window.dash_clientside.callback_context;
+            const triggered = ctx.triggered.length ? ctx.triggered[0].prop_id.split('.')[0] : null;
+            const zoom = currentZoom || 1.0;
+            let newZoom = zoom;
+
+            if (triggered === 'zoom-in') {
+                newZoom = Math.min(zoom + 0.2, 3.0);
+            } else if (triggered === 'zoom-out') {
+                newZoom = Math.max(zoom - 0.2, 0.5);
+            }
+            if (newZoom === zoom || !figure) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+
+            const layout = figure.layout || {};
+            const geo = layout.geo || {};
+            const newFigure = Object.assign({}, figure, {
+                layout: Object.assign({}, layout, {
+                    geo: Object.assign({}, geo, {
+                        projection: Object.assign({}, geo.projection, {scale: newZoom})
+                    })
+                })
+            });
+            return [newFigure, newZoom];
+        }
+    }
+});
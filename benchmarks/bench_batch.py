@@ -0,0 +1,125 @@
+"""Bellekteki haber akışı: makale dict listesi ve sütunlu ArticleBatch, bellek ve filtre/sıralama süresi.
+
+    python benchmarks/bench_batch.py                 # 100000 makale
+    python benchmarks/bench_batch.py --count 300000
+
+Her iki temsil de aynı sentetik korpustan, kendi metin nesneleriyle oluşturulur ve tracemalloc ile ölçülür
+(dict tarafı article_store.row_to_article'ın döndürdüğü biçimdedir). İşlem süreleri: ülke + risk filtresi,
+risk kelimesi filtresi, yeniliğe göre ilk 12, riske göre ilk 12, son 24 saat sayımı.
+"""
+import argparse
+import gc
+import heapq
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_batch import ArticleBatch  # noqa: E402
+from record_fixtures import DATES, DEFAULT_COUNTRIES, MEDIA  # noqa: E402
+
+WORDS = ('model chip lab startup regulator ministry drone cyber defense cloud data center robot vision language '
+         'safety audit export ban fund launch test partner contract satellite hospital bank university network '
+         'sensor nuclear grid policy treaty court election camera border port').split()
+TERMS = ['military', 'drone', 'hack', 'nuclear', 'surveillance']
+
+
+def make_articles(count, seed=7, now=1_700_000_000.0):
+    """row_to_article biçiminde makale dict'leri; her çağrı yeni metin nesneleri üretir."""
+    rng = random.Random(seed)
+    for i in range(count):
+        risky = rng.random() < 0.2
+        date_text = rng.choice(DATES)
+        yield {
+            'id': i + 1,
+            'title': ' '.join(rng.choices(WORDS, k=rng.randint(7, 12))).capitalize(),
+            'desc': ' '.join(rng.choices(WORDS, k=rng.randint(20, 35))).capitalize() + '.',
+            'date': date_text,
+            'link': f"https://news.example.com/{rng.randrange(10 ** 9)}/{i}",
+            'media': ''.join(rng.choice(MEDIA)),  # yeni str nesnesi: fetch edilen veride olduğu gibi
+            'risk': risky,
+            'risk_score': rng.random() if risky else rng.random() * 0.3,
+            'risk_terms': rng.sample(TERMS, 2) if risky else [],
+            'published_at': now - rng.randint(60, 7 * 86400),
+            'country': ''.join(rng.choice(DEFAULT_COUNTRIES)),
+            'cluster_id': i + 1,
+            'topics': ['ai'],
+        }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(fn, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    articles, dict_bytes = measure(lambda: list(make_articles(args.count)))
+    batch, batch_bytes = measure(lambda: ArticleBatch.from_articles(make_articles(args.count)))
+    print(f"{args.count} makale")
+    print(f"  dict listesi : {dict_bytes / 2 ** 20:8.1f} MiB ({dict_bytes / args.count:6.0f} B/makale)")
+    print(f"  ArticleBatch : {batch_bytes / 2 ** 20:8.1f} MiB ({batch_bytes / args.count:6.0f} B/makale), "
+          f"nbytes={batch.nbytes / 2 ** 20:.1f} MiB")
+    print(f"  oran         : {dict_bytes / batch_bytes:8.1f}x")
+
+    country = DEFAULT_COUNTRIES[0]
+    since = max(article['published_at'] for article in articles) - 86400
+
+    def dict_filter():
+        return [a for a in articles if a['country'] == country and a['risk']]
+
+    def dict_terms():
+        return [a for a in articles if 'drone' in a['risk_terms'] or 'hack' in a['risk_terms']]
+
+    def dict_recent():
+        return heapq.nlargest(12, articles, key=lambda a: (a['published_at'], a['id']))
+
+    def dict_risk():
+        return heapq.nlargest(12, articles, key=lambda a: (a['risk'], a['risk_score'], a['published_at']))
+
+    def dict_count():
+        return sum(1 for a in articles if a['published_at'] >= since)
+
+    cases = [
+        ('ülke + kritik filtresi', dict_filter, lambda: batch.filter(country=country, risk=True)),
+        ('risk kelimesi filtresi', dict_terms, lambda: batch.filter(terms=('drone', 'hack'))),
+        ('yeniliğe göre ilk 12', dict_recent, lambda: batch.top(12)),
+        ('riske göre ilk 12', dict_risk, lambda: batch.top(12, by='risk')),
+        ('son 24 saat sayımı', dict_count, lambda: int(batch.mask(since=since).sum())),
+    ]
+    # Sonuçlar aynı olmalı
+    assert [a['id'] for a in dict_recent()] == [a['id'] for a in batch.top(12).to_articles()]
+    assert [a['id'] for a in dict_risk()] == [a['id'] for a in batch.top(12, by='risk').to_articles()]
+    assert len(dict_filter()) == len(batch.filter(country=country, risk=True))
+    assert [a['id'] for a in dict_terms()] == [a['id'] for a in batch.filter(terms=('drone', 'hack')).to_articles()]
+
+    print(f"{'işlem':<26} {'dict ms':>9} {'batch ms':>9}")
+    for name, dict_fn, batch_fn in cases:
+        print(f"{name:<26} {timed(dict_fn, 5):9.2f} {timed(batch_fn):9.2f}")
+    print(f"{'to_articles (12)':<26} {'':>9} {timed(lambda: batch.top(12).to_articles()):9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Yakın-kopya kümeleme: ölçek ve doğruluk.
+
+    python benchmarks/bench_clusters.py                  # 20000 makale
+    python benchmarks/bench_clusters.py --count 50000 --batch 20
+
+Sentetik korpus: her "asıl" haber 1-10 yayıncıda ve 1-3 ülkede küçük değişikliklerle (başlık eki, kelime
+değişimi, kısaltılmış açıklama) yeniden yayımlanır. Makaleler gerçek çekimlerdeki gibi ülke başına partiler
+halinde ArticleStore.add_articles ile geçici bir veritabanına eklenir.
+
+Ölçülenler: makale başına ekleme + kümeleme süresi (korpus büyüdükçe sabit kalmalı), tahmini küme saflığı
+(aynı kümeye düşen farklı asıl haber) ve bölünme (aynı asıl haberin birden fazla kümeye düşmesi),
+recent_stories gecikmesi.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore  # noqa: E402
+from record_fixtures import DEFAULT_COUNTRIES, MEDIA  # noqa: E402
+
+VOCABULARY = ('model chip lab startup regulator ministry drone cyber defense cloud data center robot vision '
+              'language safety audit export ban fund launch test partner contract satellite hospital bank '
+              'university network sensor nuclear grid policy treaty court election camera border port').split()
+SUFFIXES = ['', '', ' - Reuters', ' | Analysis', ' (UPDATED)', ': report']
+
+
+def base_story(rng):
+    title = ' '.join(rng.choices(VOCABULARY, k=rng.randint(7, 11))).capitalize()
+    desc = ' '.join(rng.choices(VOCABULARY, k=rng.randint(22, 34))).capitalize() + '.'
+    return title, desc
+
+
+def variant(rng, title, desc):
+    """Aynı haberin başka bir sitedeki hali: ek, tek kelime değişimi, kısaltılmış açıklama."""
+    words = title.split()
+    if rng.random() < 0.5:
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    desc_words = desc.split()
+    cut = rng.randint(int(len(desc_words) * 0.7), len(desc_words))
+    return ' '.join(words) + rng.choice(SUFFIXES), ' '.join(desc_words[:cut])
+
+
+def make_corpus(count, seed=11):
+    """[(ülke, makale, asıl_haber_no)] — yaklaşık count makale."""
+    rng = random.Random(seed)
+    corpus = []
+    story = 0
+    while len(corpus) < count:
+        title, desc = base_story(rng)
+        countries = rng.sample(DEFAULT_COUNTRIES, rng.randint(1, 3))
+        for copy in range(rng.randint(1, 10)):
+            t, d = (title, desc) if copy == 0 else variant(rng, title, desc)
+            corpus.append((rng.choice(countries), {
+                'title': t, 'desc': d, 'media': rng.choice(MEDIA), 'date': f"{rng.randint(1, 47)} hours ago",
+                'link': f"https://news.example.com/{story}/{copy}", 'risk': False, 'risk_score': rng.random(),
+            }, story))
+        story += 1
+    rng.shuffle(corpus)
+    return corpus[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=20, help='add_articles çağrısı başına makale (bir çekim)')
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.count)
+    store = ArticleStore(os.path.join(tempfile.mkdtemp(prefix='nexus-clusters-'), 'nexus.db'))
+
+    batch_ms = []
+    checkpoints = []
+    start = time.perf_counter()
+    for i in range(0, len(corpus), args.batch):
+        part = corpus[i:i + args.batch]
+        by_country = {}
+        for country, article, _ in part:
+            by_country.setdefault(country, []).append(article)
+        t = time.perf_counter()
+        for country, articles in by_country.items():
+            store.add_articles(country, articles)
+        batch_ms.append((time.perf_counter() - t) * 1000 / len(part))
+        if (i // args.batch) % max(1, len(corpus) // args.batch // 5) == 0:
+            checkpoints.append((i + len(part), statistics.median(batch_ms[-50:])))
+    total = time.perf_counter() - start
+
+    conn = store._conn()
+    assigned = dict(conn.execute('SELECT link, cluster_id FROM articles'))
+    stories_per_cluster, clusters_per_story = {}, {}
+    for _, article, story in corpus:
+        cluster = assigned.get(article['link'])
+        stories_per_cluster.setdefault(cluster, set()).add(story)
+        clusters_per_story.setdefault(story, set()).add(cluster)
+    impure = sum(1 for stories in stories_per_cluster.values() if len(stories) > 1)
+    split = sum(1 for clusters in clusters_per_story.values() if len(clusters) > 1)
+
+    recent_ms = []
+    for country in DEFAULT_COUNTRIES:
+        t = time.perf_counter()
+        store.recent_stories(country, 15)
+        recent_ms.append((time.perf_counter() - t) * 1000)
+
+    print(f"{len(corpus)} makale, {len(clusters_per_story)} asıl haber -> {len(stories_per_cluster)} küme "
+          f"({total:.1f} sn, {total / len(corpus) * 1000:.2f} ms/makale)")
+    print("korpus büyüdükçe makale başına ekleme+kümeleme (medyan):")
+    for inserted, ms in checkpoints:
+        print(f"  {inserted:>7} makale: {ms:.2f} ms")
+    print(f"karışık küme (birden fazla asıl haber): {impure} / {len(stories_per_cluster)}")
+    print(f"bölünmüş haber (birden fazla küme): {split} / {len(clusters_per_story)}")
+    print(f"recent_stories(15): medyan {statistics.median(recent_ms):.2f} ms, maks {max(recent_ms):.2f} ms")
+    print(f"story_bands satırı: {conn.execute('SELECT COUNT(*) FROM story_bands').fetchone()[0]}")
+
+
+if __name__ == '__main__':
+    main()
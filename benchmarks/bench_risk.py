@@ -0,0 +1,110 @@
+"""analyze_risk: eski doğrusal tarama ile derlenmiş sınıflandırıcıyı makale başına karşılaştırır.
+
+Kullanım: python benchmarks/bench_risk.py [--count 50000]
+
+İki korpus ölçülür: nötr dolgu kelimelerinden sentetik makaleler (hiçbir kök geçmez; eski tarama erken çıkamaz)
+ve benchmarks/fixtures/news.json başlıkları. Kelime içi tuzaklar (software, award, ...) hız korpusunda değil,
+check_vocabulary'de doğrulanır.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from risk_engine import RISK_KEYWORDS, RiskClassifier  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'news.json')
+
+FILLER = ['artificial', 'intelligence', 'startup', 'model', 'chip', 'research', 'lab', 'funding', 'regulation',
+          'government', 'policy', 'robotics', 'data', 'center', 'cloud', 'university', 'ethics', 'market',
+          'investors', 'language', 'hospital', 'bank', 'launch', 'partner', 'energy']
+RISKY = ['military', 'nuclear', 'weapons', 'war', 'army', 'killed', 'attacks', 'hackers', 'spies', 'surveillance',
+         'dangerous', 'threatens', 'missile', 'soldiers', 'deaths', 'virus', 'bioweapons', 'cyberattack', 'drones',
+         'warfare', 'warring', 'militarized', 'militarization', 'spyware', 'warheads', 'warships', 'weaponization']
+
+# Sınıflandırıcının kesin cevabı: kelime içi tuzaklar riskli sayılmaz, çekimler/türevler kaçırılmaz
+KNOWN_SAFE = ['software', 'harmony', 'warm', 'award', 'skill', 'hackathon', 'warehouse', 'militant']
+KNOWN_RISKY = {'warfare': 'war', 'warring': 'war', 'wars': 'war', 'warheads': 'war', 'warships': 'war',
+               'warplanes': 'war', 'warlords': 'war', 'militarized': 'military', 'militarization': 'military',
+               'militaries': 'military', 'weaponization': 'weapon', 'spyware': 'spyware', 'spies': 'spy'}
+
+
+def check_vocabulary(classifier):
+    for word in KNOWN_SAFE:
+        assert not classifier.classify(f"AI {word} news").risky, word
+    for word, keyword in KNOWN_RISKY.items():
+        assert keyword in classifier.classify(f"AI {word} news").matched, word
+    assert classifier.classify_article("AI warfare is coming", "").risky
+
+
+def legacy_analyze_risk(text):
+    text_lower = text.lower()
+    for word in RISK_KEYWORDS:
+        if word in text_lower:
+            return True
+    return False
+
+
+def make_articles(count, seed=42):
+    """(title, desc, gerçekten_riskli_mi) üçlüleri üretir. Dolgu kelimelerde hiçbir risk kökü geçmez."""
+    assert not any(kw in word for word in FILLER for kw in RISK_KEYWORDS), "dolgu nötr olmalı"
+    rng = random.Random(seed)
+
+    def sentence(lo, hi, risky):
+        words = rng.choices(FILLER, k=rng.randint(lo, hi))
+        if risky:
+            words.insert(rng.randrange(len(words)), rng.choice(RISKY))
+        return ' '.join(words).capitalize()
+
+    articles = []
+    for _ in range(count):
+        risky = rng.random() < 0.25
+        in_title = risky and rng.random() < 0.5
+        articles.append((sentence(8, 16, in_title), sentence(20, 35, risky and not in_title), risky))
+    return articles
+
+
+def fixture_articles(count):
+    """Fixture başlıkları; doğruluk etiketi olarak derlenmiş sınıflandırıcı kullanılır."""
+    with open(FIXTURE, encoding='utf-8') as f:
+        items = [item for pages in json.load(f)['countries'].values() for page in pages for item in page]
+    classifier = RiskClassifier()
+    items = (items * (count // len(items) + 1))[:count]
+    return [(item['title'], item['desc'], classifier.classify_article(item['title'], item['desc']).risky)
+            for item in items]
+
+
+def bench(label, fn, articles, repeat=3):
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        flags = [fn(title, desc) for title, desc, _ in articles]
+        elapsed = min(elapsed, time.perf_counter() - start)
+    truth = [risky for _, _, risky in articles]
+    false_pos = sum(1 for f, t in zip(flags, truth) if f and not t)
+    false_neg = sum(1 for f, t in zip(flags, truth) if t and not f)
+    print(f"{label:<24} {elapsed * 1000:9.1f} ms  {len(articles) / elapsed:10,.0f} article/s  "
+          f"flagged={sum(flags):<6} false+={false_pos:<6} false-={false_neg}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args()
+
+    classifier = RiskClassifier()
+    check_vocabulary(classifier)
+    for name, articles in (('synthetic', make_articles(args.count)), ('fixtures', fixture_articles(args.count))):
+        print(f"{name} ({len(articles)} makale)")
+        # Eski yol makale başına iki çağrıydı: analyze_risk(title) or analyze_risk(desc)
+        bench('legacy substring scan', lambda t, d: legacy_analyze_risk(t) or legacy_analyze_risk(d), articles)
+        bench('classifier is_risky', lambda t, d: classifier.is_risky(t) or classifier.is_risky(d), articles)
+        bench('classifier (terms+score)', lambda t, d: classifier.classify_article(t, d).risky, articles)
+
+
+if __name__ == '__main__':
+    main()
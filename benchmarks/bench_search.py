@@ -0,0 +1,113 @@
+"""Yerel tam metin arama: FTS5 ve LIKE yedeği, önbelleksiz ve önbellekli gecikme.
+
+    python benchmarks/bench_search.py --count 50000
+
+Sentetik korpus Zipf dağılımlı bir kelime dağarcığından üretilir (gerçek haber metnine yakın: birkaç çok
+sık kelime, uzun bir seyrek kuyruk) ve geçici bir veritabanına eklenir. Sorgular aynı dağılımdan seçilir;
+yarısında son kelime yazılmakta olan bir önektir.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore  # noqa: E402
+from record_fixtures import DEFAULT_COUNTRIES, MEDIA  # noqa: E402
+from search import SearchService, parse_query  # noqa: E402
+
+VOCABULARY_SIZE = 20000
+
+
+def make_vocabulary(seed=5):
+    rng = random.Random(seed)
+    words = list(dict.fromkeys(''.join(rng.choices('abcdefghiklmnoprstuvwyz', k=rng.randint(3, 10)))
+                               for _ in range(VOCABULARY_SIZE)))
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def make_corpus(count, vocabulary, seed=11):
+    words, weights = vocabulary
+    rng = random.Random(seed)
+    for i in range(count):
+        yield rng.choice(DEFAULT_COUNTRIES), {
+            'title': ' '.join(rng.choices(words, weights, k=rng.randint(7, 12))).capitalize(),
+            'desc': ' '.join(rng.choices(words, weights, k=rng.randint(20, 35))).capitalize() + '.',
+            'media': rng.choice(MEDIA), 'date': f"{rng.randint(1, 300)} hours ago",
+            'link': f"https://news.example.com/{i}", 'risk': rng.random() < 0.2, 'risk_score': rng.random(),
+        }
+
+
+def make_queries(count, vocabulary, seed=3):
+    # Sorgu kelimeleri dağarcığın ilk %10'undan: kullanıcılar korpusta geçen terimleri arar
+    head = len(vocabulary[0]) // 10
+    candidates, weights = vocabulary[0][:head], vocabulary[1][:head]
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        words = rng.choices(candidates, weights, k=rng.randint(1, 3))
+        if rng.random() < 0.5:
+            words[-1] = words[-1][:rng.randint(2, max(2, len(words[-1]) - 1))]  # yazılmakta olan kelime
+        queries.append(' '.join(words))
+    return queries
+
+
+def timed(fn, queries, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+
+    vocabulary = make_vocabulary()
+    store = ArticleStore(os.path.join(tempfile.mkdtemp(prefix='nexus-search-'), 'nexus.db'))
+    start = time.perf_counter()
+    batch = {}
+    for country, article in make_corpus(args.count, vocabulary):
+        batch.setdefault(country, []).append(article)
+        if len(batch[country]) >= 20:
+            store.add_articles(country, batch.pop(country))
+    for country, articles in batch.items():
+        store.add_articles(country, articles)
+    print(f"{store.count()} makale yüklendi ({time.perf_counter() - start:.1f} sn), FTS5={store.fts_enabled}")
+
+    queries = make_queries(args.queries, vocabulary)
+    service = SearchService(store)
+
+    def uncached(query):
+        service.clear()
+        return service.search(query)
+
+    rows = []
+    for fts in ([True, False] if store.fts_enabled else [False]):
+        store.fts_enabled = fts
+        label = 'fts5' if fts else 'like'
+        rows.append((f'{label} store.search (20)', timed(lambda q: store.search(parse_query(q), limit=60), queries)))
+        rows.append((f'{label} store.search_facets', timed(lambda q: store.search_facets(parse_query(q)), queries)))
+        rows.append((f'{label} service uncached', timed(uncached, queries)))
+        service.clear()
+        timed(service.search, queries)
+        rows.append((f'{label} service cached', timed(service.search, queries, repeat=3)))
+
+    print(f"{'case':<30} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, (p50, p99) in rows:
+        print(f"{name:<30} {p50:9.3f} {p99:9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""Soğuk başlangıç ve ilk boyama ölçümü.
+
+    python benchmarks/bench_startup.py                    # bu ağaç
+    python benchmarks/bench_startup.py --save --compare latest
+    python benchmarks/bench_startup.py --root ../nexus-eski    # başka bir checkout ile önce/sonra karşılaştırması
+
+Ölçülenler:
+- `import app` süresi (ayrı süreçte, --runs kez; medyan) ve -X importtime ile en pahalı modüller
+- import sonrası yüklenmiş ağır modüller (pandas, numpy, plotly.graph_objects, GoogleNews, deep_translator)
+- ilk sayfa: `/` ve `/_dash-layout` yanıt süresi (ilk ve tekrar istek) ve boyutu (ham / gzip)
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.graph_objects', 'GoogleNews', 'deep_translator']
+
+FIRST_PAINT_SCRIPT = r'''
+import gzip, json, sys, time
+start = time.perf_counter()
+import {target} as target
+import_s = time.perf_counter() - start
+client = target.server.test_client()
+out = {{'import_s': import_s, 'heavy_loaded': sorted(m for m in {heavy!r} if m in sys.modules)}}
+for label, path in (('index', '/'), ('layout', '/_dash-layout')):
+    timings = []
+    for _ in range(2):
+        t = time.perf_counter()
+        resp = client.get(path, headers={{'Accept-Encoding': 'gzip'}})
+        body = resp.get_data()
+        timings.append(time.perf_counter() - t)
+    raw = gzip.decompress(body) if resp.headers.get('Content-Encoding') == 'gzip' else body
+    out[label] = {{'status': resp.status_code, 'first_ms': timings[0] * 1000, 'repeat_ms': timings[1] * 1000,
+                  'wire_kb': len(body) / 1024, 'raw_kb': len(raw) / 1024,
+                  'gzip_kb': len(gzip.compress(raw, 6)) / 1024}}
+print(json.dumps(out))
+'''
+
+
+def isolated_env():
+    workdir = tempfile.mkdtemp(prefix='nexus-startup-')
+    return dict(os.environ, NEXUS_DB_PATH=os.path.join(workdir, 'nexus.db'),
+                NEXUS_CACHE_DIR=os.path.join(workdir, 'cache'), NEXUS_PREFETCH='0', NEXUS_ALERTS='0',
+                PYTHONDONTWRITEBYTECODE='1')
+
+
+def run_python(root, code, extra_args=()):
+    return subprocess.run([sys.executable, *extra_args, '-c', code], cwd=root, env=isolated_env(),
+                          capture_output=True, text=True, timeout=300)
+
+
+def import_times(root, target, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = run_python(root, f'import {target}')
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import hatası')
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def top_imports(root, target, limit):
+    """-X importtime çıktısından kümülatif süreye göre en pahalı modüller (hedef ve doğrudan importları)."""
+    proc = run_python(root, f'import {target}', extra_args=('-X', 'importtime'))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        try:
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # başlık satırı
+        # İç içe importlar iki boşlukla girintili gelir; hedef ve doğrudan importları alınır
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if depth <= 1:
+            rows.append((cumulative, name.strip()))
+    rows.sort(reverse=True)
+    return [{'module': name, 'cumulative_ms': us / 1000} for us, name in rows[:limit]]
+
+
+def first_paint(root, target):
+    proc = run_python(root, FIRST_PAINT_SCRIPT.format(target=target, heavy=HEAVY_MODULES))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'ilk boyama hatası')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def load_baseline(spec):
+    if spec == 'latest':
+        runs = sorted(glob.glob(os.path.join(RESULTS_DIR, 'startup-*.json')))
+        if not runs:
+            return None
+        spec = runs[-1]
+    with open(spec, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def delta(new, old):
+    if old in (None, 0):
+        return ''
+    return f"  ({(new / old - 1) * 100:+.1f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--root', default=os.path.dirname(BENCH_DIR), help='Ölçülecek checkout')
+    parser.add_argument('--target', default='app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--compare', help="Önceki sonuç dosyası ya da 'latest'")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    try:
+        times = import_times(args.root, args.target, args.runs)
+    except RuntimeError as e:
+        print(f"import {args.target} başarısız: {e}")
+        sys.exit(2)
+
+    result = {'target': args.target, 'root': os.path.abspath(args.root),
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'import_median_ms': statistics.median(times) * 1000, 'import_min_ms': min(times) * 1000,
+              'top_imports': top_imports(args.root, args.target, args.top)}
+    try:
+        result['first_paint'] = first_paint(args.root, args.target)
+    except RuntimeError as e:
+        result['first_paint'] = {'error': str(e)}
+
+    old = baseline or {}
+    print(f"cold import {args.target}: median {result['import_median_ms']:.0f} ms, min {result['import_min_ms']:.0f} ms"
+          f"{delta(result['import_median_ms'], old.get('import_median_ms'))}")
+    print("en pahalı importlar (kümülatif):")
+    for row in result['top_imports']:
+        print(f"  {row['module']:<28} {row['cumulative_ms']:8.1f} ms")
+    paint = result['first_paint']
+    if 'error' in paint:
+        print(f"ilk boyama ölçülemedi: {paint['error']}")
+    else:
+        print(f"import sonrası yüklü ağır modüller: {', '.join(paint['heavy_loaded']) or '-'}")
+        for label in ('index', 'layout'):
+            r = paint[label]
+            old_r = (old.get('first_paint') or {}).get(label) or {}
+            print(f"  {label:<7} status={r['status']} first={r['first_ms']:.1f} ms{delta(r['first_ms'], old_r.get('first_ms'))} "
+                  f"repeat={r['repeat_ms']:.1f} ms wire={r['wire_kb']:.1f} KB{delta(r['wire_kb'], old_r.get('wire_kb'))} "
+                  f"raw={r['raw_kb']:.1f} KB gzip={r['gzip_kb']:.1f} KB")
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1)
+        print(f"kaydedildi: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""Ağsız performans ölçüm seti: kayıtlı fixture'ları sıcak yollardan geçirir, sonuçları önceki koşularla karşılaştırır.
+
+    python benchmarks/bench_suite.py                       # ölç, yazdır
+    python benchmarks/bench_suite.py --save                # benchmarks/results/<zaman>.json olarak kaydet
+    python benchmarks/bench_suite.py --save --compare latest
+    python benchmarks/bench_suite.py --only news,risk --iterations 200
+
+Her durum için: gecikme yüzdelikleri (p50/p95/p99), tracemalloc ile iterasyon başına tepe bellek ayırma ve
+tutulan bellek, çıktı (payload) boyutu. dash/plotly/numpy kurulu değilse onlara bağlı durumlar atlanır.
+Fixture'lar: benchmarks/fixtures (record_fixtures.py ile üretilir/kaydedilir).
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+sys.path.insert(0, ROOT)
+
+import replay  # noqa: E402
+
+REGRESSION_THRESHOLD = 0.10  # p50 bu orandan fazla kötüleşirse işaretlenir
+REGRESSION_MIN_MS = 0.05  # Mikro saniyelik durumlarda ölçüm gürültüsü gerileme sayılmasın
+ALLOC_ITERATIONS = 20  # tracemalloc yavaşlattığı için ayrı ve kısa bir turda ölçülür
+
+
+class Case:
+    def __init__(self, name, run, setup=None, requires=(), per_item=None):
+        self.name = name
+        self.run = run  # i -> çıktı
+        self.setup = setup
+        self.requires = requires
+        self.per_item = per_item  # iterasyon başına işlenen öğe sayısı (bilgi amaçlı)
+
+
+def missing_modules(names):
+    missing = []
+    for name in names:
+        try:
+            __import__(name)
+        except ImportError:
+            missing.append(name)
+    return missing
+
+
+def payload_size(output):
+    if output is None:
+        return 0
+    if isinstance(output, (bytes, bytearray)):
+        return len(output)
+    if isinstance(output, str):
+        return len(output.encode('utf-8'))
+    try:
+        from plotly.utils import PlotlyJSONEncoder
+    except ImportError:
+        PlotlyJSONEncoder = None
+    return len(json.dumps(output, cls=PlotlyJSONEncoder, default=str).encode('utf-8'))
+
+
+def percentile(sorted_values, pct):
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def measure(case, iterations, warmup=2):
+    if case.setup:
+        case.setup()
+    for i in range(warmup):
+        case.run(i)
+
+    latencies = []
+    output = None
+    for i in range(iterations):
+        start = time.perf_counter()
+        output = case.run(i)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    alloc_peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(min(iterations, ALLOC_ITERATIONS)):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            case.run(i)
+            after, peak = tracemalloc.get_traced_memory()
+            alloc_peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'alloc_peak_kb': sum(alloc_peaks) / len(alloc_peaks) / 1024,
+        'retained_kb': sum(retained) / len(retained) / 1024,
+        'payload_kb': payload_size(output) / 1024,
+        'per_item': case.per_item,
+    }
+
+
+# --- DURUMLAR ---
+def build_cases(fixtures):
+    import news_backend
+    from translation import translation_service
+
+    countries = list(fixtures['news'])
+    articles = [item for pages in fixtures['news'].values() for page in pages for item in page]
+    translated_titles = [text for lang in fixtures['translations'].values() for text in lang.values()]
+    cases = []
+
+    # Risk sınıflandırma: tüm fixture korpusu, eski çağrı biçimiyle (başlık, sonra açıklama)
+    def run_risk(i):
+        return [news_backend.analyze_risk(a['title']) or news_backend.analyze_risk(a['desc']) for a in articles]
+    cases.append(Case('risk.analyze_risk', run_risk, per_item=len(articles)))
+
+    # Haber: soğuk yol (önbellek boş, depo bayat -> replay scrape + sınıflandırma + depoya yazma)
+    original_ttl = news_backend.NEWS_CACHE_TTL
+
+    def run_news_cold(i):
+        news_backend.news_cache.clear()
+        news_backend.NEWS_CACHE_TTL = 0
+        try:
+            return news_backend.get_country_news(countries[i % len(countries)])
+        finally:
+            news_backend.NEWS_CACHE_TTL = original_ttl
+    cases.append(Case('news.get_country_news.cold', run_news_cold))
+
+    def setup_news_warm():
+        for country in countries:
+            news_backend.get_country_news(country)
+
+    def run_news_warm(i):
+        return news_backend.get_country_news(countries[i % len(countries)])
+    cases.append(Case('news.get_country_news.warm', run_news_warm, setup=setup_news_warm))
+
+    # Metin normalizasyonu (app.clean_text_for_bond bunu çağırır)
+    from text_utils import normalize_text
+
+    def run_clean(i):
+        return [normalize_text(text.upper()) for text in translated_titles]
+    cases.append(Case('text.clean_text_for_bond', run_clean, per_item=len(translated_titles)))
+
+    # Çeviri katmanı: önbellek boş, replay çevirmen
+    lang_texts = list(next(iter(fixtures['translations'].values()), {}))[:60]
+
+    def run_translate(i):
+        translation_service.cache.clear()
+        return translation_service.translate_many(lang_texts, 'tr')
+    cases.append(Case('translation.translate_many.cold', run_translate, per_item=len(lang_texts)))
+
+    # Yerel arama (depo setup_news_warm ile dolar): önbelleksiz FTS sorgusu + facet'ler, ve LRU'dan dönüş
+    from search import search_service
+
+    search_queries = ['drone', 'language mod', 'surveillance cam', 'ai ch', 'nuclear plant auto', 'bank']
+
+    def run_search(cached):
+        def run(i):
+            if not cached:
+                search_service.clear()
+            return search_service.search(search_queries[i % len(search_queries)])
+        return run
+    cases.append(Case('search.query.uncached', run_search(False), setup=setup_news_warm))
+    def setup_search_cached():
+        setup_news_warm()
+        for query in search_queries:
+            search_service.search(query)
+    cases.append(Case('search.query.cached', run_search(True), setup=setup_search_cached))
+
+    # Dash'e bağlı durumlar
+    ui_requires = ('dash', 'plotly', 'numpy', 'pandas')
+    app_module = {}
+
+    def load_app():
+        if 'app' not in app_module:
+            import app
+            app_module['app'] = app
+        return app_module['app']
+
+    def run_globe(i):
+        return load_app().create_globe(countries[i % len(countries)])
+    cases.append(Case('ui.create_globe', run_globe, setup=load_app, requires=ui_requires))
+
+    client = {}
+
+    def setup_click():
+        client['c'] = load_app().server.test_client()
+
+    def run_click(i):
+        from load_test import click_payload
+
+        response = client['c'].post('/_dash-update-component', json=click_payload(countries[i % len(countries)]))
+        if response.status_code != 200:
+            raise RuntimeError(f"callback {response.status_code}: {response.data[:200]!r}")
+        return response.data
+    cases.append(Case('ui.update_situation_room', run_click, setup=setup_click, requires=ui_requires))
+
+    def run_panel(lang, cold):
+        def run(i):
+            app = load_app()
+            if cold:
+                app.panel_memo.clear()
+                translation_service.cache.clear()
+            return app._load_news_panel(lambda progress: None, countries[i % len(countries)], lang)
+        return run
+    cases.append(Case('ui.news_panel.en.cold', run_panel('en', True), setup=setup_news_warm, requires=ui_requires))
+    cases.append(Case('ui.news_panel.tr.cold', run_panel('tr', True), setup=setup_news_warm, requires=ui_requires))
+    cases.append(Case('ui.news_panel.tr.memo', run_panel('tr', False), setup=setup_news_warm,
+                      requires=ui_requires))
+    return cases
+
+
+# --- RAPOR / KARŞILAŞTIRMA ---
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_baseline(spec):
+    if spec == 'latest':
+        runs = sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json')))
+        if not runs:
+            return None, None
+        spec = runs[-1]
+    with open(spec, encoding='utf-8') as f:
+        return spec, json.load(f)
+
+
+def print_report(results, baseline=None):
+    header = (f"{'case':<32} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'alloc KB':>9} {'kept KB':>8} "
+              f"{'out KB':>8}")
+    if baseline:
+        header += f" {'Δp50':>8}"
+    print(header)
+    print('-' * len(header))
+    regressions = []
+    for name, r in results['cases'].items():
+        if 'skipped' in r:
+            print(f"{name:<32} atlandı: {r['skipped']}")
+            continue
+        line = (f"{name:<32} {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {r['alloc_peak_kb']:9.1f} "
+                f"{r['retained_kb']:8.1f} {r['payload_kb']:8.1f}")
+        old = (baseline or {}).get('cases', {}).get(name)
+        if old and 'p50_ms' in old and old['p50_ms'] > 0:
+            delta = r['p50_ms'] / old['p50_ms'] - 1
+            regressed = delta > REGRESSION_THRESHOLD and r['p50_ms'] - old['p50_ms'] > REGRESSION_MIN_MS
+            flag = ' !' if regressed else ''
+            line += f" {delta * 100:+7.1f}%{flag}"
+            if flag:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--only', help='Virgülle ayrılmış durum adı önekleri (ör. news,ui.create_globe)')
+    parser.add_argument('--fixtures', default=replay.FIXTURE_DIR)
+    parser.add_argument('--upstream-delay', type=float, default=0.0, help='Replay sayfa başına gecikme (sn)')
+    parser.add_argument('--save', action='store_true', help='Sonucu benchmarks/results altına kaydet')
+    parser.add_argument('--compare', help="Karşılaştırılacak sonuç dosyası ya da 'latest'")
+    args = parser.parse_args()
+
+    replay.isolate_environment()
+    fixtures = replay.load_fixtures(args.fixtures)
+    baseline_path, baseline = load_baseline(args.compare) if args.compare else (None, None)
+    _, translator = replay.install(fixtures, delay=args.upstream_delay)
+
+    prefixes = [p.strip() for p in args.only.split(',')] if args.only else None
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'iterations': args.iterations,
+        'cases': {},
+    }
+    for case in build_cases(fixtures):
+        if prefixes and not any(case.name.startswith(p) for p in prefixes):
+            continue
+        missing = missing_modules(case.requires)
+        if missing:
+            results['cases'][case.name] = {'skipped': 'eksik modül: ' + ', '.join(missing)}
+            continue
+        results['cases'][case.name] = measure(case, args.iterations)
+
+    print(f"rev={results['revision']} python={results['python']} iterations={args.iterations} "
+          f"translator replayed={translator.replayed} synthesized={translator.synthesized}")
+    if baseline_path:
+        print(f"baseline: {baseline_path} (rev={baseline.get('revision')})")
+    regressions = print_report(results, baseline)
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+        print(f"kaydedildi: {path}")
+    if regressions:
+        print(f"p50 gerilemesi (>%{REGRESSION_THRESHOLD * 100:.0f}): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""clean_text_for_bond: eski zincirleme str.replace ile tek geçişli str.translate tablosunu karşılaştırır.
+
+Kullanım: python benchmarks/bench_text.py [--count 100000]
+pandas kuruluysa Series varyantı da ölçülür.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_utils import BOND_TRANSLATION_MAP, normalize_many, normalize_series, normalize_text  # noqa: E402
+
+SAMPLES = {
+    'en': "Artificial intelligence startup raises funding for new language model",
+    'tr': "Yapay zekâ girişimi yeni dil modeli için yatırım aldı; İstanbul'da büyük ilgi gördü",
+    'de': "Künstliche Intelligenz: Start-up erhält Förderung für neues Sprachmodell in München",
+    'fr': "Intelligence artificielle : une jeune pousse lève des fonds pour un modèle de langage à Paris",
+    'es': "Inteligencia artificial: una startup española recauda fondos para un nuevo modelo de lenguaje",
+    'ru': "Искусственный интеллект: стартап привлёк инвестиции в новую языковую модель",
+}
+
+
+def legacy_clean_text_for_bond(text):
+    if not text: return ""
+    replacements = {
+        'ğ': 'g', 'Ğ': 'G', 'ş': 's', 'Ş': 'S', 'ı': 'i', 'İ': 'I',
+        'ç': 'c', 'Ç': 'C', 'ü': 'u', 'Ü': 'U', 'ö': 'o', 'Ö': 'O'
+    }
+    for tr, en in replacements.items():
+        text = text.replace(tr, en)
+    return text
+
+
+def chained_full_alphabet(text):
+    """Eski yöntemin yeni tabloyla aynı kapsama genişletilmiş hali (harf başına bir replace)."""
+    for code, repl in BOND_TRANSLATION_MAP.items():
+        text = text.replace(chr(code), repl)
+    return text
+
+
+def make_texts(count, seed=42):
+    rng = random.Random(seed)
+    langs = list(SAMPLES)
+    texts = []
+    for _ in range(count):
+        text = SAMPLES[rng.choice(langs)]
+        text = text.upper() if rng.random() < 0.3 else text
+        # Metinler tekil olsun ki normalize_many'nin tekrar önbelleği sonucu şişirmesin
+        texts.append(f"{text} #{len(texts)}")
+    return texts
+
+
+def bench(label, fn, texts):
+    start = time.perf_counter()
+    out = fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  {len(texts) / elapsed:12,.0f} text/s")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    texts = make_texts(args.count)
+    legacy = bench('legacy chained replace', lambda ts: [legacy_clean_text_for_bond(t) for t in ts], texts)
+    bench('chained replace (same cover)', lambda ts: [chained_full_alphabet(t) for t in ts], texts)
+    single = bench('normalize_text (per call)', lambda ts: [normalize_text(t) for t in ts], texts)
+    bulk = bench('normalize_many', normalize_many, texts)
+    assert single == bulk
+
+    try:
+        import pandas as pd
+    except ImportError:
+        print("pandas yok: Series varyantı atlandı")
+    else:
+        series = pd.Series(texts)
+        bench('normalize_series (pandas)', normalize_series, series)
+
+    # Eski yöntemin tamamen ASCII'ye çevirebildiği metinlerde çıktı birebir aynı olmalı
+    mismatches = sum(1 for old, new in zip(legacy, bulk) if old.isascii() and old != new)
+    non_ascii_left = sum(1 for t in bulk if not t.isascii())
+    print(f"mismatches vs legacy: {mismatches}  non-ascii left (new): {non_ascii_left}  "
+          f"non-ascii left (legacy): {sum(1 for t in legacy if not t.isascii())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""Worker sayısına göre verim ölçümü: her worker sayısı için gunicorn başlatır ve sabit eşzamanlılıkla yük basar.
+
+Kullanım:
+    python benchmarks/load_test.py --workers 1,2,4 --concurrency 16 --duration 15 --scenario layout
+    python benchmarks/load_test.py --url http://127.0.0.1:8050 --scenario click   # çalışan sunucuya
+
+Senaryolar:
+    index   GET /               (HTML kabuğu)
+    layout  GET /_dash-layout   (küre figürü dahil tüm layout JSON'u; CPU ağırlıklı)
+    click   POST /_dash-update-component  (ülkeye tıklama: hızlı aşama callback'i, ağa çıkmaz)
+Prefetch ve uyarı taraması ölçüm sırasında kapalıdır (NEXUS_PREFETCH=0, NEXUS_ALERTS=0); Google'a
+istek gitmez.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLICK_COUNTRIES = ['Germany', 'Japan', 'Brazil', 'Turkey', 'India', 'France', 'Canada', 'Kenya']
+
+
+def click_payload(country):
+    outputs = [('map-container', 'style'), ('news-panel', 'style'), ('selected-country-store', 'data'),
+               ('globe-graph', 'figure'), ('globe-graph', 'clickData')]
+    return {
+        'output': '..' + '...'.join(f'{i}.{p}' for i, p in outputs) + '..',
+        'outputs': [{'id': i, 'property': p} for i, p in outputs],
+        'inputs': [{'id': 'globe-graph', 'property': 'clickData', 'value': {'points': [{'text': country}]}},
+                   {'id': 'globe-graph', 'property': 'selectedData', 'value': None},
+                   {'id': 'close-btn', 'property': 'n_clicks', 'value': None}],
+        'state': [{'id': 'selected-country-store', 'property': 'data', 'value': None},
+                  {'id': 'map-mode-store', 'property': 'data', 'value': 'select'}],
+        'changedPropIds': ['globe-graph.clickData'],
+    }
+
+
+def make_request(scenario, rng):
+    """(method, path, body, headers)"""
+    if scenario == 'index':
+        return 'GET', '/', None, {}
+    if scenario == 'layout':
+        return 'GET', '/_dash-layout', None, {}
+    body = json.dumps(click_payload(rng.choice(CLICK_COUNTRIES)))
+    return 'POST', '/_dash-update-component', body, {'Content-Type': 'application/json'}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run_load(base_url, scenario, concurrency, duration):
+    parts = urlsplit(base_url)
+    latencies, errors, sizes = [], [0], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local, local_errors, local_bytes = [], 0, 0
+        while time.perf_counter() < deadline:
+            method, path, body, headers = make_request(scenario, rng)
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                if response.status != 200:
+                    local_errors += 1
+                    continue
+                local.append(time.perf_counter() - start)
+                local_bytes += len(payload)
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+            sizes[0] += local_bytes
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'avg_kb': sizes[0] / max(1, len(latencies)) / 1024,
+    }
+
+
+def wait_until_ready(base_url, timeout=90):
+    parts = urlsplit(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+            conn.request('GET', '/_dash-layout')
+            if conn.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def start_server(workers, threads, port, target):
+    env = dict(os.environ, NEXUS_PREFETCH='0', NEXUS_ALERTS='0', NEXUS_WORKERS=str(workers), NEXUS_THREADS=str(threads))
+    cmd = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+           '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', str(threads), target]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def print_row(label, result):
+    print(f"{label:<12} {result['rps']:9.1f} req/s  p50={result['p50']:7.1f} ms  p95={result['p95']:7.1f} ms  "
+          f"p99={result['p99']:7.1f} ms  n={result['requests']:<6} err={result['errors']:<4} "
+          f"{result['avg_kb']:.1f} KB/resp")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', default='1,2,4', help='Virgülle ayrılmış worker sayıları')
+    parser.add_argument('--threads', type=int, default=4, help='Worker başına thread')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--scenario', choices=['index', 'layout', 'click'], default='layout')
+    parser.add_argument('--port', type=int, default=8061)
+    parser.add_argument('--target', default='wsgi:server')
+    parser.add_argument('--url', help='Verilirse sunucu başlatılmaz, bu adrese yük basılır')
+    args = parser.parse_args()
+
+    print(f"scenario={args.scenario} concurrency={args.concurrency} duration={args.duration}s")
+    if args.url:
+        print_row('external', run_load(args.url, args.scenario, args.concurrency, args.duration))
+        return
+
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(',')]:
+        base_url = f'http://127.0.0.1:{args.port}'
+        proc = start_server(workers, args.threads, args.port, args.target)
+        try:
+            if not wait_until_ready(base_url):
+                print(f"{workers} worker: sunucu açılmadı (gunicorn kurulu mu?)")
+                continue
+            run_load(base_url, args.scenario, args.concurrency, min(3.0, args.duration))  # ısınma
+            result = run_load(base_url, args.scenario, args.concurrency, args.duration)
+            baseline = baseline or result['rps']
+            print_row(f"{workers} worker", result)
+            print(f"{'':<12} speedup x{result['rps'] / baseline:.2f}")
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == '__main__':
+    main()
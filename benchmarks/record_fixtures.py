@@ -0,0 +1,130 @@
+"""benchmarks/fixtures altındaki replay verisini üretir.
+
+    python benchmarks/record_fixtures.py --synthetic           # ağsız, deterministik (varsayılan)
+    python benchmarks/record_fixtures.py --live --langs tr,de   # gerçek GoogleNews + çevirmen yanıtlarını kaydeder
+
+Canlı kayıt, GoogleNews.result() sayfalarını ve çevirmen yanıtlarını olduğu gibi saklar; ölçümler bu dosyalardan
+yeniden oynatılır (benchmarks/replay.py).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import FIXTURE_DIR, NEWS_FIXTURE, TRANSLATION_FIXTURE, news_query, pseudo_translate  # noqa: E402
+
+DEFAULT_COUNTRIES = ['United States', 'China', 'United Kingdom', 'Russia', 'Japan', 'Germany', 'France', 'Israel',
+                     'India', 'Canada', 'South Korea', 'Turkey', 'Brazil', 'Nigeria', 'Kenya', 'Indonesia']
+PAGE_SIZE = 10
+
+SUBJECTS = ['Startup', 'Government', 'Ministry', 'University lab', 'Chipmaker', 'Cloud provider', 'Regulator',
+            'Defense contractor', 'Hospital network', 'Bank', 'Research institute', 'Telecom operator']
+ACTIONS = ['unveils', 'invests in', 'restricts', 'launches', 'tests', 'funds', 'bans', 'partners on', 'audits']
+OBJECTS = ['a new language model', 'AI chips', 'facial recognition', 'autonomous drones', 'a data center',
+           'AI safety rules', 'military AI systems', 'cyber defense tools', 'medical imaging AI',
+           'surveillance cameras', 'nuclear plant automation', 'an AI ethics board']
+MEDIA = ['Reuters', 'Bloomberg', 'The Verge', 'TechCrunch', 'Financial Times', 'Nikkei Asia', 'Le Monde',
+         'Der Spiegel', 'BBC', 'Al Jazeera', 'The Hindu', 'Anadolu Ajansı']
+DATES = ['5 mins ago', '1 hour ago', '3 hours ago', '8 hours ago', '1 day ago', '2 days ago', '4 days ago',
+         '6 days ago']
+
+
+def synthetic_page(country, page, rng):
+    items = []
+    for i in range(PAGE_SIZE):
+        title = f"{rng.choice(SUBJECTS)} in {country} {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}"
+        desc = (f"{rng.choice(SUBJECTS)} officials said the programme {rng.choice(ACTIONS)} "
+                f"{rng.choice(OBJECTS)} amid growing debate over {rng.choice(OBJECTS)} and its impact.")
+        slug = title.lower().replace(' ', '-')
+        items.append({
+            'title': title,
+            'media': rng.choice(MEDIA),
+            'date': rng.choice(DATES),
+            'datetime': None,
+            'desc': desc,
+            'link': f"https://news.example.com/{page}/{i}/{slug}?utm_source=google&ved=abc",
+            'img': '',
+        })
+    # Gerçek sonuçlardaki gibi ara sıra tekrar eden başlık
+    items[-1] = dict(items[0], link=items[0]['link'] + '&ref=dup')
+    return items
+
+
+def synthetic_news(countries, pages, seed=7):
+    rng = random.Random(seed)
+    return {country: [synthetic_page(country, page, rng) for page in range(1, pages + 1)] for country in countries}
+
+
+def panel_texts(news, limit=12):
+    texts = ['CRITICAL', 'NO DATA DETECTED']
+    for country, country_pages in news.items():
+        texts.append(country)
+        for item in [item for page in country_pages for item in page][:limit]:
+            texts += [item['title'], item['desc']]
+    return list(dict.fromkeys(texts))
+
+
+def live_news(countries, pages):
+    from fetch_engine import GoogleNewsTransport
+
+    transport = GoogleNewsTransport()
+
+    async def fetch_all():
+        news = {}
+        for country in countries:
+            news[country] = [await transport.fetch_page(news_query(country), page, '7d', 'en') or []
+                             for page in range(1, pages + 1)]
+            print(f"  {country}: {sum(len(p) for p in news[country])} sonuç")
+        return news
+
+    return asyncio.run(fetch_all())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--synthetic', action='store_true', help='Ağsız deterministik fixture (varsayılan)')
+    mode.add_argument('--live', action='store_true', help='GoogleNews ve çevirmenden gerçek yanıtları kaydet')
+    parser.add_argument('--countries', default=','.join(DEFAULT_COUNTRIES))
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--langs', default='tr,de,ru')
+    parser.add_argument('--translation-countries', type=int, default=4,
+                        help='Çevirisi kaydedilecek ülke sayısı (kalan metinler replay sırasında sentezlenir)')
+    parser.add_argument('--out', default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    countries = [c.strip() for c in args.countries.split(',') if c.strip()]
+    langs = [lang.strip() for lang in args.langs.split(',') if lang.strip()]
+
+    if args.live:
+        from translation import google_translate_batch
+
+        news = live_news(countries, args.pages)
+        translate = google_translate_batch
+    else:
+        news = synthetic_news(countries, args.pages)
+
+        def translate(texts, lang):
+            return [pseudo_translate(text, lang) for text in texts]
+
+    texts = panel_texts({c: news[c] for c in countries[:args.translation_countries]})
+    translations = {}
+    for lang in langs:
+        translated = translate(texts, lang)
+        translations[lang] = {text: out for text, out in zip(texts, translated) if out}
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, NEWS_FIXTURE), 'w', encoding='utf-8') as f:
+        json.dump({'source': 'live' if args.live else 'synthetic', 'countries': news}, f, ensure_ascii=False,
+                  indent=1)
+    with open(os.path.join(args.out, TRANSLATION_FIXTURE), 'w', encoding='utf-8') as f:
+        json.dump(translations, f, ensure_ascii=False, indent=1)
+    print(f"{len(news)} ülke, {sum(len(t) for t in translations.values())} çeviri -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
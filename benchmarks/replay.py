@@ -0,0 +1,103 @@
+"""Kayıtlı fixture'ları ağsız yeniden oynatır: GoogleNews sayfaları ve çevirmen yanıtları.
+
+install() uygulama modüllerinin singleton'larına (fetch_engine, translation_service) replay katmanlarını takar.
+Ortam değişkenleri (DB/önbellek dizini) uygulama modülleri import edilmeden önce isolate_environment() ile ayarlanmalı.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+NEWS_FIXTURE = 'news.json'
+TRANSLATION_FIXTURE = 'translations.json'
+
+
+def news_query(country):
+    # Fixture'lar varsayılan "ai" profilinin sorgusuyla kaydedilir; diğer profillerin sorguları boş döner
+    from topics import BUILTIN_TOPICS, DEFAULT_TOPIC
+    return BUILTIN_TOPICS[DEFAULT_TOPIC].queries[0].format(country=country)
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """{'news': {country: [sayfa1, sayfa2, ...]}, 'translations': {lang: {metin: çeviri}}}"""
+    with open(os.path.join(fixture_dir, NEWS_FIXTURE), encoding='utf-8') as f:
+        news = json.load(f)
+    translations = {}
+    path = os.path.join(fixture_dir, TRANSLATION_FIXTURE)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            translations = json.load(f)
+    return {'news': news['countries'], 'translations': translations}
+
+
+def pseudo_translate(text, target_lang):
+    """Fixture'da olmayan metinler için deterministik sahte çeviri (uzunluğu ve harf dağılımı gerçeğe yakın)."""
+    marks = {'tr': 'ğüşıöç', 'de': 'äöüß', 'fr': 'éèàç', 'es': 'ñáéó', 'ru': 'жщыэюя'}.get(target_lang, '')
+    if not marks:
+        return text
+    seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+    words = text.split()
+    for i in range(0, len(words), 3):
+        words[i] = words[i] + marks[(seed + i) % len(marks)]
+    return ' '.join(words)
+
+
+class ReplayTranslator:
+    """translation_service.translator yerine geçer: (texts, lang) -> liste."""
+
+    def __init__(self, translations):
+        self.translations = translations
+        self.calls = 0
+        self.replayed = 0
+        self.synthesized = 0
+
+    def __call__(self, texts, target_lang):
+        self.calls += 1
+        recorded = self.translations.get(target_lang, {})
+        out = []
+        for text in texts:
+            if text in recorded:
+                self.replayed += 1
+                out.append(recorded[text])
+            else:
+                self.synthesized += 1
+                out.append(pseudo_translate(text, target_lang))
+        return out
+
+
+def build_transport(fixtures, delay=0.0):
+    from fetch_engine import StaticTransport
+
+    pages = {}
+    for country, country_pages in fixtures['news'].items():
+        for number, results in enumerate(country_pages, start=1):
+            pages[(news_query(country), number)] = results
+    return StaticTransport(pages, delay=delay)
+
+
+def isolate_environment():
+    """Ölçümün gerçek DB'ye/önbelleğe dokunmaması ve ağa çıkmaması için geçici dizinler kullanır."""
+    workdir = tempfile.mkdtemp(prefix='nexus-bench-')
+    os.environ['NEXUS_DB_PATH'] = os.path.join(workdir, 'nexus.db')
+    os.environ['NEXUS_CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['NEXUS_PREFETCH'] = '0'
+    os.environ['NEXUS_ALERTS'] = '0'
+    # Süreç içi önbellekler ölçümde açıkça temizlenir; diskteki L2 sonuçları karıştırmasın
+    os.environ['NEXUS_SHARED_CACHE'] = '0'
+    return workdir
+
+
+def install(fixtures, delay=0.0):
+    """Replay transport ve çevirmeni uygulama singleton'larına takar; (transport, translator) döner."""
+    from fetch_engine import fetch_engine
+    from translation import translation_service
+
+    transport = build_transport(fixtures, delay)
+    fetch_engine.transport = transport
+    # Host başına hız sınırı gerçek Google için; replay'de ölçümü yavaşlatmasın
+    fetch_engine.rate_per_host = 1e9
+    fetch_engine.burst_per_host = 1e9
+    translator = ReplayTranslator(fixtures['translations'])
+    translation_service.translator = translator
+    return transport, translator
@@ -0,0 +1,222 @@
+"""asyncio tabanlı haber çekme motoru.
+
+- Sayfalar eşzamanlı çekilir.
+- Aynı (query, period, lang) için uçuştaki istekler birleştirilir; eşzamanlı çağıranlar tek bir future'ı bekler.
+- Global eşzamanlılık sınırı ve host başına hız sınırı uygulanır.
+- Dash callback'leri için senkron sarmalayıcı vardır (motor kendi event loop thread'inde çalışır).
+
+Transport: `host` niteliği ve `async fetch_page(query, page, period, lang) -> list[dict]` metodu olan herhangi bir nesne.
+"""
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import quote
+
+from metrics import metrics
+
+FETCH_MAX_CONCURRENCY = 8
+FETCH_RATE_PER_HOST = 2.0  # saniyede istek
+FETCH_BURST_PER_HOST = 4
+FETCH_PAGES = 2  # Eşzamanlı çekilecek sayfa sayısı (1 = sadece ilk sayfa, az sonuç varsa ikinciye geç)
+FETCH_MIN_RESULTS = 10  # İlk sayfa bundan azsa sonraki sayfalar da kullanılır
+FETCH_TIMEOUT = 30  # sn, senkron sarmalayıcı için
+GOOGLENEWS_KEY_VERSION = '1.6.'  # İç __key düzenine güvendiğimiz sürüm (requirements.txt'de sabit)
+
+
+class GoogleNewsTransport:
+    """GoogleNews kütüphanesi senkron çalışır; her sayfa ayrı istemciyle bir thread'de çekilir."""
+
+    host = 'www.google.com'
+
+    async def fetch_page(self, query, page, period, lang):
+        return await asyncio.to_thread(self._fetch_page_sync, query, page, period, lang)
+
+    @staticmethod
+    def _fetch_page_sync(query, page, period, lang):
+        from GoogleNews import GoogleNews
+
+        client = GoogleNews(lang=lang, period=period)
+        # Varsayılan olarak kütüphane her hatayı (429, engelleme) yazdırıp boş sonuç döner; o zaman devre kesici
+        # kısıtlamayı başarılı boş sayfa sanar. Hatalar yükselsin ki google_news politikası görsün.
+        enable_exception = getattr(client, 'enableException', None)
+        if enable_exception is not None:
+            enable_exception(True)
+        client.clear()
+        if page == 1:
+            client.search(query)
+        elif GoogleNewsTransport._can_set_key(client):
+            # search() her zaman 1. sayfayı da çeker; sadece istenen sayfa için anahtarı search() gibi ayarlıyoruz
+            encode = client._GoogleNews__encode
+            client._GoogleNews__key = quote(query.encode(encode)) if encode else query
+            client.get_page(page)
+        else:
+            # Bilinmeyen sürüm: iç düzene dokunmadan public API (1. sayfa için fazladan bir istek)
+            client.search(query)
+            client.clear()
+            client.get_page(page)
+        return client.result()
+
+    @staticmethod
+    def _can_set_key(client):
+        get_version = getattr(client, 'getVersion', None)
+        version = get_version() if get_version is not None else ''
+        return str(version).startswith(GOOGLENEWS_KEY_VERSION) and hasattr(client, '_GoogleNews__encode')
+
+
+class StaticTransport:
+    """Ağsız transport: {(query, page): sonuçlar} sözlüğünden döner. Testler ve ölçümler için."""
+
+    host = 'static'
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch_page(self, query, page, period, lang):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return list(self.pages.get((query, page), []))
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class NewsFetchEngine:
+    def __init__(self, transport=None, max_concurrency=FETCH_MAX_CONCURRENCY, rate_per_host=FETCH_RATE_PER_HOST,
+                 burst_per_host=FETCH_BURST_PER_HOST, pages=FETCH_PAGES, min_results=FETCH_MIN_RESULTS):
+        self.transport = transport or GoogleNewsTransport()
+        self.max_concurrency = max_concurrency
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.pages = max(1, pages)
+        self.min_results = min_results
+        self.stats = {'fetches': 0, 'coalesced': 0, 'pages': 0, 'page_errors': 0}
+        self._reset()
+
+    def _reset(self):
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._inflight = {}
+        self._semaphore = None
+        self._buckets = {}
+
+    def after_fork(self):
+        # Loop thread'i fork'ta çocuğa geçmez; ilk kullanımda yeniden başlatılır
+        self._reset()
+
+    # --- ASYNC API ---
+    async def fetch(self, query, period='7d', lang='en'):
+        """Sorgunun birleşik sonuç listesini döner. Aynı anahtar için uçuşta istek varsa onu bekler."""
+        key = (query, period, lang)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_pages(query, period, lang))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, k=key: self._inflight.pop(k, None))
+            self.stats['fetches'] += 1
+        else:
+            self.stats['coalesced'] += 1
+        # Bir çağıranın iptali ortak işi iptal etmesin
+        return await asyncio.shield(task)
+
+    async def fetch_many(self, queries, period='7d', lang='en'):
+        """{query: sonuçlar veya Exception} döner."""
+        results = await asyncio.gather(*(self.fetch(q, period, lang) for q in queries), return_exceptions=True)
+        return dict(zip(queries, results))
+
+    async def fetch_requests(self, requests):
+        """Farklı dönem/dildeki istekleri tek seferde çeker: {(query, period, lang): sonuçlar veya Exception}."""
+        requests = list(dict.fromkeys(requests))
+        results = await asyncio.gather(*(self.fetch(*request) for request in requests), return_exceptions=True)
+        return dict(zip(requests, results))
+
+    async def _fetch_pages(self, query, period, lang):
+        if self.pages == 1:
+            results = list(await self._fetch_page(query, 1, period, lang))
+            if len(results) < self.min_results:
+                try:
+                    results += await self._fetch_page(query, 2, period, lang)
+                except Exception:
+                    pass
+            return results
+
+        pages = await asyncio.gather(*(self._fetch_page(query, page, period, lang)
+                                       for page in range(1, self.pages + 1)), return_exceptions=True)
+        if isinstance(pages[0], BaseException):
+            raise pages[0]
+        results = list(pages[0])
+        if len(results) < self.min_results:
+            for extra in pages[1:]:
+                if not isinstance(extra, BaseException):
+                    results += extra
+        return results
+
+    async def _fetch_page(self, query, page, period, lang):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        host = getattr(self.transport, 'host', 'default')
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _TokenBucket(self.rate_per_host, self.burst_per_host)
+
+        async with self._semaphore:
+            with metrics.span('rate_limit_wait'):
+                await bucket.acquire()
+            self.stats['pages'] += 1
+            metrics.inc('nexus_fetch_pages_total', page=str(page))
+            try:
+                with metrics.span(f'scrape_page{page}'):
+                    return await self.transport.fetch_page(query, page, period, lang) or []
+            except Exception:
+                self.stats['page_errors'] += 1
+                metrics.inc('nexus_scrape_failures_total', stage=f'page{page}')
+                raise
+
+    # --- SENKRON SARMALAYICI ---
+    def fetch_sync(self, query, period='7d', lang='en', timeout=FETCH_TIMEOUT):
+        return self.run(self.fetch(query, period, lang), timeout)
+
+    def fetch_many_sync(self, queries, period='7d', lang='en', timeout=FETCH_TIMEOUT):
+        return self.run(self.fetch_many(queries, period, lang), timeout)
+
+    def fetch_requests_sync(self, requests, timeout=FETCH_TIMEOUT):
+        return self.run(self.fetch_requests(requests), timeout)
+
+    def run(self, coro, timeout=FETCH_TIMEOUT):
+        """Coroutine'i motorun loop'unda çalıştırıp sonucu bekler (herhangi bir thread'den çağrılabilir)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    def _ensure_loop(self):
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name='nexus-fetch-loop', daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+
+fetch_engine = NewsFetchEngine()
+os.register_at_fork(after_in_child=fetch_engine.after_fork)
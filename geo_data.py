@@ -0,0 +1,80 @@
+"""Yerel dünya ülke verisi ve ön-hesaplanmış ülke indeksi.
+
+Veri data/world_countries.csv içinde gelir; süreç başına bir kez, ilk kullanımda yüklenir ve
+tüm modüller aynı nesneleri paylaşır. Ağa hiç çıkılmaz.
+"""
+import csv
+import os
+import threading
+
+GEO_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'world_countries.csv')
+
+
+class GeoIndex:
+    """Ülke adı/ISO kodu -> satır indeksi ve merkez koordinat eşlemeleri (O(1) arama)."""
+
+    def __init__(self, codes, names, lats, lons):
+        self.codes = tuple(codes)
+        self.names = tuple(names)
+        self.lats = tuple(lats)
+        self.lons = tuple(lons)
+        self.row_by_name = {name: i for i, name in enumerate(self.names)}
+        self.row_by_code = {code: i for i, code in enumerate(self.codes)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, country_name):
+        return country_name in self.row_by_name
+
+    def row(self, country_name):
+        return self.row_by_name.get(country_name)
+
+    def code(self, country_name):
+        row = self.row_by_name.get(country_name)
+        return None if row is None else self.codes[row]
+
+    def coordinates(self, country_name):
+        row = self.row_by_name.get(country_name)
+        if row is None:
+            return None, None
+        return self.lats[row], self.lons[row]
+
+
+_lock = threading.Lock()
+_index = None
+_frame = None
+
+
+def get_geo_index(path=GEO_DATA_PATH):
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                codes, names, lats, lons = [], [], [], []
+                with open(path, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        codes.append(row['CODE'])
+                        names.append(row['COUNTRY'])
+                        lats.append(float(row['LAT']))
+                        lons.append(float(row['LON']))
+                _index = GeoIndex(codes, names, lats, lons)
+    return _index
+
+
+def get_geo_frame():
+    """CODE / COUNTRY / LAT / LON kolonlu DataFrame. Satır sırası GeoIndex ile aynıdır; paylaşılır, değiştirmeyin."""
+    global _frame
+    if _frame is None:
+        index = get_geo_index()
+        import pandas as pd
+
+        with _lock:
+            if _frame is None:
+                _frame = pd.DataFrame({'CODE': index.codes, 'COUNTRY': index.names,
+                                       'LAT': index.lats, 'LON': index.lons})
+    return _frame
+
+
+def get_country_coordinates(country_name):
+    return get_geo_index().coordinates(country_name)
@@ -0,0 +1,42 @@
+"""gunicorn ayarları. Her değer ortam değişkeniyle ezilebilir.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('NEXUS_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('NEXUS_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# İstekler çoğunlukla ağ/disk bekler: worker başına birkaç thread
+worker_class = 'gthread'
+threads = int(os.environ.get('NEXUS_THREADS', 4))
+timeout = int(os.environ.get('NEXUS_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+# Bellek sızıntısına karşı worker'lar ara sıra yenilenir (hepsi aynı anda değil)
+max_requests = int(os.environ.get('NEXUS_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+# Uygulama her worker'da ayrı yüklenir: SQLite/diskcache bağlantıları ve thread'ler fork'tan önce açılmasın
+preload_app = False
+accesslog = os.environ.get('NEXUS_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def _prefetcher(worker):
+    extensions = getattr(getattr(worker, 'wsgi', None), 'extensions', None) or {}
+    return extensions.get('nexus_prefetch')
+
+
+def post_worker_init(worker):
+    # İlk isteği beklemeden önbelleği ısıt; turu sadece kirayı tutan worker çalıştırır
+    from prefetch import PREFETCH_ENABLED
+
+    prefetcher = _prefetcher(worker)
+    if PREFETCH_ENABLED and prefetcher is not None and not prefetcher.started:
+        prefetcher.start()
+
+
+def worker_exit(server, worker):
+    prefetcher = _prefetcher(worker)
+    if prefetcher is not None:
+        prefetcher.stop()
@@ -0,0 +1,70 @@
+"""Statik Dash layout'unu bir kez serileştirip sıkıştırılmış halde sunar.
+
+Dash her sayfa açılışında /_dash-layout için tüm bileşen ağacını (küre figürü dahil) yeniden JSON'a çevirir.
+Layout statik olduğundan JSON ilk istekte bir kez üretilir, gzip'lenir ve ETag ile sunulur; tarayıcı
+tekrar gelişlerde 304 alır. Layout fonksiyon ise (istek başına değişebilir) araya girilmez.
+"""
+import gzip
+import hashlib
+import threading
+
+LAYOUT_GZIP_LEVEL = 6
+LAYOUT_MIN_GZIP_BYTES = 1024
+
+
+class LayoutCache:
+    def __init__(self, app, gzip_level=LAYOUT_GZIP_LEVEL):
+        self.app = app
+        self.gzip_level = gzip_level
+        self._payload = None  # (raw, gzipped, etag)
+        self._lock = threading.Lock()
+
+    def payload(self):
+        if self._payload is None:
+            with self._lock:
+                if self._payload is None:
+                    from plotly.io.json import to_json_plotly
+
+                    raw = to_json_plotly(self.app.layout).encode('utf-8')
+                    gzipped = gzip.compress(raw, self.gzip_level) if len(raw) >= LAYOUT_MIN_GZIP_BYTES else None
+                    etag = hashlib.sha1(raw).hexdigest()[:16]
+                    self._payload = (raw, gzipped, etag)
+        return self._payload
+
+    def invalidate(self):
+        with self._lock:
+            self._payload = None
+
+    def response(self, request):
+        from flask import Response
+
+        raw, gzipped, etag = self.payload()
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        elif gzipped is not None and 'gzip' in request.accept_encodings:
+            response = Response(gzipped, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(raw, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        # Her açılışta doğrulansın (deploy sonrası yeni layout gelsin), ama gövde tekrar inmesin
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+def init_layout_cache(app):
+    """/_dash-layout isteklerini önbellekteki sıkıştırılmış JSON'dan karşılar (sadece statik layout için)."""
+    from flask import request
+
+    cache = LayoutCache(app)
+    layout_path = app.config.routes_pathname_prefix + '_dash-layout'
+    app.server.extensions['nexus_layout_cache'] = cache
+
+    @app.server.before_request
+    def _serve_cached_layout():
+        if request.path != layout_path or request.method != 'GET' or callable(app.layout):
+            return None
+        return cache.response(request)
+
+    return cache
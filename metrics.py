@@ -0,0 +1,252 @@
+"""Sıcak yol ölçümleri: sayaçlar, aşama süreleri (histogram) ve Prometheus metin formatında /metrics.
+
+Her süreç ölçümleri önce kendi içinde biriktirir, birkaç saniyede bir ortak önbellekteki toplamlara ekler.
+Böylece gunicorn worker'ları ve Dash arka plan işleri (ayrı süreçler) aynı toplamları görür; /metrics hangi
+worker'a düşerse düşsün aynı değerleri döner. Ortak önbellek yoksa süreç içi toplamlar gösterilir.
+
+İsteğe bağlı cProfile: NEXUS_PROFILE=all her isteği, NEXUS_PROFILE=header sadece `X-Nexus-Profile: 1`
+başlıklı istekleri profiller; .prof dosyaları NEXUS_PROFILE_DIR'e yazılır (snakeviz / pstats ile açılır).
+"""
+import atexit
+import cProfile
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from shared_cache import CACHE_DIR, shared_cache
+
+METRICS_FLUSH_INTERVAL = 5.0  # sn
+METRICS_SHARED_KEY = 'metrics:totals'
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROFILE_MODE = os.environ.get('NEXUS_PROFILE', '')  # '', 'all', 'header'
+PROFILE_HEADER = 'X-Nexus-Profile'
+PROFILE_DIR = os.environ.get('NEXUS_PROFILE_DIR', os.path.join(CACHE_DIR, 'profiles'))
+
+METRIC_HELP = {
+    'nexus_stage_seconds': ('histogram', 'Time spent per hot-path stage.'),
+    'nexus_news_cache_requests_total': ('counter', 'News cache lookups by result (hit, stale, negative, miss).'),
+    'nexus_shared_cache_hits_total': ('counter', 'L1 misses served from the cross-process cache.'),
+    'nexus_panel_memo_requests_total': ('counter', 'Rendered panel memo lookups by result.'),
+    'nexus_scrape_failures_total': ('counter', 'Failed news scrapes by stage.'),
+    'nexus_fetch_pages_total': ('counter', 'News pages requested from upstream, by page number.'),
+    'nexus_translation_calls_total': ('counter', 'Round trips to the translation backend.'),
+    'nexus_translation_texts_total': ('counter', 'Texts passed to the translation layer, by result.'),
+    'nexus_http_requests_total': ('counter', 'HTTP requests by status code.'),
+    'nexus_search_requests_total': ('counter', 'Local full-text searches by result (hit, miss).'),
+    'nexus_upstream_calls_total': ('counter', 'Calls to external services by result (ok, error, rejected).'),
+    'nexus_upstream_retries_total': ('counter', 'Retries to external services allowed by the retry budget.'),
+    'nexus_circuit_transitions_total': ('counter', 'Circuit breaker state changes by upstream and new state.'),
+    'nexus_alerts_total': ('counter', 'New critical-story alerts created by the alert pipeline.'),
+    'nexus_alert_deliveries_total': ('counter', 'Alert batches handed to a sink, by sink and result.'),
+}
+
+
+def _empty_totals():
+    return {'counters': {}, 'histograms': {}}
+
+
+def _merge(totals, delta):
+    totals = totals or _empty_totals()
+    counters = totals['counters']
+    for key, value in delta['counters'].items():
+        counters[key] = counters.get(key, 0) + value
+    histograms = totals['histograms']
+    for key, values in delta['histograms'].items():
+        current = histograms.get(key)
+        histograms[key] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+    return totals
+
+
+class MetricsRegistry:
+    """Süreç içi ölçüm biriktirici. Histogram değeri: [kova sayıları..., +Inf, toplam süre]."""
+
+    def __init__(self, shared=None, flush_interval=METRICS_FLUSH_INTERVAL, buckets=STAGE_BUCKETS):
+        self.shared = shared
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self._pending = _empty_totals()
+        self._local_totals = _empty_totals()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    # --- KAYIT ---
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counters = self._pending['counters']
+            counters[key] = counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            values = self._pending['histograms'].get(key)
+            if values is None:
+                values = self._pending['histograms'][key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    values[i] += 1
+                    break
+            else:
+                values[len(self.buckets)] += 1
+            values[-1] += seconds
+        self._maybe_flush()
+
+    @contextmanager
+    def span(self, stage):
+        """`with metrics.span('translate'):` bloğun süresini nexus_stage_seconds{stage=...} içine yazar."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('nexus_stage_seconds', time.perf_counter() - start, stage=stage)
+
+    def timed(self, stage):
+        """Fonksiyonun her çağrısını span olarak ölçen dekoratör."""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- TOPLAMA ---
+    def flush(self):
+        """Biriken ölçümleri ortak toplamlara (yoksa süreç içi toplamlara) ekler."""
+        with self._lock:
+            pending, self._pending = self._pending, _empty_totals()
+            self._last_flush = time.monotonic()
+        if not pending['counters'] and not pending['histograms']:
+            return
+        if self.shared is not None and self.shared.enabled:
+            if self.shared.update(METRICS_SHARED_KEY, lambda totals: _merge(totals, pending)):
+                return
+            if self.shared.enabled:
+                # Yazılamadı: bir sonraki flush'ta tekrar denensin
+                with self._lock:
+                    self._pending = _merge(self._pending, pending)
+                return
+        with self._lock:
+            _merge(self._local_totals, pending)
+
+    def totals(self):
+        self.flush()
+        if self.shared is not None and self.shared.enabled:
+            return self.shared.get(METRICS_SHARED_KEY) or _empty_totals()
+        with self._lock:
+            return _merge(_empty_totals(), self._local_totals)
+
+    def render(self):
+        """Prometheus metin formatı (0.0.4)."""
+        totals = self.totals()
+        families = {}
+        for (name, labels), value in totals['counters'].items():
+            families.setdefault(name, []).append((labels, value))
+        for (name, labels), values in totals['histograms'].items():
+            families.setdefault(name, []).append((labels, values))
+
+        lines = []
+        for name in sorted(families):
+            kind, help_text = METRIC_HELP.get(name, ('counter', ''))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(families[name], key=lambda item: item[0]):
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    def after_fork(self):
+        # Ebeveynin biriktirdikleri ebeveynde flush edilir; çocukta tekrar sayılmasın
+        self._lock = threading.Lock()
+        self._pending = _empty_totals()
+        self._local_totals = _empty_totals()
+        self._last_flush = time.monotonic()
+
+    def _maybe_flush(self):
+        if self.shared is not None and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+
+
+_LABEL_ESCAPE = str.maketrans({'\\': r'\\', '"': r'\"', '\n': r'\n'})
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{str(v).translate(_LABEL_ESCAPE)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry(shared=shared_cache)
+os.register_at_fork(after_in_child=metrics.after_fork)
+atexit.register(metrics.flush)
+
+
+# --- FLASK ENTEGRASYONU ---
+_UNSAFE_PATH = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def init_metrics(server, registry=None, profile_mode=PROFILE_MODE, profile_dir=PROFILE_DIR):
+    """/metrics route'unu ve (istenirse) istek başına cProfile kancalarını Flask `server`ına ekler."""
+    from flask import Response, g, request
+
+    registry = registry or metrics
+    server.extensions['nexus_metrics'] = registry
+
+    @server.route('/metrics')
+    def _metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    @server.after_request
+    def _count_request(response):
+        if request.path != '/metrics':
+            registry.inc('nexus_http_requests_total', status=str(response.status_code))
+        return response
+
+    if profile_mode not in ('all', 'header'):
+        return registry
+
+    @server.before_request
+    def _start_profile():
+        if profile_mode == 'header' and request.headers.get(PROFILE_HEADER) != '1':
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Başka bir profiler zaten etkin (eşzamanlı profillenen istek)
+            return
+        g.nexus_profiler = profiler
+
+    @server.teardown_request
+    def _dump_profile(exc):
+        profiler = g.pop('nexus_profiler', None)
+        if profiler is None:
+            return
+        profiler.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        name = _UNSAFE_PATH.sub('_', request.path.strip('/')) or 'index'
+        path = os.path.join(profile_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}.prof")
+        try:
+            profiler.dump_stats(path)
+        except OSError as e:
+            print(f"Profil yazma hatası: {e}")
+
+    return registry
@@ -1,97 +1,403 @@
-from GoogleNews import GoogleNews
-import pandas as pd
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Yapay Zeka Süper Güçleri
-TIER_1_COUNTRIES = ['United States', 'China', 'United Kingdom', 'Russia', 'Japan', 'Germany', 'France', 'Israel',
-                    'India', 'Canada', 'South Korea']
+import geo_data
+from article_store import article_store
+from fetch_engine import fetch_engine
+from metrics import metrics
+from resilience import CircuitOpenError, google_news
+from risk_engine import risk_classifier
+from shared_cache import shared_cache
+from topics import fetch_limit, topic_requests
 
-RISK_KEYWORDS = ['military', 'nuclear', 'weapon', 'war', 'army', 'kill', 'attack', 'hack', 'spy', 'surveillance',
-                 'danger', 'threat', 'missile', 'soldier', 'death', 'virus', 'bioweapon', 'cyber', 'drone']
+# Yapay Zeka Süper Güçleri. Adlar data/world_countries.csv'deki (küreye tıklanınca gelen) adlarla aynı olmalı,
+# yoksa önceden ısıtılan önbellek anahtarına hiç tıklanmaz.
+TIER_1_COUNTRIES = ['United States', 'China', 'United Kingdom', 'Russia', 'Japan', 'Germany', 'France', 'Israel',
+                    'India', 'Canada', 'Korea, South']
 
 
 def analyze_risk(text):
-    text_lower = text.lower()
-    for word in RISK_KEYWORDS:
-        if word in text_lower:
-            return True
-    return False
+    return risk_classifier.is_risky(text)
+
+
+def assess_risk(text):
+    """Eşleşen kelimeleri ve ağırlıklı skoru içeren RiskAssessment döner."""
+    return risk_classifier.classify(text)
+
+
+# --- HABER ÖNBELLEĞİ ---
+NEWS_CACHE_TTL = 300  # Bu süre içinde kayıt taze sayılır (sn)
+NEWS_CACHE_STALE_TTL = 3600  # Bayat kayıt bu süreye kadar anında döner, arkada yenilenir (sn)
+NEWS_CACHE_MAX_ENTRIES = 64
+NEWS_NEGATIVE_TTL = 60  # "Sonuç yok" bu süre boyunca hatırlanır; aynı ülkeye art arda tıklama Google'a gitmez (sn)
+
+
+class NewsCache:
+    """Ülke bazlı TTL + LRU önbellek. Bayat kayıtları hemen döner, yenilemeyi arka planda yapar.
+
+    shared verilirse (SharedCache) süreç içi kayıt yokken oraya da bakılır ve her yazım oraya da gider;
+    böylece bir worker'ın ya da arka plan işinin çektiği haber diğer süreçlerde de görünür.
+    fetch_fn None dönerse (sonuç yok / servis kapalı ve depoda veri yok) bu negative_ttl boyunca hatırlanır.
+    background_refresh=False ise (Dash arka plan işi: süreç iş bitince os._exit ile kapanır, thread'ler de ölür)
+    bayat kayıt için thread açılmaz; yenilemeyi çağıran refresh() ile kendisi yapar (bkz. refresh_stale_news).
+    """
+
+    def __init__(self, max_entries=NEWS_CACHE_MAX_ENTRIES, ttl=NEWS_CACHE_TTL, stale_ttl=NEWS_CACHE_STALE_TTL,
+                 shared=None, negative_ttl=NEWS_NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # key -> (data, fetched_at)
+        self._negative = {}  # key -> geçerlilik sonu (monotonic)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.background_refresh = True
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'negative_hits': 0, 'shared_hits': 0,
+                       'refreshes': 0, 'refresh_errors': 0, 'evictions': 0}
+
+    def get(self, key, fetch_fn):
+        """Önbellekten döner; yoksa fetch_fn ile çeker. fetch_fn None dönerse kısa süreli negatif kayıt tutulur."""
+        if self.shared is not None and not self.contains(key) and not self._is_negative(key):
+            self._load_shared(key)
+        now = time.monotonic()
+        start_refresh = False
+        negative = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    fresh = True
+                elif age < self.stale_ttl:
+                    fresh = False
+                    self._entries.move_to_end(key)
+                    self._stats['stale_hits'] += 1
+                    if self.background_refresh and key not in self._refreshing:
+                        self._refreshing.add(key)
+                        start_refresh = True
+                else:
+                    # Çok eski: bayat bile sayılmaz
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                negative = self._negative.get(key, 0) > now
+                self._stats['negative_hits' if negative else 'misses'] += 1
+
+        if negative:
+            metrics.inc('nexus_news_cache_requests_total', result='negative')
+            return None
+        if entry is not None:
+            metrics.inc('nexus_news_cache_requests_total', result='hit' if fresh else 'stale')
+            if start_refresh:
+                threading.Thread(target=self._refresh, args=(key, fetch_fn), daemon=True).start()
+            return data
+
+        metrics.inc('nexus_news_cache_requests_total', result='miss')
+        data = fetch_fn()
+        if data is not None:
+            self.put(key, data)
+        else:
+            self.put_negative(key)
+        return data
+
+    def is_stale(self, key):
+        """Kayıt var ama TTL'i geçmiş mi (sayaçlara dokunmaz)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and self.ttl <= time.monotonic() - entry[1] < self.stale_ttl
+
+    def refresh(self, key, fetch_fn):
+        """Kaydı bu thread'de yeniler; yeni veriyi döner. Aynı anahtar zaten yenileniyorsa None döner."""
+        with self._lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+        return self._refresh(key, fetch_fn)
+
+    def contains(self, key):
+        """Sayaçlara dokunmadan kaydın (taze ya da bayat) olup olmadığını söyler."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[1] < self.stale_ttl
+
+    def put(self, key, data):
+        with self._lock:
+            self._negative.pop(key, None)
+        self._put_local(key, data, time.monotonic())
+        if self.shared is not None:
+            # Süreçler arası monotonic saat karşılaştırılamaz; L2'de duvar saati tutulur
+            self.shared.set(self._shared_key(key), (data, time.time()), expire=self.stale_ttl)
+
+    def put_negative(self, key):
+        self._put_negative_local(key, time.monotonic() + self.negative_ttl)
+        if self.shared is not None:
+            self.shared.set(self._negative_key(key), time.time() + self.negative_ttl, expire=self.negative_ttl)
+
+    def _put_negative_local(self, key, until):
+        with self._lock:
+            self._negative[key] = until
+            # Süresi dolanlar birikmesin
+            if len(self._negative) > self.max_entries:
+                now = time.monotonic()
+                self._negative = {k: v for k, v in self._negative.items() if v > now}
+
+    def _is_negative(self, key):
+        with self._lock:
+            return self._negative.get(key, 0) > time.monotonic()
+
+    def _put_local(self, key, data, fetched_at):
+        with self._lock:
+            self._entries[key] = (data, fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _load_shared(self, key):
+        stored = self.shared.get(self._shared_key(key))
+        if stored is None:
+            negative_until = self.shared.get(self._negative_key(key))
+            remaining = negative_until - time.time() if negative_until is not None else 0
+            if remaining > 0:
+                self._put_negative_local(key, time.monotonic() + remaining)
+            return
+        data, fetched_wall = stored
+        age = max(0.0, time.time() - fetched_wall)
+        if age < self.stale_ttl:
+            self._put_local(key, data, time.monotonic() - age)
+            with self._lock:
+                self._stats['shared_hits'] += 1
+            metrics.inc('nexus_shared_cache_hits_total', cache='news')
+
+    @staticmethod
+    def _shared_key(key):
+        return f"news:{key}"
+
+    @staticmethod
+    def _negative_key(key):
+        return f"news-neg:{key}"
+
+    def _refresh(self, key, fetch_fn):
+        try:
+            data = fetch_fn()
+            with self._lock:
+                if data is None:
+                    self._stats['refresh_errors'] += 1
+                else:
+                    self._stats['refreshes'] += 1
+            if data is not None:
+                self.put(key, data)
+            return data
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['size'] = len(self._entries)
+            snapshot['negative'] = len(self._negative)
+        return snapshot
+
+    def after_fork(self):
+        # Arka plan işleri fork ile başlar: başka thread'in tuttuğu kilit çocukta sonsuza kadar kilitli kalmasın
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+
+news_cache = NewsCache(shared=shared_cache)
+os.register_at_fork(after_in_child=news_cache.after_fork)
+
+
+NEWS_PANEL_LIMIT = 15  # Depodan okunacak haber sayısı (Bize 12 lazım)
 
 
 def get_country_news(country_name):
-    # Hedefimiz temiz 12 haber. O yüzden ham olarak daha fazlasını çekiyoruz.
-    limit = 25 if country_name in TIER_1_COUNTRIES else 15
+    return news_cache.get(country_name, lambda: _load_country_news(country_name))
 
-    googlenews = GoogleNews(lang='en', period='7d')
-    googlenews.clear()
 
-    try:
-        googlenews.search(f'Artificial Intelligence {country_name}')
-        results = googlenews.result()
+def refresh_stale_news(country_name):
+    """Arka plan thread'i açılamayan süreçte bayat kaydı eşzamanlı yeniler; taze listeyi ya da None döner."""
+    if news_cache.background_refresh or not news_cache.is_stale(country_name):
+        return None
+    return news_cache.refresh(country_name, lambda: _load_country_news(country_name))
 
-        # Eğer çok az haber varsa 2. sayfayı da zorla
-        if len(results) < 10:
-            googlenews.get_page(2)
-            results = googlenews.result()
+
+def iter_country_news(country_name):
+    """Panel akışı için: önce depoda hazır olanı, sonra get_country_news sonucunu verir.
+
+    Önbellekte kayıt varsa (taze ya da bayat) hemen döner; aynı liste iki kez verilmez. Arka plan işinde bayat
+    kayıt gösterildikten sonra burada yenilenir ve taze liste ayrıca verilir.
+    """
+    preview = None
+    if not news_cache.contains(country_name):
+        preview = article_store.recent_stories(country_name, NEWS_PANEL_LIMIT)
+        if preview:
+            yield preview
+    news_data = get_country_news(country_name)
+    if news_data != preview:
+        yield news_data
+    fresh = refresh_stale_news(country_name)
+    if fresh is not None and fresh != news_data:
+        yield fresh
+
+
+COMPARE_MAX_WORKERS = 4  # Karşılaştırmada aynı anda çekilecek ülke sayısı
+
+
+def iter_many_country_news(countries, max_workers=COMPARE_MAX_WORKERS):
+    """Ülkeleri sınırlı bir havuzla paralel çeker; her biri bittikçe (ülke, haberler) verir.
+
+    Toplam süre, ülke sürelerinin toplamı değil en yavaş ülkeye yakındır. Hata veren ülke için None gelir.
+    Arka plan işinde bayat dönen ülkeler sonra aynı havuzda yenilenir ve taze listeleriyle bir kez daha gelir.
+    """
+    countries = list(dict.fromkeys(countries))
+    if not countries:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(countries)), thread_name_prefix='nexus-compare') as pool:
+        for fetch in (get_country_news, refresh_stale_news):
+            futures = {pool.submit(fetch, country): country for country in countries}
+            for future in as_completed(futures):
+                country = futures[future]
+                try:
+                    data = future.result()
+                except Exception:
+                    metrics.inc('nexus_scrape_failures_total', stage='compare')
+                    data = None
+                if data is not None or fetch is get_country_news:
+                    yield country, data
+
+
+def get_many_country_news(countries, max_workers=COMPARE_MAX_WORKERS):
+    """{ülke: haberler veya None} — iter_many_country_news'in toplu hali."""
+    return dict(iter_many_country_news(countries, max_workers))
+
+
+def _load_country_news(country_name):
+    # Depo yeterince tazeyse Google'a hiç gitmiyoruz (yeniden başlatmadan sonra da geçerli)
+    with metrics.span('store_read'):
+        last_fetched = article_store.last_fetched(country_name)
+        if last_fetched is not None and time.time() - last_fetched < NEWS_CACHE_TTL:
+            return article_store.recent_stories(country_name, NEWS_PANEL_LIMIT) or None
+    return refresh_country_news(country_name)
+
+
+def refresh_country_news(country_name):
+    """Google'dan çeker, yeni makaleleri depoya ekler ve ülkenin en yeni haberlerini depodan döner.
+
+    Çekim başarısız olursa (ya da GoogleNews devresi açıksa, beklemeden) depodaki son iyi veri döner.
+    """
+    with metrics.span('scrape'):
+        fresh = _fetch_country_news(country_name)
+    with metrics.span('store_write'):
+        if fresh:
+            article_store.add_articles(country_name, fresh)
+        return article_store.recent_stories(country_name, NEWS_PANEL_LIMIT) or None
+
+
+def get_news_cache_stats():
+    """hit/miss/refresh sayaçlarını döner."""
+    return news_cache.stats()
+
+
+def _topic_batch(requests):
+    """Bir ülkenin tüm konu sorgularını tek fan-out'ta çeker; hepsi başarısızsa ilk hatayı yükseltir."""
+    results = fetch_engine.fetch_requests_sync([request for request, _ in requests])
+    errors = [result for result in results.values() if isinstance(result, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for _ in errors:
+        metrics.inc('nexus_scrape_failures_total', stage='topic')
+    return [(results[request], names) for request, names in requests
+            if not isinstance(results[request], BaseException)]
+
+
+def _interleave(batches):
+    """Sorgu sonuçlarını sırayla birer birer birleştirir: limit dolduğunda her konudan haber kalmış olur."""
+    iterators = [(iter(items or []), names) for items, names in batches]
+    while iterators:
+        for pair in list(iterators):
+            item = next(pair[0], None)
+            if item is None:
+                iterators.remove(pair)
+            else:
+                yield item, pair[1]
+
+
+def _fetch_country_news(country_name, topics=None):
+    # Öncelikli ülkelerde çekim başına daha fazla temiz haber saklanır (panel 12'sini gösterir)
+    limit = fetch_limit(country_name, TIER_1_COUNTRIES)
+
+    try:
+        # Aktif konu profillerinin tüm sorguları (1. ve 2. sayfalarıyla) tek seferde eşzamanlı çekilir;
+        # profiller arasında ortak sorgu bir kez istenir. Aynı ülke için eşzamanlı tıklamalar tek isteği
+        # paylaşır. Hata olursa bütçe elverdikçe beklemeli yeniden denenir; Google bizi engellediyse devre
+        # açılır ve sonraki çağrılar ağa çıkmadan düşer.
+        requests = topic_requests(country_name, topics)
+        batches = google_news.call(lambda: _topic_batch(requests))
 
         clean_results = []
-        seen_titles = set()
+        seen_titles = {}
+
+        if not any(items for items, _ in batches):
+            metrics.inc('nexus_scrape_failures_total', stage='empty')
+            return None
 
-        if results:
-            for item in results:
+        with metrics.span('classify'):
+            for item, names in _interleave(batches):
                 title = item['title']
-                if not title or title in seen_titles:
+                if not title:
+                    continue
+                # Aynı haber birden fazla konu sorgusundan gelebilir: tek kayıt, konular birleşir
+                known = seen_titles.get(title)
+                if known is not None:
+                    known['topics'].extend(name for name in names if name not in known['topics'])
+                    continue
+                if len(clean_results) >= limit:
                     continue
-                seen_titles.add(title)
 
-                is_risky = analyze_risk(title) or analyze_risk(item.get('desc', ''))
+                desc = item.get('desc', '')
+                assessment = risk_classifier.classify_article(title, desc)
 
-                clean_results.append({
+                seen_titles[title] = article = {
                     'title': title,
-                    'desc': item.get('desc', ''),
+                    'desc': desc,
                     'date': item.get('date', 'Recent'),
                     'link': item.get('link', '#'),
                     'media': item.get('media', 'Unknown Source'),
-                    'risk': is_risky
-                })
+                    'risk': assessment.risky,
+                    'risk_score': assessment.score,
+                    'risk_terms': list(assessment.matched),
+                    'topics': list(names),
+                }
+                clean_results.append(article)
 
-                # 15 tane temiz haber topladıysak duralım (Bize 12 lazım)
-                if len(clean_results) >= 15:
-                    break
-
-            return clean_results
+        return clean_results
+    except CircuitOpenError:
+        metrics.inc('nexus_scrape_failures_total', stage='circuit_open')
         return None
-    except Exception as e:
-        print(f"Haber hatası: {e}")
+    except Exception:
+        metrics.inc('nexus_scrape_failures_total', stage='search')
         return None
 
 
 def get_geo_data():
-    """Dünya haritası verilerini çeker ve eksikleri tamamlar."""
-    url = 'https://raw.githubusercontent.com/plotly/datasets/master/2014_world_gdp_with_codes.csv'
-    try:
-        df = pd.read_csv(url)
-
-        # EKSİK ÜLKELERİ TANIMLA (Manuel Enjeksiyon)
-        missing_countries = [
-            {'CODE': 'ESH', 'COUNTRY': 'Western Sahara', 'GDP (BILLIONS)': 0},
-            {'CODE': 'GUF', 'COUNTRY': 'French Guiana', 'GDP (BILLIONS)': 0},
-            {'CODE': 'PSE', 'COUNTRY': 'Palestine', 'GDP (BILLIONS)': 0}
-        ]
-
-        # Listede yoklarsa ekle
-        rows_to_add = []
-        for item in missing_countries:
-            if item['COUNTRY'] not in df['COUNTRY'].values:
-                rows_to_add.append(item)
-
-        if rows_to_add:
-            df = pd.concat([df, pd.DataFrame(rows_to_add)], ignore_index=True)
-
-        return df
-    except:
-        # İnternet yoksa dummy data
-        return pd.DataFrame({'CODE': ['TUR'], 'COUNTRY': ['Turkey']})
+    """Dünya haritası verilerini yerel veri setinden döner (süreç başına bir kez yüklenir)."""
+    return geo_data.get_geo_frame()
 
 
 def get_country_coordinates(country_name):
-    return None, None
\ No newline at end of file
+    return geo_data.get_country_coordinates(country_name)
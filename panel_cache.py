@@ -0,0 +1,124 @@
+"""Render edilmiş panel önbelleği: (ülke, dil, haber anlık görüntüsü sürümü) -> serileştirilmiş bileşen ağacı.
+
+L1 süreç içi LRU'dur ve bayt bütçesiyle sınırlıdır. L2 (shared_cache) süreçler arası paylaşılır;
+arka plan işleri ve worker'lar ayrı süreçlerde çalıştığı için bir sürecin render ettiği panel diğerlerinde de bulunur.
+Haber anlık görüntüsü değişince sürüm değişir, eski kayıt kendiliğinden geçersiz olur.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from plotly.utils import PlotlyJSONEncoder
+
+from metrics import metrics
+from shared_cache import shared_cache
+
+PANEL_MEMO_MAX_BYTES = 16 * 1024 * 1024
+PANEL_MEMO_SHARED_TTL = 24 * 3600  # sn
+
+
+def news_snapshot_version(news_data):
+    """Haber listesinin içerik özeti. Liste değişmedikçe aynı kalır."""
+    digest = hashlib.sha1()
+    for news in news_data or []:
+        digest.update(f"{news.get('id', '')}\x1f{news['title']}\x1f{news.get('risk')}\x1f{news.get('sources', 1)}"
+                      f"\x1f{','.join(news.get('topics') or ())}\x1e".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class PanelMemo:
+    def __init__(self, max_bytes=PANEL_MEMO_MAX_BYTES, shared=None, shared_ttl=PANEL_MEMO_SHARED_TTL):
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self._entries = OrderedDict()  # (country, lang) -> (version, panel, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, country, lang, version):
+        key = (country, lang)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    metrics.inc('nexus_panel_memo_requests_total', result='hit')
+                    return entry[1]
+                # Haber anlık görüntüsü değişmiş: eski render geçersiz
+                self._drop(key)
+                self._stats['invalidations'] += 1
+
+        if self.shared is not None:
+            stored = self.shared.get(self._shared_key(country, lang))
+            if stored is not None and stored[0] == version:
+                panel = json.loads(stored[1])
+                self._store_local(key, version, panel, len(stored[1]))
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                metrics.inc('nexus_panel_memo_requests_total', result='shared')
+                metrics.inc('nexus_shared_cache_hits_total', cache='panel')
+                return panel
+
+        with self._lock:
+            self._stats['misses'] += 1
+        metrics.inc('nexus_panel_memo_requests_total', result='miss')
+        return None
+
+    def put(self, country, lang, version, panel_content):
+        """Paneli JSON'a serileştirip saklar; Dash'e doğrudan döndürülebilen serileştirilmiş hali döner."""
+        serialized = json.dumps(panel_content, cls=PlotlyJSONEncoder)
+        panel = json.loads(serialized)
+        self._store_local((country, lang), version, panel, len(serialized))
+        if self.shared is not None:
+            self.shared.set(self._shared_key(country, lang), (version, serialized), expire=self.shared_ttl)
+        return panel
+
+    def invalidate(self, country):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == country]:
+                self._drop(key)
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = len(self._entries)
+            snapshot['bytes'] = self._bytes
+        return snapshot
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+    def _store_local(self, key, version, panel, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (version, panel, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key = next(iter(self._entries))
+                self._drop(old_key)
+                self._stats['evictions'] += 1
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    @staticmethod
+    def _shared_key(country, lang):
+        return f"panel:{country}:{lang}"
+
+
+panel_memo = PanelMemo(shared=shared_cache)
+os.register_at_fork(after_in_child=panel_memo.after_fork)
@@ -0,0 +1,117 @@
+"""TIER_1 ülkelerinin haberlerini sunucu süreci içinde arka planda sıcak tutar."""
+import atexit
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import news_backend
+from shared_cache import LeaderLease
+
+# NEWS_CACHE_TTL'den kısa tutuyoruz ki tıklamalar hep taze kayda denk gelsin
+PREFETCH_INTERVAL = 240  # sn
+PREFETCH_JITTER = 0.2  # Aralığın ±%20'si kadar sapma (tüm süreçler aynı anda vurmasın)
+PREFETCH_MAX_WORKERS = 3  # Aynı anda en fazla kaç ülke çekilecek
+PREFETCH_ENABLED = os.environ.get('NEXUS_PREFETCH', '1') != '0'  # Ölçümlerde/çevrimdışı kapatmak için
+PREFETCH_LEASE_TTL = PREFETCH_INTERVAL * 2  # Lider süreç ölürse bu süre sonunda başka worker devralır (sn)
+
+
+class PrefetchScheduler:
+    """Belirli aralıklarla ülke listesini çekip ortak önbelleğe yazar.
+
+    fetcher: country_name -> haber listesi (veya None). Testlerde sahte fetcher verilebilir.
+    lease: LeaderLease verilirse turu sadece kirayı tutan süreç çalıştırır (çok worker'lı sunucuda
+    Google'a worker sayısı kadar istek gitmesin); diğerleri ortak önbellekten okur.
+    """
+
+    def __init__(self, countries=None, interval=PREFETCH_INTERVAL, jitter=PREFETCH_JITTER,
+                 max_workers=PREFETCH_MAX_WORKERS, fetcher=None, cache=None, lease=None):
+        self.countries = list(countries if countries is not None else news_backend.TIER_1_COUNTRIES)
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max(1, max_workers)
+        self.fetcher = fetcher or news_backend.refresh_country_news
+        self.cache = cache or news_backend.news_cache
+        self.lease = lease
+        self.rounds = 0
+        self.skipped_rounds = 0
+        self.failures = 0
+        self.started = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.is_running():
+                return
+            self.started = True
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='nexus-prefetch', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self.lease is not None:
+            self.lease.release()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self):
+        """Tüm ülkeleri bir tur çeker (eşzamanlılık max_workers ile sınırlı). Başarılı ülke sayısını döner."""
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='nexus-prefetch') as pool:
+            for country, data in zip(self.countries, pool.map(self._fetch_one, self.countries)):
+                if data is None:
+                    continue
+                self.cache.put(country, data)
+                fetched += 1
+        self.rounds += 1
+        return fetched
+
+    def next_delay(self):
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def _fetch_one(self, country):
+        if self._stop_event.is_set():
+            return None
+        try:
+            data = self.fetcher(country)
+        except Exception as e:
+            print(f"Prefetch hatası ({country}): {e}")
+            data = None
+        if data is None:
+            self.failures += 1
+        return data
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self.lease is None or self.lease.acquire():
+                self.run_once()
+            else:
+                self.skipped_rounds += 1
+            if self._stop_event.wait(self.next_delay()):
+                break
+
+
+def init_prefetch(server, scheduler=None, autostart=True):
+    """Zamanlayıcıyı Flask `server`ına bağlar.
+
+    autostart=True ise ilk istekte başlar (NEXUS_PREFETCH=0 ile kapatılabilir); süreç kapanırken durdurulur.
+    Zamanlayıcıya `server.extensions['nexus_prefetch']` üzerinden erişilebilir.
+    """
+    scheduler = scheduler or PrefetchScheduler(lease=LeaderLease('prefetch', PREFETCH_LEASE_TTL))
+    server.extensions['nexus_prefetch'] = scheduler
+
+    if autostart and PREFETCH_ENABLED:
+        @server.before_request
+        def _start_prefetch():
+            if not scheduler.started:
+                scheduler.start()
+
+    atexit.register(scheduler.stop)
+    return scheduler
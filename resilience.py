@@ -0,0 +1,223 @@
+"""Dış servisler (GoogleNews, GoogleTranslator) için dayanıklılık katmanı.
+
+- Devre kesici: art arda hata eşiği aşılınca servis bir süre hiç çağrılmaz (istek milisaniyede düşer);
+  süre dolunca tek bir deneme çağrısı geçer, başarılıysa devre kapanır. Açık durum ortak önbelleğe de yazılır,
+  böylece diğer worker'lar aynı engeli tek tek keşfetmez.
+- Yeniden deneme: üstel bekleme + tam jitter; toplam yeniden deneme sayısı global bir bütçeyle sınırlı
+  (istek sayısının belli bir oranı), kesinti sırasında yeniden denemeler yükü katlamasın.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from metrics import metrics
+from shared_cache import shared_cache
+
+BREAKER_FAILURE_THRESHOLD = 5  # Art arda bu kadar hata devreyi açar
+BREAKER_RESET_TIMEOUT = 60.0  # Açık devrenin deneme çağrısına izin vermeden önce beklediği süre (sn)
+
+RETRY_BUDGET_RATIO = 0.2  # Pencere içindeki isteklerin en fazla %20'si kadar yeniden deneme
+RETRY_BUDGET_MIN = 5  # Az trafikte de birkaç yeniden denemeye izin verilsin
+RETRY_BUDGET_WINDOW = 60.0  # sn
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken servis çağrılmadı."""
+
+    def __init__(self, name):
+        super().__init__(f"{name} devresi açık")
+        self.name = name
+
+
+class UpstreamError(Exception):
+    """Servis hata fırlatmadan kullanılamaz yanıt döndü (ör. çevirinin tamamı boş)."""
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT,
+                 shared=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.shared = shared
+        self._state = self.CLOSED
+        self._failures = 0
+        self._open_until = 0.0  # duvar saati; süreçler arası karşılaştırılabilsin
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """Çağrıya izin var mı? Yarı açık durumda aynı anda tek deneme çağrısı geçer."""
+        now = time.time()
+        with self._lock:
+            if self._state == self.OPEN:
+                if now < self._open_until:
+                    return False
+                self._set_state(self.HALF_OPEN)
+                self._probing = False
+            if self._state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+                return True
+        # Başka bir worker devreyi açtıysa biz de açık sayalım
+        open_until = self.shared.get(self._shared_key()) if self.shared is not None else None
+        if open_until is not None and now < open_until:
+            with self._lock:
+                if self._state == self.CLOSED:
+                    self._open_until = open_until
+                    self._set_state(self.OPEN)
+            return False
+        return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state == self.CLOSED:
+                return
+            self._set_state(self.CLOSED)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key())
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.OPEN:
+                return
+            if self._state == self.CLOSED and self._failures < self.failure_threshold:
+                return
+            self._failures = 0
+            self._open_until = time.time() + self.reset_timeout
+            self._set_state(self.OPEN)
+            open_until = self._open_until
+        print(f"Devre açıldı ({self.name}): {self.reset_timeout:.0f} sn boyunca çağrı yapılmayacak")
+        if self.shared is not None:
+            self.shared.set(self._shared_key(), open_until, expire=self.reset_timeout)
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+        self._probing = False
+
+    def _set_state(self, state):
+        # Kilit altında çağrılır
+        self._state = state
+        metrics.inc('nexus_circuit_transitions_total', upstream=self.name, state=state)
+
+    def _shared_key(self):
+        return f"breaker:{self.name}"
+
+
+class RetryBudget:
+    """Kayan pencerede yeniden deneme sayısını istek sayısının bir oranıyla (+ sabit taban) sınırlar."""
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, min_retries=RETRY_BUDGET_MIN, window=RETRY_BUDGET_WINDOW):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._requests.append(time.monotonic())
+
+    def try_retry(self):
+        """Bütçe varsa bir yeniden denemeyi harcayıp True döner."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self):
+        with self._lock:
+            self._prune(time.monotonic())
+            return {'requests': len(self._requests), 'retries': len(self._retries)}
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        cutoff = now - self.window
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+
+class Upstream:
+    """Bir dış servis: devre kesici + yeniden deneme politikası.
+
+    no_retry: hata sayılan ama yeniden denenmeyen istisnalar (zaman aşımı zaten uzun beklemiş demektir).
+    """
+
+    def __init__(self, name, attempts=3, base_delay=0.5, max_delay=8.0, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, budget=None, shared=None, no_retry=(TimeoutError,),
+                 sleep=time.sleep):
+        self.name = name
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout, shared=shared)
+        self.budget = budget if budget is not None else retry_budget
+        self.no_retry = no_retry
+        self.sleep = sleep
+
+    def call(self, fn):
+        """fn()'i politika altında çalıştırır. Devre açıksa hemen CircuitOpenError fırlatır."""
+        if not self.breaker.allow():
+            metrics.inc('nexus_upstream_calls_total', upstream=self.name, result='rejected')
+            raise CircuitOpenError(self.name)
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = fn()
+            except Exception as e:
+                self.breaker.record_failure()
+                metrics.inc('nexus_upstream_calls_total', upstream=self.name, result='error')
+                if (attempt >= self.attempts or isinstance(e, self.no_retry) or not self.breaker.allow()
+                        or not self.budget.try_retry()):
+                    raise
+                metrics.inc('nexus_upstream_retries_total', upstream=self.name)
+                self.sleep(self.backoff(attempt))
+            else:
+                self.breaker.record_success()
+                metrics.inc('nexus_upstream_calls_total', upstream=self.name, result='ok')
+                return result
+
+    def backoff(self, attempt):
+        # Tam jitter: eşzamanlı yeniden denemeler aynı ana yığılmasın
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def after_fork(self):
+        self.breaker.after_fork()
+
+
+retry_budget = RetryBudget()
+os.register_at_fork(after_in_child=retry_budget.after_fork)
+
+google_news = Upstream('google_news', attempts=3, base_delay=1.0, max_delay=8.0, shared=shared_cache)
+google_translate = Upstream('google_translate', attempts=2, base_delay=0.5, max_delay=4.0, reset_timeout=30.0,
+                            shared=shared_cache)
+# Uyarı webhook'u: alıcı kapalıysa devre açılır, uyarı akışı her turda zaman aşımı beklemez
+alert_webhook = Upstream('alert_webhook', attempts=3, base_delay=1.0, max_delay=8.0, shared=shared_cache)
+os.register_at_fork(after_in_child=google_news.after_fork)
+os.register_at_fork(after_in_child=google_translate.after_fork)
+os.register_at_fork(after_in_child=alert_webhook.after_fork)
@@ -0,0 +1,147 @@
+"""Derlenmiş tek geçişli risk sınıflandırıcı."""
+import re
+from collections import namedtuple
+from itertools import chain, filterfalse
+
+RISK_KEYWORDS = ['military', 'nuclear', 'weapon', 'war', 'army', 'kill', 'attack', 'hack', 'spy', 'surveillance',
+                 'danger', 'threat', 'missile', 'soldier', 'death', 'virus', 'bioweapon', 'cyber', 'drone', 'spyware']
+
+# Anahtar kelime ağırlıkları (0-1). Listede olup burada olmayanlar DEFAULT_RISK_WEIGHT alır.
+RISK_WEIGHTS = {
+    'nuclear': 1.0, 'bioweapon': 1.0, 'weapon': 0.8, 'missile': 0.8, 'kill': 0.8,
+    'war': 0.7, 'attack': 0.7, 'military': 0.6, 'army': 0.6, 'soldier': 0.6, 'death': 0.6,
+    'hack': 0.6, 'spy': 0.6, 'cyber': 0.5, 'surveillance': 0.5, 'drone': 0.5, 'virus': 0.5,
+    'threat': 0.5, 'danger': 0.4, 'spyware': 0.6,
+}
+DEFAULT_RISK_WEIGHT = 0.5
+RISK_TOKEN_CACHE_MAX = 50000  # Kelime önbellekleri bu boyuta ulaşınca sıfırlanır
+
+# Kelimenin kendisi dışında eşleşmesi gereken çekimler ve bileşikler ("spies", "armies", "warfare", "warheads")
+RISK_VARIANTS = {'spy': ['spies'], 'army': ['armies'], 'threat': ['threaten'],
+                 'war': ['warfare', 'warring', 'warhead', 'warship', 'warplane', 'warlord', 'wartime', 'warzone'],
+                 'military': ['militar']}
+
+# Sonrasında her şey gelebilen biçimler ("cyberattack", "cybersecurity", "militarized", "militarization")
+RISK_PREFIXES = {'cyber', 'militar'}
+
+# Kelime sonuna gelebilecek ekler. "war" -> "wars", "weapon" -> "weaponization" eşleşir; "software"/"warm" eşleşmez.
+_SUFFIXES = r'(?:s|es|ed|ing|ings|er|ers|ous|ry|ize|izes|ized|izing|ization|ise|ised|isation)?'
+
+RiskAssessment = namedtuple('RiskAssessment', ['risky', 'score', 'matched'])
+NO_RISK = RiskAssessment(False, 0.0, ())
+
+
+def _trie_pattern(words):
+    """Kelime listesini önek ağacı biçiminde bir regex alternasyonuna çevirir."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if '' in node:
+            # Kelime burada bitebilir, devamı isteğe bağlı
+            body = f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class RiskClassifier:
+    """Tüm anahtar kelimeleri tek bir regex ile, kelime sınırlarına dikkat ederek bulur.
+
+    Regex metnin tamamında çalışmaz: eşleşmeler boşluk içermediği için metin boşluktan bölünür, regex her yeni
+    kelimede bir kez çalışır ve sonuç önbelleğe yazılır (RISK_TOKEN_CACHE_MAX'ta sıfırlanır). Sonraki metinlerde
+    bilinen risksiz kelimeler C seviyesinde elenir; Python'da sadece riskli kelimeler işlenir.
+    """
+
+    def __init__(self, keywords=RISK_KEYWORDS, weights=RISK_WEIGHTS, variants=RISK_VARIANTS,
+                 prefixes=RISK_PREFIXES):
+        self.weights = {kw: weights.get(kw, DEFAULT_RISK_WEIGHT) for kw in keywords}
+        self._canonical = {}
+        words, prefix_words = [], []
+        for kw in keywords:
+            forms = [kw] + list(variants.get(kw, []))
+            for form in forms:
+                self._canonical[form] = kw
+                (prefix_words if form in prefixes else words).append(form)
+
+        self._safe_tokens = set()
+        self._risky_tokens = {}  # kelime -> eşleşen anahtar kelimeler
+        self._assessments = {}  # eşleşme dizisi -> RiskAssessment
+        # Alternatifleri ortak önekten ağaca çeviriyoruz; sre aynı konumda dalları tek tek denemesin
+        parts = []
+        if prefix_words:
+            parts.append(rf'({_trie_pattern(prefix_words)})\w*')
+        if words:
+            parts.append(rf'({_trie_pattern(words)}){_SUFFIXES}')
+        self._pattern = re.compile(rf"\b(?:{'|'.join(parts)})\b")
+
+    def classify(self, text):
+        if not text:
+            return NO_RISK
+        # IGNORECASE yerine tek lower(): sre'de büyük/küçük harf duyarsız eşleşme belirgin şekilde yavaş
+        tokens = text.lower().split()
+        if self._safe_tokens.issuperset(tokens):
+            return NO_RISK
+        # Risksiz bilinen kelimeler C seviyesinde elenir; regex'e sadece yeni kelimeler gider
+        terms = tuple(chain.from_iterable(map(self._token_terms, self._unknown(tokens))))
+        if not terms:
+            return NO_RISK
+        assessment = self._assessments.get(terms)
+        if assessment is None:
+            matched = tuple(dict.fromkeys(terms))
+            # Olasılıksal VEYA: her ek kelime skoru artırır ama 1'i geçmez
+            safe = 1.0
+            for kw in matched:
+                safe *= 1.0 - self.weights[kw]
+            assessment = RiskAssessment(True, round(1.0 - safe, 4), matched)
+            if len(self._assessments) >= RISK_TOKEN_CACHE_MAX:
+                self._assessments.clear()
+            self._assessments[terms] = assessment
+        return assessment
+
+    def is_risky(self, text):
+        """classify(text).risky ile aynı; ilk riskli kelimede durur, skor hesaplamaz."""
+        if not text:
+            return False
+        tokens = text.lower().split()
+        # Önbellekteki riskli bir kelime geçiyorsa iş biter (C seviyesinde, ilk eşleşmede durur)
+        if not self._risky_tokens.keys().isdisjoint(tokens):
+            return True
+        if self._safe_tokens.issuperset(tokens):
+            return False
+        return any(map(self._token_terms, self._unknown(tokens)))
+
+    def _unknown(self, tokens):
+        """Risksiz olduğu bilinmeyen kelimeler, metindeki sırasıyla."""
+        return filterfalse(self._safe_tokens.__contains__, tokens)
+
+    def _token_terms(self, token):
+        terms = self._risky_tokens.get(token)
+        if terms is None:
+            terms = tuple(self._canonical[m.group(m.lastindex)] for m in self._pattern.finditer(token))
+            cache = self._risky_tokens if terms else self._safe_tokens
+            if len(cache) >= RISK_TOKEN_CACHE_MAX:
+                cache.clear()
+            if terms:
+                self._risky_tokens[token] = terms
+            else:
+                self._safe_tokens.add(token)
+        return terms
+
+    def classify_many(self, texts):
+        return [self.classify(text) for text in texts]
+
+    def classify_article(self, title, desc=''):
+        """Başlık ve açıklamayı tek metin olarak tek geçişte tarar."""
+        return self.classify(f"{title or ''}\n{desc or ''}")
+
+
+risk_classifier = RiskClassifier()
@@ -0,0 +1,124 @@
+"""Toplanan haberler üzerinde yerel tam metin arama: facet'ler (ülke / dönem / risk) ve typeahead.
+
+Sorgular Google'a gitmez; article_store'daki FTS5 indeksinden (yoksa LIKE taramasından) cevaplanır.
+Sonuçlar süreç içi LRU'da tutulur. Anahtar depodaki en büyük makale id'sini içerdiği için yeni makale
+gelince eski sonuçlar kendiliğinden geçersiz olur; tekrar eden sorgular (typeahead) SQLite'a inmez.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from article_store import article_store
+from metrics import metrics
+
+SEARCH_CACHE_MAX_ENTRIES = 512
+SEARCH_RESULT_LIMIT = 20
+SEARCH_SUGGESTION_LIMIT = 8
+SEARCH_MIN_QUERY = 2  # Bundan kısa sorgu aranmaz (tek harf önek araması tüm indeksi tarar)
+SEARCH_MAX_TERMS = 8
+SEARCH_PERIODS = {'24h': 86400, '7d': 7 * 86400, 'all': None}
+SEARCH_OVERFETCH = 3  # Küme başına tek sonuç kalacağı için bu kat fazla satır okunur
+
+_WORD = re.compile(r'\w+')
+
+
+def parse_query(query, prefix=True):
+    """Serbest metni [(kelime, önek_mi)] listesine çevirir; FTS sözdizimi (AND, *, ") kullanıcıdan alınmaz.
+
+    Son kelime yazılmakta olduğu için önek olarak aranır (typeahead).
+    """
+    words = _WORD.findall((query or '').lower())[:SEARCH_MAX_TERMS]
+    if not words or sum(len(word) for word in words) < SEARCH_MIN_QUERY:
+        return []
+    return [(word, prefix and i == len(words) - 1) for i, word in enumerate(words)]
+
+
+def collapse_stories(articles, limit):
+    """Aynı kümeden (yakın-kopya) gelen eşleşmeleri tek sonuca indirir; 'sources' eşleşen yayıncı sayısıdır."""
+    stories = OrderedDict()
+    for article in articles:
+        key = article.get('cluster_id') or article['id']
+        members = stories.get(key)
+        if members is None:
+            if len(stories) >= limit:
+                continue
+            stories[key] = members = []
+        members.append(article)
+    result = []
+    for members in stories.values():
+        story = dict(members[0])
+        story['risk'] = any(article['risk'] for article in members)
+        story['sources'] = len({article['media'] for article in members})
+        story['countries'] = sorted({article['country'] for article in members})
+        result.append(story)
+    return result
+
+
+class SearchService:
+    def __init__(self, store=None, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.store = store or article_store
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def search(self, query, country=None, period='all', critical=False, limit=SEARCH_RESULT_LIMIT):
+        """{'results': [haber], 'facets': {...}, 'terms': [...]}; boş/kısa sorguda None."""
+        terms = parse_query(query)
+        if not terms:
+            return None
+        seconds = SEARCH_PERIODS.get(period)
+        # Dakikaya yuvarlanır: aynı dakikadaki tekrarlar önbellekten döner, dönem filtresi de bayatlamaz
+        since = int(time.time() // 60 * 60) - seconds if seconds else None
+        key = (tuple(terms), country, since, bool(critical), limit, self.store.max_id())
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+        if cached is not None:
+            metrics.inc('nexus_search_requests_total', result='hit')
+            return cached
+
+        metrics.inc('nexus_search_requests_total', result='miss')
+        with metrics.span('search'):
+            articles = self.store.search(terms, country, since, critical, limit * SEARCH_OVERFETCH)
+            result = {
+                'terms': [word for word, _ in terms],
+                'results': collapse_stories(articles, limit),
+                'facets': self.store.search_facets(terms, since, critical),
+            }
+        with self._lock:
+            self._stats['misses'] += 1
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def suggest(self, query, limit=SEARCH_SUGGESTION_LIMIT):
+        """Typeahead: sorguyla eşleşen en yeni farklı başlıklar."""
+        result = self.search(query, limit=limit)
+        if not result:
+            return []
+        return list(dict.fromkeys(story['title'] for story in result['results']))[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['size'] = len(self._entries)
+        snapshot['fts'] = self.store.fts_enabled
+        return snapshot
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+search_service = SearchService()
+os.register_at_fork(after_in_child=search_service.after_fork)
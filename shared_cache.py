@@ -0,0 +1,140 @@
+"""Süreçler arası ortak önbellek (yerel diskcache, harici servis yok).
+
+gunicorn worker'ları ve Dash arka plan işleri ayrı süreçlerdir; her birinin süreç içi önbelleği (L1) ayrı kalır.
+Bu modül hepsinin aynı dizini paylaştığı L2'yi sağlar: haber, çeviri ve panel önbellekleri buraya da yazar.
+Önbellek hataları isteği asla düşürmez: okuma hatası "yok", yazma hatası "yazılmadı" sayılır.
+"""
+import os
+import socket
+import threading
+
+CACHE_DIR = os.environ.get('NEXUS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+SHARED_CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+SHARED_CACHE_ENABLED = os.environ.get('NEXUS_SHARED_CACHE', '1') != '0'
+
+
+class SharedCache:
+    """diskcache.Cache üzerinde tembel açılan ince sarmalayıcı. Fork sonrası çocukta yeniden açılır."""
+
+    def __init__(self, directory, size_limit=SHARED_CACHE_SIZE_LIMIT, enabled=SHARED_CACHE_ENABLED):
+        self.directory = directory
+        self.size_limit = size_limit
+        self.enabled = enabled
+        self._cache = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if not self.enabled:
+            return None
+        cache = self._cache
+        if cache is not None and self._pid == os.getpid():
+            return cache
+        with self._lock:
+            if self._cache is None or self._pid != os.getpid():
+                try:
+                    import diskcache
+                except ImportError:
+                    print("Ortak önbellek devre dışı: diskcache kurulu değil")
+                    self.enabled = False
+                    return None
+                self._cache = diskcache.Cache(self.directory, size_limit=self.size_limit,
+                                              eviction_policy='least-recently-used')
+                self._pid = os.getpid()
+            return self._cache
+
+    def get(self, key, default=None):
+        cache = self._open()
+        if cache is None:
+            return default
+        try:
+            return cache.get(key, default)
+        except Exception as e:
+            print(f"Ortak önbellek okuma hatası: {e}")
+            return default
+
+    def set(self, key, value, expire=None):
+        cache = self._open()
+        if cache is None:
+            return False
+        try:
+            return cache.set(key, value, expire=expire)
+        except Exception as e:
+            print(f"Ortak önbellek yazma hatası: {e}")
+            return False
+
+    def add(self, key, value, expire=None):
+        """Anahtar yoksa atomik olarak ekler; eklendiyse True."""
+        cache = self._open()
+        if cache is None:
+            return False
+        try:
+            return cache.add(key, value, expire=expire)
+        except Exception as e:
+            print(f"Ortak önbellek yazma hatası: {e}")
+            return False
+
+    def update(self, key, fn, expire=None):
+        """Değeri fn(eski_değer) ile atomik olarak değiştirir (eşzamanlı yazan süreçler birbirini ezmez)."""
+        cache = self._open()
+        if cache is None:
+            return False
+        try:
+            with cache.transact():
+                cache.set(key, fn(cache.get(key)), expire=expire)
+            return True
+        except Exception as e:
+            print(f"Ortak önbellek yazma hatası: {e}")
+            return False
+
+    def delete(self, key):
+        cache = self._open()
+        if cache is None:
+            return False
+        try:
+            return cache.delete(key)
+        except Exception as e:
+            print(f"Ortak önbellek silme hatası: {e}")
+            return False
+
+    def after_fork(self):
+        # SQLite bağlantıları fork'tan sağ çıkmaz; çocuk ilk kullanımda kendi bağlantısını açar
+        self._lock = threading.Lock()
+        self._cache = None
+        self._pid = None
+
+
+class LeaderLease:
+    """Birden çok süreçten sadece birinin periyodik işi yapması için süreli kira.
+
+    acquire() kirayı alır ya da (zaten sahibiyse) uzatır. Sahip süreç ölürse kira ttl sonunda düşer.
+    Ortak önbellek yoksa her süreç kendini lider sayar (tek süreçli geliştirme sunucusu).
+    """
+
+    def __init__(self, name, ttl, cache=None):
+        self.key = f"leader:{name}"
+        self.ttl = ttl
+        self.cache = cache or shared_cache
+
+    @property
+    def owner(self):
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def acquire(self):
+        if not self.cache.enabled:
+            return True
+        owner = self.owner
+        if self.cache.add(self.key, owner, expire=self.ttl):
+            return True
+        if self.cache.get(self.key) == owner:
+            self.cache.set(self.key, owner, expire=self.ttl)
+            return True
+        return not self.cache.enabled  # Önbellek bu arada kapandıysa
+
+    def release(self):
+        if self.cache.enabled and self.cache.get(self.key) == self.owner:
+            self.cache.delete(self.key)
+
+
+shared_cache = SharedCache(os.path.join(CACHE_DIR, 'shared'))
+os.register_at_fork(after_in_child=shared_cache.after_fork)
@@ -1,21 +1,13 @@
 import dash
 from dash import dcc, html, Input, Output, State
 import plotly.graph_objects as go
-import pandas as pd
-from GoogleNews import GoogleNews
 import datetime
 
-# --- 1. AYARLAR VE VERİ HAZIRLIĞI ---
-# Google News servisini başlat
-googlenews = GoogleNews(lang='en', period='7d')  # Son 7 gün, İngilizce sonuçlar
+from geo_data import get_geo_frame
 
-# Ülke verilerini çek
-url = 'https://raw.githubusercontent.com/plotly/datasets/master/2014_world_gdp_with_codes.csv'
-try:
-    df_geo = pd.read_csv(url)
-except:
-    # İnternet yoksa dummy data
-    df_geo = pd.DataFrame({'CODE': ['TUR', 'USA'], 'COUNTRY': ['Turkey', 'United States']})
+# --- 1. AYARLAR VE VERİ HAZIRLIĞI ---
+# Ülke verileri (yerel veri seti, ağa çıkmaz)
+df_geo = get_geo_frame()
 
 # Dash Uygulamasını Başlat
 app = dash.Dash(__name__)
@@ -27,6 +19,11 @@ server = app.server
 def get_news_for_country(country_name):
     """Seçilen ülke için son 7 günün AI haberlerini getirir."""
     try:
+        # İstemci istek başına oluşturulur: GoogleNews sonuçları nesne içinde tutuyor,
+        # çok thread'li sunucuda paylaşılan istemci başka isteğin sonuçlarını karıştırır.
+        from GoogleNews import GoogleNews  # Sadece ilk aramada yüklenir
+
+        googlenews = GoogleNews(lang='en', period='7d')  # Son 7 gün, İngilizce sonuçlar
         googlenews.clear()
         # Arama sorgusu: "Artificial Intelligence" + Ülke Adı
         googlenews.search(f'Artificial Intelligence {country_name}')
@@ -0,0 +1,76 @@
+"""Uyarı teslimi: sink hata verirse uyarılar kaybolmamalı, sonraki turda yeniden gönderilmeli (en az bir kez).
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import AlertPipeline  # noqa: E402
+from article_store import ArticleStore  # noqa: E402
+
+
+class FlakySink:
+    """İlk `failures` gönderimde hata verir, sonra alınan uyarıları saklar."""
+
+    name = 'flaky'
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.attempts = 0
+        self.received = []
+
+    def send(self, alerts):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError('webhook kapalı')
+        self.received.extend(alert['alert_id'] for alert in alerts)
+
+
+def critical(title):
+    return {'title': title, 'desc': f"{title} details", 'link': f"https://news.example.com/{abs(hash(title))}",
+            'media': 'Reuters', 'date': '1 hour ago', 'risk': True, 'risk_score': 0.8, 'risk_terms': ['nuclear']}
+
+
+class AlertDeliveryTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ArticleStore(os.path.join(tempfile.mkdtemp(dir=_WORKDIR), 'nexus.db'))
+        self.sink = FlakySink(failures=1)
+        self.pipeline = AlertPipeline(store=self.store, sinks=[self.sink], countries=[])
+        self.assertEqual(self.pipeline.run_once(), [])  # İlk tur: imleçler bugünden başlar
+
+    def test_failed_delivery_is_retried_next_round(self):
+        self.store.add_articles('Germany', [critical('Nuclear plant drill in Bavaria'),
+                                            critical('Army tests new drone swarm over the Baltic Sea')])
+        created = self.pipeline.run_once()
+        self.assertEqual(len(created), 2)
+        self.assertEqual(self.sink.received, [])  # Gönderim başarısız: imleç ilerlemedi
+
+        self.assertEqual(self.pipeline.run_once(), [])  # Yeni uyarı yok, bekleyenler yeniden gönderilir
+        self.assertEqual(self.sink.received, [alert['alert_id'] for alert in created])
+
+        self.pipeline.run_once()
+        self.assertEqual(self.sink.attempts, 2)  # Teslim edilenler tekrar gönderilmez
+        self.assertEqual(self.pipeline.stats()['sinks'], {'flaky': created[-1]['alert_id']})
+
+    def test_new_sink_starts_from_current_alerts(self):
+        self.store.add_articles('Japan', [critical('Missile launch detected near Hokkaido')])
+        self.sink.failures = 0
+        self.pipeline.run_once()
+        late = FlakySink(failures=0)
+        late.name = 'late'
+        self.pipeline.sinks.append(late)
+        self.pipeline.run_once()
+        self.assertEqual(len(self.sink.received), 1)
+        self.assertEqual(late.received, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Makale deposu: INSERT OR IGNORE tekilleştirme, FTS indeksinin eşzamanlılığı ve eski şemadan göç.
+
+    python -m pytest -q tests
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore, article_key  # noqa: E402
+from topics import DEFAULT_TOPIC  # noqa: E402
+
+# f1a91e1 (ilk depo sürümü) şeması: cluster_id, article_topics ve articles_fts yok
+BASELINE_SCHEMA = """
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY,
+    article_key TEXT NOT NULL,
+    country TEXT NOT NULL,
+    title TEXT NOT NULL,
+    desc TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '#',
+    media TEXT NOT NULL DEFAULT '',
+    date_text TEXT NOT NULL DEFAULT '',
+    published_at REAL NOT NULL,
+    fetched_at REAL NOT NULL,
+    risk INTEGER NOT NULL DEFAULT 0,
+    risk_score REAL NOT NULL DEFAULT 0,
+    risk_terms TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (country, article_key)
+);
+CREATE INDEX idx_articles_country_recent ON articles (country, published_at DESC);
+CREATE TABLE fetch_log (
+    country TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    new_articles INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+ARTICLES = [
+    {'title': 'Parliament approves new budget', 'desc': 'Lawmakers voted late on Tuesday.',
+     'link': 'https://www.example.com/budget?utm_source=rss', 'media': 'Example'},
+    {'title': 'Storm closes northern ports', 'desc': 'Shipping halted for two days.',
+     'link': 'https://news.example.org/storm', 'media': 'Example Org'},
+]
+
+
+def fts_ids(store, word):
+    return [row[0] for row in store._conn().execute(
+        'SELECT rowid FROM articles_fts WHERE articles_fts MATCH ? ORDER BY rowid', (f'"{word}"',))]
+
+
+class ArticleStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix='nexus-store-'), 'nexus.db')
+        self.store = ArticleStore(self.path)
+
+    def test_refetch_inserts_nothing(self):
+        self.assertEqual(self.store.add_articles('Germany', ARTICLES, fetched_at=1000.0), 2)
+        # Aynı makaleler, izleme parametresi ve www farkıyla yeniden geldi
+        again = [dict(ARTICLES[0], link='https://example.com/budget/?utm_medium=x&ved=abc'), dict(ARTICLES[1])]
+        self.assertEqual(self.store.add_articles('Germany', again, fetched_at=2000.0), 0)
+        self.assertEqual(self.store.count('Germany'), 2)
+        self.assertEqual(self.store.last_fetched('Germany'), 2000.0)
+        # Anahtar ülke başına: başka ülkede aynı makale ayrı satırdır
+        self.assertEqual(self.store.add_articles('France', ARTICLES[:1], fetched_at=2000.0), 1)
+
+    def test_article_key_ignores_tracking_and_falls_back_to_title(self):
+        self.assertEqual(article_key('https://www.example.com/a?utm_source=x', 'T'),
+                         article_key('https://example.com/a/', 'other'))
+        self.assertEqual(article_key('#', 'Storm: closes ports!'), article_key(None, 'storm closes  ports'))
+
+    def test_fts_follows_insert_and_delete(self):
+        self.store._conn()  # fts_enabled ilk bağlantıda belirlenir
+        if not self.store.fts_enabled:
+            self.skipTest('SQLite FTS5 olmadan derlenmiş')
+        self.store.add_articles('Germany', ARTICLES, fetched_at=1000.0)
+        storm_id = self.store.search([('storm', False)])[0]['id']
+        self.assertEqual(fts_ids(self.store, 'storm'), [storm_id])
+        self.assertEqual(len(fts_ids(self.store, 'lawmakers')), 1)  # açıklama da indekslenir
+
+        conn = self.store._conn()
+        with conn:
+            conn.execute('DELETE FROM articles WHERE id = ?', (storm_id,))
+        self.assertEqual(fts_ids(self.store, 'storm'), [])
+        self.assertEqual(self.store.search([('storm', False)]), [])
+        self.assertEqual(len(fts_ids(self.store, 'parliament')), 1)
+
+    def test_migrates_baseline_database(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript(BASELINE_SCHEMA)
+        with conn:
+            for i, item in enumerate(ARTICLES):
+                conn.execute('INSERT INTO articles (article_key, country, title, desc, link, published_at, fetched_at) '
+                             'VALUES (?,?,?,?,?,?,?)', (article_key(item['link'], item['title']), 'Germany',
+                                                        item['title'], item['desc'], item['link'], 900.0 + i, 900.0))
+        conn.close()
+
+        conn = self.store._conn()
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(articles)')}
+        self.assertIn('cluster_id', columns)
+        # Eski makaleler varsayılan konuya atanır ve FTS indeksine bir kez eklenir
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM article_topics WHERE topic = ?',
+                                      (DEFAULT_TOPIC,)).fetchone()[0], 2)
+        if self.store.fts_enabled:
+            self.assertEqual(len(fts_ids(self.store, 'storm')), 1)
+
+        # Eski satırlar yeniden eklenmez; sonraki eklemede kümelenmemiş olanlar da kümelenir
+        self.assertEqual(self.store.add_articles('Germany', ARTICLES, fetched_at=1000.0), 0)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM articles WHERE cluster_id IS NULL').fetchone()[0], 0)
+        self.assertEqual([a['title'] for a in self.store.recent('Germany')],
+                         [ARTICLES[1]['title'], ARTICLES[0]['title']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Çekme motoru: aynı anahtar için eşzamanlı istekler tek upstream çağrısına birleşmeli, host hız sınırı aşılmamalı.
+
+    python -m pytest -q tests
+"""
+import asyncio
+import os
+import sys
+import time
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_engine import GoogleNewsTransport, NewsFetchEngine, StaticTransport  # noqa: E402
+
+PAGES = {('ai Germany', 1): [{'title': 'one'}], ('ai Germany', 2): [{'title': 'two'}]}
+
+
+class FakeGoogleNews:
+    """GoogleNews istemcisi: hangi public/iç çağrıların yapıldığını kaydeder."""
+
+    version = '1.6.16'
+    instances = []
+
+    def __init__(self, lang='en', period='7d', encode='utf-8'):
+        self._GoogleNews__encode = encode
+        self.calls = []
+        FakeGoogleNews.instances.append(self)
+
+    def getVersion(self):
+        return self.version
+
+    def enableException(self, enable=True):
+        pass
+
+    def clear(self):
+        self.calls.append(('clear',))
+
+    def search(self, query):
+        self._GoogleNews__key = query
+        self.calls.append(('search', query))
+
+    def get_page(self, page):
+        self.calls.append(('get_page', self._GoogleNews__key, page))
+
+    def result(self):
+        return []
+
+
+class FetchEngineTest(unittest.TestCase):
+    def test_concurrent_requests_coalesce(self):
+        transport = StaticTransport(PAGES, delay=0.05)
+        engine = NewsFetchEngine(transport=transport, pages=1, min_results=0)
+
+        async def burst():
+            return await asyncio.gather(*(engine.fetch('ai Germany') for _ in range(20)))
+
+        results = engine.run(burst())
+        self.assertEqual(transport.calls, 1)
+        self.assertTrue(all(result == [{'title': 'one'}] for result in results))
+        self.assertEqual(engine.stats['fetches'], 1)
+        self.assertEqual(engine.stats['coalesced'], 19)
+
+        # Uçuştaki istek bittikten sonra aynı anahtar yeniden çekilir
+        engine.fetch_sync('ai Germany')
+        self.assertEqual(transport.calls, 2)
+
+    def test_rate_limit_per_host(self):
+        rate, burst, count = 20.0, 2, 8
+        transport = StaticTransport({})
+        engine = NewsFetchEngine(transport=transport, rate_per_host=rate, burst_per_host=burst, pages=1,
+                                 min_results=0)
+        start = time.monotonic()
+        engine.fetch_many_sync([f"query {i}" for i in range(count)])
+        elapsed = time.monotonic() - start
+        self.assertEqual(transport.calls, count)
+        # İlk `burst` istek beklemeden geçer, kalanlar 1/rate aralıklarla
+        self.assertGreaterEqual(elapsed, (count - burst) / rate * 0.9)
+
+
+class GoogleNewsTransportTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get('GoogleNews')
+        sys.modules['GoogleNews'] = types.SimpleNamespace(GoogleNews=FakeGoogleNews)
+        FakeGoogleNews.instances = []
+
+    def tearDown(self):
+        FakeGoogleNews.version = '1.6.16'
+        if self._saved is None:
+            sys.modules.pop('GoogleNews', None)
+        else:
+            sys.modules['GoogleNews'] = self._saved
+
+    def test_second_page_on_pinned_version_skips_search(self):
+        GoogleNewsTransport._fetch_page_sync('AI South Africa', 2, '7d', 'en')
+        calls = FakeGoogleNews.instances[-1].calls
+        self.assertNotIn('search', [call[0] for call in calls])
+        self.assertEqual(calls[-1], ('get_page', 'AI%20South%20Africa', 2))
+
+    def test_second_page_on_unknown_version_uses_public_api(self):
+        FakeGoogleNews.version = '2.0.0'
+        GoogleNewsTransport._fetch_page_sync('AI South Africa', 2, '7d', 'en')
+        calls = FakeGoogleNews.instances[-1].calls
+        self.assertIn(('search', 'AI South Africa'), calls)
+        self.assertEqual(calls[-1], ('get_page', 'AI South Africa', 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Google kısıtlaması (429 / engelleme) devre kesiciyi açmalı; boş "başarılı" sayfa olarak yutulmamalı.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_backend  # noqa: E402
+from fetch_engine import GoogleNewsTransport, NewsFetchEngine  # noqa: E402
+from resilience import CircuitBreaker, RetryBudget, Upstream  # noqa: E402
+
+
+class FakeGoogleNews:
+    """GoogleNews 1.6 davranışı: hata yutulur, enableException(True) verilmişse yükseltilir."""
+
+    def __init__(self, lang='en', period='7d'):
+        self._raise = False
+
+    def enableException(self, enable=True):
+        self._raise = enable
+
+    def clear(self):
+        pass
+
+    def search(self, query):
+        self.get_page(1)
+
+    def get_page(self, page):
+        if self._raise:
+            raise Exception('HTTP Error 429: Too Many Requests')
+
+    def result(self):
+        return []
+
+
+class ThrottledTransport:
+    """Her sayfada GoogleNewsTransport'un kısıtlamada yükselttiği hatayı verir."""
+
+    host = 'throttled'
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_page(self, query, page, period, lang):
+        self.calls += 1
+        raise Exception('HTTP Error 429: Too Many Requests')
+
+
+class GoogleNewsBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = news_backend.fetch_engine, news_backend.google_news, sys.modules.get('GoogleNews')
+
+    def tearDown(self):
+        news_backend.fetch_engine, news_backend.google_news, module = self._saved
+        if module is None:
+            sys.modules.pop('GoogleNews', None)
+        else:
+            sys.modules['GoogleNews'] = module
+
+    def test_transport_raises_on_throttling(self):
+        sys.modules['GoogleNews'] = types.SimpleNamespace(GoogleNews=FakeGoogleNews)
+        with self.assertRaises(Exception):
+            GoogleNewsTransport._fetch_page_sync('Artificial Intelligence Germany', 1, '7d', 'en')
+
+    def test_breaker_opens_and_stops_scraping(self):
+        transport = ThrottledTransport()
+        news_backend.fetch_engine = NewsFetchEngine(transport=transport, rate_per_host=1000, burst_per_host=1000)
+        upstream = Upstream('google_news_test', attempts=1, failure_threshold=2, budget=RetryBudget(),
+                            sleep=lambda _: None)
+        news_backend.google_news = upstream
+
+        self.assertIsNone(news_backend._fetch_country_news('Germany', ['ai']))
+        self.assertIsNone(news_backend._fetch_country_news('Japan', ['ai']))
+        self.assertEqual(upstream.breaker.state, CircuitBreaker.OPEN)
+
+        calls = transport.calls
+        self.assertIsNone(news_backend._fetch_country_news('France', ['ai']))
+        self.assertEqual(transport.calls, calls)  # Devre açıkken ağa çıkılmaz
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Haber önbelleği: TTL, LRU, negatif kayıt ve bayat-iken-yenile davranışı.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_backend  # noqa: E402
+from news_backend import NewsCache  # noqa: E402
+
+
+def make_stale(cache, key, data, age):
+    """Kaydı `age` saniye önce çekilmiş gibi yazar."""
+    cache._put_local(key, data, time.monotonic() - age)
+
+
+class NewsCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def fetcher(self, data):
+        def fetch():
+            self.calls.append(data)
+            return data
+        return fetch
+
+    def test_fresh_hit_does_not_fetch(self):
+        cache = NewsCache(ttl=60, stale_ttl=3600)
+        self.assertEqual(cache.get('Germany', self.fetcher(['a'])), ['a'])
+        self.assertEqual(cache.get('Germany', self.fetcher(['b'])), ['a'])
+        self.assertEqual(self.calls, [['a']])
+        self.assertEqual((cache.stats()['misses'], cache.stats()['hits']), (1, 1))
+
+    def test_expired_entry_is_fetched_again(self):
+        cache = NewsCache(ttl=60, stale_ttl=600)
+        make_stale(cache, 'Germany', ['old'], age=601)
+        self.assertFalse(cache.contains('Germany'))
+        self.assertEqual(cache.get('Germany', self.fetcher(['new'])), ['new'])
+        self.assertEqual(self.calls, [['new']])
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = NewsCache(max_entries=2, ttl=60, stale_ttl=3600)
+        cache.put('Germany', ['de'])
+        cache.put('France', ['fr'])
+        cache.get('Germany', self.fetcher(None))  # Germany en son kullanılan olur
+        cache.put('Japan', ['jp'])
+        self.assertTrue(cache.contains('Germany'))
+        self.assertFalse(cache.contains('France'))
+        self.assertTrue(cache.contains('Japan'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_empty_result_is_cached_negatively(self):
+        cache = NewsCache(ttl=60, stale_ttl=3600, negative_ttl=0.2)
+        self.assertIsNone(cache.get('Atlantis', self.fetcher(None)))
+        self.assertIsNone(cache.get('Atlantis', self.fetcher(None)))
+        self.assertEqual(self.calls, [None])
+        self.assertEqual(cache.stats()['negative_hits'], 1)
+        time.sleep(0.25)
+        self.assertEqual(cache.get('Atlantis', self.fetcher(['found'])), ['found'])
+        # Başarılı yazım negatif kaydı siler
+        self.assertEqual(cache.stats()['negative'], 0)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        cache = NewsCache(ttl=60, stale_ttl=3600)
+        make_stale(cache, 'Germany', ['old'], age=120)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            return ['new']
+
+        self.assertEqual(cache.get('Germany', slow_fetch), ['old'])
+        self.assertTrue(started.wait(5))
+        # Yenileme sürerken ikinci istek de bayat veriyi alır, ikinci bir yenileme başlatmaz
+        self.assertEqual(cache.get('Germany', self.fetcher(['other'])), ['old'])
+        self.assertEqual(self.calls, [])
+        release.set()
+        deadline = time.monotonic() + 5
+        while cache.is_stale('Germany') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.get('Germany', self.fetcher(['other'])), ['new'])
+        stats = cache.stats()
+        self.assertEqual((stats['stale_hits'], stats['refreshes'], stats['hits']), (2, 1, 1))
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        cache = NewsCache(ttl=60, stale_ttl=3600)
+        make_stale(cache, 'Germany', ['old'], age=120)
+        self.assertEqual(cache.refresh('Germany', self.fetcher(None)), None)
+        self.assertTrue(cache.is_stale('Germany'))
+        self.assertEqual(cache.stats()['refresh_errors'], 1)
+
+
+class BackgroundJobRefreshTest(unittest.TestCase):
+    """Dash arka plan işi: süreç iş bitince kapanır, bayat kayıt thread'de değil iş içinde yenilenmeli."""
+
+    def setUp(self):
+        self._saved = news_backend.news_cache, news_backend._load_country_news
+        self.cache = news_backend.news_cache = NewsCache(ttl=60, stale_ttl=3600)
+        self.cache.background_refresh = False
+        self.loads = []
+
+        def load(country):
+            self.loads.append((country, threading.current_thread().name))
+            return [{'title': f"fresh {country}"}]
+
+        news_backend._load_country_news = load
+
+    def tearDown(self):
+        news_backend.news_cache, news_backend._load_country_news = self._saved
+
+    def test_stale_entry_is_refreshed_inline(self):
+        make_stale(self.cache, 'Germany', [{'title': 'old Germany'}], age=120)
+        with mock.patch.object(news_backend.threading, 'Thread', side_effect=AssertionError('thread in job')):
+            panels = list(news_backend.iter_country_news('Germany'))
+        self.assertEqual(panels, [[{'title': 'old Germany'}], [{'title': 'fresh Germany'}]])
+        self.assertEqual([country for country, _ in self.loads], ['Germany'])
+        self.assertFalse(self.cache.is_stale('Germany'))
+        self.assertEqual(self.cache.stats()['refreshes'], 1)
+
+    def test_fresh_entry_is_not_refetched(self):
+        make_stale(self.cache, 'Japan', [{'title': 'new Japan'}], age=5)
+        self.assertEqual(list(news_backend.iter_country_news('Japan')), [[{'title': 'new Japan'}]])
+        self.assertEqual(self.loads, [])
+
+    def test_compare_refreshes_stale_countries(self):
+        make_stale(self.cache, 'France', [{'title': 'old France'}], age=120)
+        make_stale(self.cache, 'Israel', [{'title': 'new Israel'}], age=5)
+        results = list(news_backend.iter_many_country_news(['France', 'Israel']))
+        self.assertEqual(sorted(results[:2]), [('France', [{'title': 'old France'}]),
+                                               ('Israel', [{'title': 'new Israel'}])])
+        self.assertEqual(results[2:], [('France', [{'title': 'fresh France'}])])
+        # Yenileme karşılaştırma havuzunda, sonuç dönmeden bitti; ayrıca arka plan thread'i açılmadı
+        self.assertEqual(len(self.loads), 1)
+        self.assertTrue(self.loads[0][1].startswith('nexus-compare'), self.loads[0][1])
+        self.assertEqual(news_backend.get_many_country_news(['France', 'Israel'])['France'],
+                         [{'title': 'fresh France'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Önceden ısıtma: ısıtılan önbellek anahtarları kürenin tıklamada gönderdiği ülke adlarıyla aynı olmalı.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_backend  # noqa: E402
+from geo_data import get_geo_index  # noqa: E402
+from news_backend import NewsCache  # noqa: E402
+from prefetch import PrefetchScheduler  # noqa: E402
+
+
+class PrefetchKeysTest(unittest.TestCase):
+    def test_prefetched_keys_match_globe_names(self):
+        fetched = []
+
+        def fetcher(country):
+            fetched.append(country)
+            return [{'title': f"{country} news"}]
+
+        cache = NewsCache()
+        scheduler = PrefetchScheduler(fetcher=fetcher, cache=cache)
+        self.assertEqual(scheduler.run_once(), len(news_backend.TIER_1_COUNTRIES))
+
+        globe_names = set(get_geo_index().names)
+        self.assertEqual(sorted(fetched), sorted(news_backend.TIER_1_COUNTRIES))
+        for country in fetched:
+            with self.subTest(country=country):
+                self.assertIn(country, globe_names)
+                # Tıklama aynı anahtarla gelir ve ağa çıkmadan sıcak kayda düşer
+                self.assertEqual(cache.get(country, lambda: self.fail(country)), [{'title': f"{country} news"}])
+        self.assertEqual(cache.stats()['hits'], len(fetched))
+
+
+if __name__ == '__main__':
+    unittest.main()
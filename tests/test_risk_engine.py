@@ -0,0 +1,75 @@
+"""Risk sınıflandırıcı: çekimler ve bileşikler yakalanmalı, kelime içi tuzaklar riskli sayılmamalı.
+
+    python -m pytest -q tests
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import risk_engine  # noqa: E402
+from risk_engine import RiskClassifier  # noqa: E402
+
+RECALL = [
+    ('war', 'war'), ('wars', 'war'), ('warfare', 'war'), ('warring', 'war'), ('warheads', 'war'),
+    ('warships', 'war'), ('warplanes', 'war'), ('warlords', 'war'), ('wartime', 'war'),
+    ('military', 'military'), ('militaries', 'military'), ('militarized', 'military'),
+    ('militarization', 'military'), ('weapons', 'weapon'), ('weaponized', 'weapon'), ('weaponization', 'weapon'),
+    ('weaponry', 'weapon'), ('bioweapons', 'bioweapon'), ('spies', 'spy'), ('spyware', 'spyware'),
+    ('armies', 'army'), ('threatens', 'threat'), ('threatened', 'threat'), ('hackers', 'hack'),
+    ('killed', 'kill'), ('cyberattack', 'cyber'), ('drones', 'drone'), ('missiles', 'missile'),
+]
+SAFE = ['software', 'harmony', 'warm', 'award', 'reward', 'hackathon', 'warehouse', 'militant', 'skill',
+        'dangerously-long-word', 'threads', 'spyglass']
+WORDS = [word for word, _ in RECALL] + SAFE + ['model', 'chip', 'lab', 'AI', '"war"', 'drone,', '(spies)', 'war-torn']
+
+
+def reference_terms(classifier, text):
+    """Önbelleksiz, metnin tamamında tek regex taraması (ilk geçiş sırasıyla)."""
+    found = (classifier._canonical[m.group(m.lastindex)] for m in classifier._pattern.finditer(text.lower()))
+    return tuple(dict.fromkeys(found))
+
+
+class RiskRecallTest(unittest.TestCase):
+    def setUp(self):
+        self.classifier = RiskClassifier()
+
+    def test_inflected_forms_are_caught(self):
+        for word, keyword in RECALL:
+            with self.subTest(word=word):
+                assessment = self.classifier.classify(f"AI {word.capitalize()} report")
+                self.assertIn(keyword, assessment.matched)
+                self.assertTrue(self.classifier.is_risky(f"AI {word} report"))
+
+    def test_substring_traps_are_safe(self):
+        for word in SAFE:
+            with self.subTest(word=word):
+                self.assertFalse(self.classifier.classify(f"AI {word} report").risky)
+                self.assertFalse(self.classifier.is_risky(f"AI {word} report"))
+
+    def test_matches_whole_text_scan(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            text = ' '.join(rng.choices(WORDS, k=rng.randint(1, 12)))
+            with self.subTest(text=text):
+                expected = reference_terms(self.classifier, text)
+                self.assertEqual(self.classifier.classify(text).matched, expected)
+                self.assertEqual(self.classifier.is_risky(text), bool(expected))
+
+    def test_cache_reset_keeps_results(self):
+        saved = risk_engine.RISK_TOKEN_CACHE_MAX
+        risk_engine.RISK_TOKEN_CACHE_MAX = 3
+        try:
+            classifier = RiskClassifier()
+            for _ in range(3):
+                for word, keyword in RECALL:
+                    self.assertEqual(classifier.classify(f"{word} and {keyword}").matched, (keyword,))
+            self.assertLessEqual(len(classifier._safe_tokens), 3)
+        finally:
+            risk_engine.RISK_TOKEN_CACHE_MAX = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
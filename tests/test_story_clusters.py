@@ -0,0 +1,97 @@
+"""Yakın-kopya kümeleme: aynı haberin farklı sitelerdeki kopyaları tek kümede, ilgisiz haberler ayrı.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import STORY_CLUSTER_WINDOW, ArticleStore  # noqa: E402
+from story_clusters import (STORY_SIMILARITY, band_keys, minhash_signature, pack_signature,  # noqa: E402
+                            signature_similarity, story_text, unpack_signature)
+
+WIRE_DESC = 'The central bank raised its benchmark interest rate by half a percentage point on Thursday.'
+
+# Aynı ajans haberi: başlık eki, kısaltılmış açıklama, büyük/küçük harf ve noktalama farkları
+NEAR_DUPLICATES = [
+    ('Central bank raises interest rate by half a point', WIRE_DESC, 'Reuters'),
+    ('Central bank raises interest rate by half a point - Reuters', WIRE_DESC, 'Yahoo News'),
+    ('Central Bank raises interest rate by half a point | Markets', WIRE_DESC[:70], 'Markets Daily'),
+    ('central bank raises interest-rate by half a point', WIRE_DESC + ' Analysts expected it.', 'Local Herald'),
+]
+UNRELATED = [
+    ('Storm closes northern ports for two days', 'Shipping was halted as winds reached gale force.', 'Coast News'),
+    ('National team wins football qualifier', 'A late goal secured the victory in the capital.', 'Sport Today'),
+    ('Central bank governor to speak at summit', 'The governor will address investors next week.', 'Finance Wire'),
+]
+
+
+def signature(title, desc):
+    return minhash_signature(story_text(title, desc))
+
+
+class SignatureTest(unittest.TestCase):
+    def test_near_duplicates_are_similar(self):
+        first = signature(*NEAR_DUPLICATES[0][:2])
+        for title, desc, _ in NEAR_DUPLICATES[1:]:
+            with self.subTest(title=title):
+                other = signature(title, desc)
+                self.assertGreaterEqual(signature_similarity(first, other), STORY_SIMILARITY)
+                # LSH aday olabilmesi için en az bir bant ortak olmalı
+                self.assertTrue(set(band_keys(first)) & set(band_keys(other)))
+
+    def test_unrelated_stories_are_not_similar(self):
+        first = signature(*NEAR_DUPLICATES[0][:2])
+        for title, desc, _ in UNRELATED:
+            with self.subTest(title=title):
+                self.assertLess(signature_similarity(first, signature(title, desc)), STORY_SIMILARITY)
+
+    def test_signature_is_deterministic_and_packs(self):
+        first = signature(*NEAR_DUPLICATES[0][:2])
+        self.assertEqual(first, signature(*NEAR_DUPLICATES[0][:2]))
+        self.assertEqual(unpack_signature(pack_signature(first)), first)
+        self.assertIsNone(minhash_signature(' -- '))
+
+
+class StoreClusteringTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ArticleStore(os.path.join(tempfile.mkdtemp(prefix='nexus-store-'), 'nexus.db'))
+
+    def add(self, country, stories, fetched_at=1000.0):
+        articles = [{'title': title, 'desc': desc, 'media': media,
+                     'link': f"https://{media.replace(' ', '').lower()}.example/{i}"}
+                    for i, (title, desc, media) in enumerate(stories)]
+        return self.store.add_articles(country, articles, fetched_at=fetched_at)
+
+    def clusters(self):
+        rows = self.store._conn().execute('SELECT title, cluster_id FROM articles ORDER BY id')
+        return {title: cluster_id for title, cluster_id in rows}
+
+    def test_copies_share_cluster_across_sources_and_countries(self):
+        self.add('Germany', NEAR_DUPLICATES[:2] + UNRELATED)
+        self.add('France', NEAR_DUPLICATES[2:])
+        clusters = self.clusters()
+        self.assertEqual(len({clusters[title] for title, _, _ in NEAR_DUPLICATES}), 1)
+        self.assertEqual(len({clusters[title] for title, _, _ in UNRELATED}), len(UNRELATED))
+        self.assertNotIn(clusters[NEAR_DUPLICATES[0][0]], {clusters[title] for title, _, _ in UNRELATED})
+
+        stories = self.store.recent_stories('Germany')
+        self.assertEqual(len(stories), 1 + len(UNRELATED))
+        wire = next(story for story in stories if story['cluster_id'] == clusters[NEAR_DUPLICATES[0][0]])
+        self.assertEqual((wire['sources'], wire['countries']), (len(NEAR_DUPLICATES), 2))
+
+    def test_old_cluster_is_not_joined(self):
+        self.add('Germany', NEAR_DUPLICATES[:1], fetched_at=1000.0)
+        self.add('Germany', NEAR_DUPLICATES[1:2], fetched_at=1000.0 + STORY_CLUSTER_WINDOW + 60)
+        self.assertEqual(len(set(self.clusters().values())), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Çeviri katmanı: tekilleştirme, önbellek, parçalama ve satır sayısı tutmayınca tek tek çeviri (sahte çevirmenle).
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation import MAX_TEXT_LENGTH, TranslationService, google_translate_batch  # noqa: E402
+
+
+class StubTranslator:
+    """(texts, target_lang) -> aynı uzunlukta liste; her çağrının parçasını kaydeder."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def __call__(self, texts, target_lang):
+        self.calls.append(list(texts))
+        return [None if text in self.fail else f"{target_lang}:{text}" for text in texts]
+
+
+class DictShared:
+    """SharedCache yerine süreçler arası L2 taklidi."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+
+class TranslationServiceTest(unittest.TestCase):
+    def test_duplicates_are_translated_once(self):
+        stub = StubTranslator()
+        service = TranslationService(translator=stub)
+        result = service.translate_many(['alpha', 'beta', 'alpha', '', 'beta'], 'tr')
+        self.assertEqual(stub.calls, [['alpha', 'beta']])
+        self.assertEqual(result, {'alpha': 'tr:alpha', 'beta': 'tr:beta'})
+
+    def test_cache_hits_skip_translator(self):
+        stub = StubTranslator()
+        service = TranslationService(translator=stub)
+        service.translate_many(['alpha', 'beta'], 'tr')
+        self.assertEqual(service.translate_many(['beta', 'alpha'], 'tr'), {'beta': 'tr:beta', 'alpha': 'tr:alpha'})
+        self.assertEqual(len(stub.calls), 1)
+        self.assertEqual(service.stats()['hits'], 2)
+        # Başka dil ayrı anahtardır
+        service.translate_many(['alpha'], 'de')
+        self.assertEqual(stub.calls[-1], ['alpha'])
+
+    def test_english_is_not_translated(self):
+        stub = StubTranslator()
+        service = TranslationService(translator=stub)
+        self.assertEqual(service.translate_many(['alpha'], 'en'), {'alpha': 'alpha'})
+        self.assertEqual(stub.calls, [])
+
+    def test_failed_items_are_not_cached(self):
+        stub = StubTranslator(fail={'beta'})
+        service = TranslationService(translator=stub)
+        self.assertEqual(service.translate_many(['alpha', 'beta'], 'tr'), {'alpha': 'tr:alpha', 'beta': 'beta'})
+        stub.fail.clear()
+        self.assertEqual(service.translate('beta', 'tr'), 'tr:beta')
+        self.assertEqual(stub.calls[-1], ['beta'])
+
+    def test_chunks_respect_size_limit(self):
+        stub = StubTranslator()
+        service = TranslationService(translator=stub, chunk_chars=50, max_workers=3)
+        texts = [f"headline number {i:02d}" for i in range(12)]  # 19 karakter + ayraç
+        result = service.translate_many(texts, 'tr')
+        self.assertEqual(result, {text: f"tr:{text}" for text in texts})
+        self.assertGreater(len(stub.calls), 1)
+        self.assertTrue(all(sum(len(text) + 1 for text in chunk) <= 50 for chunk in stub.calls))
+        self.assertEqual(sorted(text for chunk in stub.calls for text in chunk), texts)
+
+    def test_overlong_text_gets_its_own_chunk(self):
+        stub = StubTranslator()
+        service = TranslationService(translator=stub, chunk_chars=100)
+        long_text = 'x' * (MAX_TEXT_LENGTH * 2)
+        service.translate_many(['short', long_text, 'tail'], 'tr')
+        self.assertIn([long_text], stub.calls)
+
+    def test_shared_cache_is_used_across_services(self):
+        shared = DictShared()
+        first = StubTranslator()
+        TranslationService(translator=first, shared=shared).translate_many(['alpha'], 'tr')
+        second = StubTranslator()
+        service = TranslationService(translator=second, shared=shared)
+        self.assertEqual(service.translate_many(['alpha'], 'tr'), {'alpha': 'tr:alpha'})
+        self.assertEqual(second.calls, [])
+        self.assertEqual(service.stats()['shared_hits'], 1)
+
+
+class FakeGoogleTranslator:
+    """Toplu istekte bir satır eksik döner (Google'ın satırları birleştirmesi gibi); tek metinleri çevirir."""
+
+    calls = []
+
+    def __init__(self, source='auto', target='en'):
+        self.target = target
+
+    def translate(self, text):
+        FakeGoogleTranslator.calls.append(text)
+        lines = text.split('\n')
+        if len(lines) > 1:
+            return '\n'.join(f"{self.target}:{line}" for line in lines[:-1])
+        return f"{self.target}:{text}"
+
+
+class GoogleTranslateBatchTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = {name: sys.modules.get(name) for name in ('deep_translator', 'deep_translator.exceptions')}
+        sys.modules['deep_translator'] = types.SimpleNamespace(GoogleTranslator=FakeGoogleTranslator)
+        sys.modules['deep_translator.exceptions'] = types.SimpleNamespace(
+            RequestError=type('RequestError', (Exception,), {}),
+            ServerException=type('ServerException', (Exception,), {}),
+            TooManyRequests=type('TooManyRequests', (Exception,), {}))
+        FakeGoogleTranslator.calls = []
+
+    def tearDown(self):
+        for name, module in self._saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def test_line_count_mismatch_falls_back_per_item(self):
+        result = google_translate_batch(['alpha', 'beta  gamma', 'delta'], 'tr')
+        self.assertEqual(result, ['tr:alpha', 'tr:beta gamma', 'tr:delta'])
+        self.assertEqual(FakeGoogleTranslator.calls, ['alpha\nbeta gamma\ndelta', 'alpha', 'beta gamma', 'delta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Çeviri kesintisi: toplu istek bağlantı hatası verirse tek tek denemeye geçilmemeli, hata devre kesiciye ulaşmalı.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+_WORKDIR = tempfile.mkdtemp(prefix='nexus-test-')
+os.environ.setdefault('NEXUS_DB_PATH', os.path.join(_WORKDIR, 'nexus.db'))
+os.environ.setdefault('NEXUS_CACHE_DIR', os.path.join(_WORKDIR, 'cache'))
+os.environ.setdefault('NEXUS_SHARED_CACHE', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resilience import CircuitBreaker, RetryBudget, Upstream  # noqa: E402
+from translation import TranslationService, google_translate_batch  # noqa: E402
+
+
+class RequestError(Exception):
+    pass
+
+
+class ServerException(Exception):
+    pass
+
+
+class TooManyRequests(Exception):
+    pass
+
+
+class NotValidPayload(Exception):
+    pass
+
+
+class FakeGoogleTranslator:
+    """deep_translator.GoogleTranslator yerine: her translate çağrısını sayar, verilen hatayı fırlatır."""
+
+    calls = 0
+    error = None
+
+    def __init__(self, source='auto', target='en'):
+        pass
+
+    def translate(self, text):
+        FakeGoogleTranslator.calls += 1
+        error = FakeGoogleTranslator.error
+        if error is not None and (error is not NotValidPayload or '\n' in text):  # Metin hatası sadece toplu istekte
+            raise error()
+        return f"[{text}]"
+
+
+class TranslationBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self._saved = {name: sys.modules.get(name) for name in ('deep_translator', 'deep_translator.exceptions')}
+        sys.modules['deep_translator'] = types.SimpleNamespace(GoogleTranslator=FakeGoogleTranslator)
+        sys.modules['deep_translator.exceptions'] = types.SimpleNamespace(
+            RequestError=RequestError, ServerException=ServerException, TooManyRequests=TooManyRequests)
+        FakeGoogleTranslator.calls = 0
+        FakeGoogleTranslator.error = None
+
+    def tearDown(self):
+        for name, module in self._saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def test_outage_skips_per_item_fallback(self):
+        FakeGoogleTranslator.error = TooManyRequests
+        upstream = Upstream('google_translate_test', attempts=2, failure_threshold=2, budget=RetryBudget(),
+                            sleep=lambda _: None)
+        service = TranslationService(translator=google_translate_batch, upstream=upstream)
+        texts = ['bir', 'iki', 'üç', 'dört']
+
+        self.assertEqual(service.translate_many(texts, 'tr'), {text: text for text in texts})
+        self.assertEqual(FakeGoogleTranslator.calls, 2)  # deneme başına tek toplu istek, öğe başına istek yok
+        self.assertEqual(upstream.breaker.state, CircuitBreaker.OPEN)
+
+    def test_rejected_batch_still_falls_back_per_item(self):
+        FakeGoogleTranslator.error = NotValidPayload
+        self.assertEqual(google_translate_batch(['bir', 'iki'], 'tr'), ['[bir]', '[iki]'])
+        self.assertEqual(FakeGoogleTranslator.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
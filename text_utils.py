@@ -0,0 +1,93 @@
+"""Bond fontunda olmayan harfleri ASCII karşılıklarına çeviren toplu metin normalizasyonu.
+
+Tek bir str.translate tablosu kullanılır: metin başına tek geçiş. Türkçe, Almanca, Fransızca, İspanyolca
+(genel olarak Latin-1 / Latin Extended-A aksanları) ve Kiril (Rusça transliterasyon) desteklenir.
+"""
+import unicodedata
+
+# Ayrıştırma (NFKD) ile düzgün çıkmayan ya da özel karşılığı olan harfler
+_LATIN_SPECIAL = {
+    'ı': 'i', 'İ': 'I', 'ß': 'ss', 'ẞ': 'SS', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE', 'ø': 'o', 'Ø': 'O',
+    'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D', 'þ': 'th', 'Þ': 'Th', 'ł': 'l', 'Ł': 'L', 'ħ': 'h', 'Ħ': 'H',
+    'ŀ': 'l', 'Ŀ': 'L', 'ĸ': 'k', 'ŉ': "'n", 'ſ': 's', 'ĳ': 'ij', 'Ĳ': 'IJ', 'ŋ': 'n', 'Ŋ': 'N',
+    '¿': '', '¡': '', '«': '"', '»': '"', '‘': "'", '’': "'", '“': '"', '”': '"', '–': '-', '—': '-',
+}
+
+_CYRILLIC = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'ж': 'zh', 'з': 'z', 'и': 'i',
+    'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya', 'є': 'ye', 'і': 'i', 'ї': 'yi', 'ґ': 'g', 'ў': 'u',
+}
+
+
+def _build_mapping():
+    table = {}
+    # Latin-1 Supplement + Latin Extended-A: aksanlı harfi temel harfine indir (é -> e, ñ -> n, ğ -> g)
+    for code in range(0x00C0, 0x0180):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        if base != char and base.isascii() and base:
+            table[code] = base
+    for char, repl in _LATIN_SPECIAL.items():
+        table[ord(char)] = repl
+    for char, repl in _CYRILLIC.items():
+        table[ord(char)] = repl
+        upper = char.upper()
+        if upper != char:
+            table[ord(upper)] = repl.capitalize() if repl else ''
+    return table
+
+
+def _build_table(mapping):
+    # dict yerine ord ile indekslenen liste: eşleşmeyen her karakterde KeyError fırlatılmıyor (~2x hızlı).
+    # Listenin dışında kalan karakterler (CJK vb.) olduğu gibi kalır.
+    table = [chr(code) for code in range(max(mapping) + 1)]
+    for code, repl in mapping.items():
+        table[code] = repl
+    return table
+
+
+BOND_TRANSLATION_MAP = _build_mapping()
+BOND_TRANSLATION_TABLE = _build_table(BOND_TRANSLATION_MAP)
+
+
+def normalize_text(text):
+    """Tek metni tek geçişte normalize eder. Boş/None için "" döner."""
+    if not text:
+        return ""
+    if text.isascii():
+        return text
+    return text.translate(BOND_TRANSLATION_TABLE)
+
+
+def normalize_many(texts):
+    """Metin listesini normalize eder. Tekrarlanan metinler (etiketler, aynı başlık) bir kez çevrilir."""
+    table = BOND_TRANSLATION_TABLE
+    seen = {}
+    result = []
+    for text in texts:
+        if not text:
+            result.append("")
+        elif text.isascii():
+            result.append(text)
+        else:
+            clean = seen.get(text)
+            if clean is None:
+                clean = seen[text] = text.translate(table)
+            result.append(clean)
+    return result
+
+
+def normalize_series(series):
+    """pandas Series için vektörel varyant; NaN değerler korunur."""
+    return series.str.translate(BOND_TRANSLATION_TABLE)
+
+
+def normalize_frame(df, columns=('title', 'desc')):
+    """DataFrame'in verilen metin kolonlarını normalize edilmiş kopyayla döner (makale partileri için)."""
+    df = df.copy()
+    for column in columns:
+        if column in df:
+            df[column] = normalize_series(df[column])
+    return df
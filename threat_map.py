@@ -0,0 +1,130 @@
+"""Küresel tehdit haritası: ülke başına risk skorları, df_geo satır sırasıyla hizalı vektörlerde tutulur.
+
+Skorlar depodaki analyze_risk sonuçlarından toplu hesaplanır. Yeniden hesaplama artımlıdır:
+sadece son hesaplamadan beri yeni makalesi gelen ülkelere dokunulur.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import news_backend
+from article_store import article_store
+from geo_data import get_geo_index
+from shared_cache import LeaderLease
+
+THREAT_WINDOW = 7 * 86400  # Skora giren makalelerin yaşı (sn)
+THREAT_SMOOTHING = 2  # Az haberli ülkelerde 1/1 = %100 olmasın diye paydaya eklenir
+THREAT_FULL_RECOMPUTE = 3600  # Pencereden düşen makaleler için ara sıra tam hesaplama (sn)
+THREAT_INGEST_WORKERS = 4
+THREAT_INGEST_BATCH = 25
+THREAT_INGEST_LEASE_TTL = 1800  # Aynı anda tek süreç toplu çekim yapar; sahibi ölürse bu süre sonunda düşer (sn)
+
+
+class ThreatMap:
+    def __init__(self, index=None, store=None, fetcher=None, lease=None):
+        self.index = index or get_geo_index()
+        self.store = store or article_store
+        self.fetcher = fetcher or news_backend.refresh_country_news
+        self.lease = lease
+        n = len(self.index)
+        self.counts = np.zeros(n, dtype=np.int32)
+        self.critical = np.zeros(n, dtype=np.int32)
+        self.scores = np.zeros(n, dtype=np.float32)
+        self.version = self._content_version()
+        self._last_id = 0
+        self._last_full = 0.0
+        self._lock = threading.RLock()  # refresh() imleci tutarken recompute() da kilidi alır
+        self._ingest_thread = None
+        self.ingest_progress = (0, 0)  # (tamamlanan, toplam)
+
+    # --- HESAPLAMA ---
+    def recompute(self, countries=None):
+        """Verilen ülkeleri (None ise tümünü) depodan yeniden hesaplar. Değişen ülke sayısını döner."""
+        with self._lock:
+            names = list(self.index.names) if countries is None else [c for c in countries if c in self.index]
+            if not names:
+                return 0
+            summary = self.store.risk_summary(names, since=time.time() - THREAT_WINDOW)
+            rows = np.fromiter((self.index.row(name) for name in names), dtype=np.int64, count=len(names))
+            counts = np.fromiter((summary.get(name, (0, 0))[0] for name in names), dtype=np.int32,
+                                 count=len(names))
+            critical = np.fromiter((summary.get(name, (0, 0))[1] for name in names), dtype=np.int32,
+                                   count=len(names))
+            scores = (critical / (counts + THREAT_SMOOTHING)).astype(np.float32)
+
+            changed = int(np.count_nonzero((self.counts[rows] != counts) | (self.critical[rows] != critical)))
+            self.counts[rows] = counts
+            self.critical[rows] = critical
+            self.scores[rows] = scores
+            if changed:
+                self.version = self._content_version()
+            return changed
+
+    def _content_version(self):
+        # Süreç içi sayaç değil, içerik özeti: istemci sürümü farklı gunicorn worker'larına karşılaştırılır,
+        # aynı depodan hesaplanan aynı skorlar her worker'da aynı sürümü verir
+        digest = hashlib.blake2b(self.counts.tobytes(), digest_size=8)
+        digest.update(self.critical.tobytes())
+        return digest.hexdigest()
+
+    def refresh(self):
+        """Son hesaplamadan beri yeni makalesi olan ülkeleri günceller (saatte bir tümünü)."""
+        with self._lock:
+            if time.time() - self._last_full > THREAT_FULL_RECOMPUTE:
+                _, self._last_id = self.store.changed_countries(self._last_id)
+                self._last_full = time.time()
+                return self.recompute()
+            changed_countries, self._last_id = self.store.changed_countries(self._last_id)
+            return self.recompute(changed_countries) if changed_countries else 0
+
+    # --- TOPLU ÇEKİM ---
+    def ingest(self, countries=None, max_workers=THREAT_INGEST_WORKERS, batch_size=THREAT_INGEST_BATCH,
+               max_age=news_backend.NEWS_CACHE_TTL):
+        """Ülkeleri sınırlı paralellikle, partiler halinde çeker; her partiden sonra skorları günceller."""
+        countries = list(self.index.names if countries is None else countries)
+        now = time.time()
+        stale = [c for c in countries
+                 if (self.store.last_fetched(c) or 0) < now - max_age]
+        self.ingest_progress = (0, len(stale))
+        done = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='nexus-threat') as pool:
+            for start in range(0, len(stale), batch_size):
+                batch = stale[start:start + batch_size]
+                for _ in pool.map(self._fetch_one, batch):
+                    done += 1
+                self.ingest_progress = (done, len(stale))
+                self.refresh()
+        return done
+
+    def start_ingest(self, **kwargs):
+        """ingest'i arka planda başlatır; bu süreçte ya da (lease ile) başka bir worker'da çalışıyorsa başlatmaz.
+
+        Diğer worker'lar skorları yine ortak depodan refresh() ile okur.
+        """
+        if self._ingest_thread is not None and self._ingest_thread.is_alive():
+            return False
+        if self.lease is not None and not self.lease.acquire():
+            return False
+        self._ingest_thread = threading.Thread(target=self._ingest_and_release, kwargs=kwargs,
+                                               name='nexus-threat-ingest', daemon=True)
+        self._ingest_thread.start()
+        return True
+
+    def _ingest_and_release(self, **kwargs):
+        try:
+            self.ingest(**kwargs)
+        finally:
+            if self.lease is not None:
+                self.lease.release()
+
+    def _fetch_one(self, country):
+        try:
+            self.fetcher(country)
+        except Exception as e:
+            print(f"Tehdit haritası çekim hatası ({country}): {e}")
+
+
+threat_map = ThreatMap(lease=LeaderLease('threat-ingest', THREAT_INGEST_LEASE_TTL))
@@ -0,0 +1,76 @@
+"""Konu profilleri: her profil bir ülke için hangi sorguların, hangi dönem ve dillerde çekileceğini tanımlar.
+
+Aktif profiller NEXUS_TOPICS ile seçilir (virgülle, varsayılan "ai"). NEXUS_TOPICS_FILE bir JSON dosyası
+gösterirse oradaki profiller yerleşiklere eklenir / onları ezer:
+
+    {"space": {"label": "SPACE", "queries": ["satellite {country}"], "period": "7d", "langs": ["en"]}}
+
+Bir ülkenin tüm aktif profilleri tek seferde çekilir (topic_requests): aynı (sorgu, dönem, dil) birden fazla
+profilde geçiyorsa bir kez istenir, sonuç her iki profile de etiketlenir.
+"""
+import json
+import os
+from collections import namedtuple
+
+TopicProfile = namedtuple('TopicProfile', ['name', 'label', 'queries', 'period', 'langs'])
+
+BUILTIN_TOPICS = {
+    'ai': TopicProfile('ai', 'AI', ('Artificial Intelligence {country}',), '7d', ('en',)),
+    'cyber': TopicProfile('cyber', 'CYBER', ('cyber attack {country}', 'cybersecurity {country}'), '7d', ('en',)),
+    'drones': TopicProfile('drones', 'DRONES', ('military drones {country}',), '7d', ('en',)),
+}
+DEFAULT_TOPIC = 'ai'  # Konu etiketi olmayan eski makaleler bu profilden gelmiştir
+
+# Ülke başına bir çekimde saklanacak temiz (tekilleştirilmiş) makale sayısı
+TIER_1_FETCH_LIMIT = 25
+DEFAULT_FETCH_LIMIT = 15
+
+
+def load_profiles(path=None):
+    profiles = dict(BUILTIN_TOPICS)
+    path = path if path is not None else os.environ.get('NEXUS_TOPICS_FILE')
+    if not path:
+        return profiles
+    try:
+        with open(path, encoding='utf-8') as f:
+            for name, spec in json.load(f).items():
+                profiles[name] = TopicProfile(name, spec.get('label', name.upper()), tuple(spec['queries']),
+                                              spec.get('period', '7d'), tuple(spec.get('langs', ('en',))))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Konu dosyası hatası ({path}): {e}")
+    return profiles
+
+
+def active_topic_names(profiles, spec=None):
+    spec = spec if spec is not None else os.environ.get('NEXUS_TOPICS', DEFAULT_TOPIC)
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        print(f"Bilinmeyen konu profili: {', '.join(unknown)}")
+    return [name for name in dict.fromkeys(names) if name in profiles] or [DEFAULT_TOPIC]
+
+
+TOPIC_PROFILES = load_profiles()
+ACTIVE_TOPICS = active_topic_names(TOPIC_PROFILES)
+
+
+def topic_requests(country, topics=None):
+    """[((sorgu, dönem, dil), [konu adları])] — profil sırasıyla, aynı istek tek kez."""
+    requests = {}
+    for name in topics or ACTIVE_TOPICS:
+        profile = TOPIC_PROFILES[name]
+        for template in profile.queries:
+            query = template.format(country=country)
+            for lang in profile.langs:
+                requests.setdefault((query, profile.period, lang), []).append(name)
+    return list(requests.items())
+
+
+def topic_label(name):
+    profile = TOPIC_PROFILES.get(name)
+    return profile.label if profile else name.upper()
+
+
+def fetch_limit(country, tier_1_countries):
+    """Çekim başına saklanacak makale sayısı: öncelikli ülkelerde daha fazla."""
+    return TIER_1_FETCH_LIMIT if country in tier_1_countries else DEFAULT_FETCH_LIMIT
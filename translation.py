@@ -0,0 +1,223 @@
+"""Toplu, tekilleştirilmiş ve önbellekli çeviri katmanı."""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+from resilience import CircuitOpenError, UpstreamError, google_translate
+from shared_cache import shared_cache
+
+TRANSLATION_CACHE_MAX_ENTRIES = 20000
+TRANSLATION_CHUNK_CHARS = 4500  # Google tek istekte ~5000 karakter kabul ediyor
+TRANSLATION_MAX_WORKERS = 4
+MAX_TEXT_LENGTH = 499
+TRANSLATION_SHARED_TTL = 7 * 86400  # Çeviriler değişmez; L2'de uzun tutulur (sn)
+
+
+class TranslationCache:
+    """(text, target_lang) -> çeviri. LRU ile sınırlı."""
+
+    def __init__(self, max_entries=TRANSLATION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, texts, target_lang):
+        found = {}
+        with self._lock:
+            for text in texts:
+                key = (text, target_lang)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[text] = self._entries[key]
+        return found
+
+    def put_many(self, translations, target_lang):
+        with self._lock:
+            for text, translated in translations.items():
+                key = (text, target_lang)
+                self._entries[key] = translated
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def google_translate_batch(texts, target_lang):
+    """Metinleri satır satır birleştirip tek istekte çevirir.
+
+    Başarısız olan öğeler için None döner (önbelleğe yazılmaz). Bağlantı / kısıtlama hataları yutulmaz:
+    kesintide tek tek denemeye geçilmez, hata devre kesiciye ulaşır.
+    """
+    from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import RequestError, ServerException, TooManyRequests
+
+    transport_errors = (OSError, RequestError, ServerException, TooManyRequests, UpstreamError)
+    translator = GoogleTranslator(source='auto', target=target_lang)
+    safe_texts = [' '.join(text[:MAX_TEXT_LENGTH].split()) for text in texts]
+    try:
+        translated = translator.translate('\n'.join(safe_texts))
+        lines = translated.split('\n') if translated else []
+        if len(lines) == len(safe_texts):
+            return [line.strip() or None for line in lines]
+    except transport_errors:
+        raise
+    except Exception:
+        pass
+
+    # Satır sayısı tutmadıysa (ya da metin reddedildiyse) tek tek dene
+    results = []
+    for text in safe_texts:
+        try:
+            results.append(translator.translate(text) or None)
+        except transport_errors:
+            raise
+        except Exception:
+            results.append(None)
+    return results
+
+
+class TranslationService:
+    """Bir render'daki tüm metinleri toplar, tekilleştirir ve paralel parçalarla çevirir.
+
+    translator: (texts, target_lang) -> aynı uzunlukta liste. Testlerde sahte translator verilebilir.
+    shared: süreçler arası L2 (SharedCache); süreç içi önbellekte olmayan metinlere çevirmene gitmeden önce bakılır.
+    upstream: devre kesici + yeniden deneme (resilience.Upstream); devre açıkken metinler beklemeden orijinal kalır.
+    """
+
+    def __init__(self, translator=None, cache=None, chunk_chars=TRANSLATION_CHUNK_CHARS,
+                 max_workers=TRANSLATION_MAX_WORKERS, shared=None, upstream=None):
+        self.translator = translator or google_translate_batch
+        self.cache = cache if cache is not None else TranslationCache()
+        self.chunk_chars = chunk_chars
+        self.max_workers = max_workers
+        self.shared = shared
+        self.upstream = upstream
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'translator_calls': 0, 'failures': 0}
+        self._lock = threading.Lock()
+
+    def translate(self, text, target_lang):
+        return self.translate_many([text], target_lang).get(text, text)
+
+    def translate_many(self, texts, target_lang):
+        """{orijinal: çeviri} sözlüğü döner. Çevrilemeyenler orijinal haliyle gelir."""
+        unique = list(dict.fromkeys(t for t in texts if t))
+        if target_lang == 'en' or not unique:
+            return {text: text for text in unique}
+
+        result = self.cache.get_many(unique, target_lang)
+        missing = [text for text in unique if text not in result]
+        shared_found = self._get_shared(missing, target_lang) if missing and self.shared is not None else {}
+        if shared_found:
+            self.cache.put_many(shared_found, target_lang)
+            result.update(shared_found)
+            missing = [text for text in missing if text not in shared_found]
+        with self._lock:
+            self._stats['hits'] += len(result) - len(shared_found)
+            self._stats['shared_hits'] += len(shared_found)
+            self._stats['misses'] += len(missing)
+        metrics.inc('nexus_translation_texts_total', len(result) - len(shared_found), result='hit')
+        metrics.inc('nexus_translation_texts_total', len(missing), result='miss')
+        if shared_found:
+            metrics.inc('nexus_shared_cache_hits_total', len(shared_found), cache='translation')
+
+        if missing:
+            fresh = self._translate_missing(missing, target_lang)
+            self.cache.put_many(fresh, target_lang)
+            if self.shared is not None:
+                for text, translated in fresh.items():
+                    self.shared.set(self._shared_key(text, target_lang), translated, expire=TRANSLATION_SHARED_TTL)
+            result.update(fresh)
+            for text in missing:
+                result.setdefault(text, text)
+        return result
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot['size'] = len(self.cache)
+        return snapshot
+
+    def after_fork(self):
+        # Arka plan işleri fork ile başlar; başka thread'in tuttuğu kilit çocuğa kilitli geçmesin
+        self._lock = threading.Lock()
+        if hasattr(self.cache, 'after_fork'):
+            self.cache.after_fork()
+
+    def _get_shared(self, texts, target_lang):
+        found = {}
+        for text in texts:
+            translated = self.shared.get(self._shared_key(text, target_lang))
+            if translated is not None:
+                found[text] = translated
+        return found
+
+    @staticmethod
+    def _shared_key(text, target_lang):
+        return f"tr:{target_lang}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    def _chunks(self, texts):
+        chunk, size = [], 0
+        for text in texts:
+            length = min(len(text), MAX_TEXT_LENGTH) + 1
+            if chunk and size + length > self.chunk_chars:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += length
+        if chunk:
+            yield chunk
+
+    def _call_translator(self, chunk, target_lang):
+        with self._lock:
+            self._stats['translator_calls'] += 1
+        metrics.inc('nexus_translation_calls_total')
+        with metrics.span('translate_chunk'):
+            translated = self.translator(chunk, target_lang)
+        # google_translate_batch metin hatalarında None döner; tamamı boşsa servis hatası sayılır
+        if not any(translated):
+            raise UpstreamError('çevirmen boş yanıt döndü')
+        return translated
+
+    def _translate_chunk(self, chunk, target_lang):
+        try:
+            if self.upstream is None:
+                translated = self._call_translator(chunk, target_lang)
+            else:
+                translated = self.upstream.call(lambda: self._call_translator(chunk, target_lang))
+        except CircuitOpenError:
+            translated = [None] * len(chunk)
+        except Exception as e:
+            print(f"Çeviri hatası: {e}")
+            translated = [None] * len(chunk)
+        return {text: out for text, out in zip(chunk, translated) if out}
+
+    def _translate_missing(self, texts, target_lang):
+        chunks = list(self._chunks(texts))
+        fresh = {}
+        if len(chunks) == 1:
+            fresh.update(self._translate_chunk(chunks[0], target_lang))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                for part in pool.map(lambda c: self._translate_chunk(c, target_lang), chunks):
+                    fresh.update(part)
+        with self._lock:
+            self._stats['failures'] += len(texts) - len(fresh)
+        if len(texts) > len(fresh):
+            metrics.inc('nexus_translation_texts_total', len(texts) - len(fresh), result='failed')
+        return fresh
+
+
+translation_service = TranslationService(shared=shared_cache, upstream=google_translate)
+os.register_at_fork(after_in_child=translation_service.after_fork)
@@ -1,17 +1,13 @@
 import plotly.graph_objects as go
-import pandas as pd
+
+from geo_data import get_geo_frame
 
 
 def dunya_kuresi_olustur():
     print("Situation Room: Küresel Veriler ve '007 GoldenEye' Arayüzü Yükleniyor...")
 
-    # 1. ADIM: Verileri Çek
-    try:
-        url = 'https://raw.githubusercontent.com/plotly/datasets/master/2014_world_gdp_with_codes.csv'
-        df = pd.read_csv(url)
-    except Exception as e:
-        print(f"Veri hatası: {e}")
-        return
+    # 1. ADIM: Verileri Yükle (yerel veri seti)
+    df = get_geo_frame()
 
     # 2. ADIM: Siber Harita
     fig = go.Figure(data=go.Choropleth(
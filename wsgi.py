@@ -0,0 +1,10 @@
+"""Üretim giriş noktası: gunicorn ile çok süreçli servis.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Geliştirme için hâlâ `python app.py` kullanılabilir (Flask dev sunucusu, tek süreç).
+Worker'lar haber/çeviri/panel önbelleklerini shared_cache üzerinden, haberleri SQLite deposundan paylaşır.
+"""
+from app import app, server  # noqa: F401
+
+application = server